@@ -10,9 +10,12 @@ from app.api.v1.routers.goals.router import router as goals_router
 from app.api.v1.routers.jobs.router import router as jobs_router
 from app.api.v1.routers.notes.router import router as notes_router
 from app.api.v1.routers.progress.router import router as progress_router
+from app.api.v1.routers.search.router import router as search_router
 from app.api.v1.routers.study_groups.router import router as study_groups_router
 from app.api.v1.routers.study_sessions.router import router as study_sessions_router
 from app.api.v1.routers.subjects.router import router as subjects_router
+from app.api.v1.routers.sync.router import router as sync_router
+from app.api.v1.routers.tags.router import router as tags_router
 from app.api.v1.routers.users.router import router as users_router
 
 api_router = APIRouter(prefix="/api/v1")
@@ -22,12 +25,15 @@ api_router.include_router(users_router)
 api_router.include_router(subjects_router)
 api_router.include_router(notes_router)
 api_router.include_router(documents_router)
+api_router.include_router(tags_router)
 api_router.include_router(flashcard_decks_router)
 api_router.include_router(flashcards_router)
 api_router.include_router(goals_router)
 api_router.include_router(study_sessions_router)
 api_router.include_router(progress_router)
 api_router.include_router(ai_router)
+api_router.include_router(search_router)
+api_router.include_router(sync_router)
 api_router.include_router(study_groups_router)
 api_router.include_router(jobs_router)
 api_router.include_router(admin_router)
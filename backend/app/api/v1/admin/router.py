@@ -14,6 +14,13 @@ from app.schemas.audit_log import AuditLogResponse
 from app.schemas.system_prompt import SystemPromptCreate, SystemPromptUpdate, SystemPromptResponse
 from app.schemas.system_prompt_version import SystemPromptVersionResponse
 from app.schemas.user import UserResponse
+from app.services.llm_scheduler import llm_scheduler
+from app.services.model_router import model_router
+from app.services.response_cache import response_cache
+from app.services.semantic_cache import semantic_cache
+from app.services.singleflight import singleflight
+from app.services.subject_overview import subject_overviews
+from app.services.tag_index import tag_index
 from app.api.v1.dependencies import get_current_user
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -183,3 +190,18 @@ async def list_users(
     )
     users = result.scalars().all()
     return [UserResponse.model_validate(u) for u in users]
+
+
+@router.get("/metrics")
+async def get_metrics(
+    current_user: User = Depends(get_current_user),
+) -> dict:
+    return {
+        "llm_scheduler": llm_scheduler.stats(),
+        "model_router": model_router.stats(),
+        "response_cache": response_cache.stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "singleflight": singleflight.stats(),
+        "subject_overviews": subject_overviews.stats(),
+        "tag_index": tag_index.stats(),
+    }
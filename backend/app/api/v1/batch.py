@@ -0,0 +1,44 @@
+import uuid
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+
+from app.api.v1.fields import partial_schema
+from app.api.v1.responses import list_response
+from app.schemas.batch import BatchGetRequest, BatchItemResponse
+
+MAX_BATCH_IDS = 100
+
+
+def batch_ids(payload: BatchGetRequest) -> List[uuid.UUID]:
+    if not payload.ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No ids given")
+    if len(payload.ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_IDS} ids per request",
+        )
+    # Callers query set(ids); a repeated id is answered at each position.
+    return payload.ids
+
+
+def batch_response(
+    schema: Type[BaseModel],
+    ids: Sequence[uuid.UUID],
+    rows: Sequence[Any],
+    not_found: str,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Response:
+    # Rows come from one ownership-checked IN query; anything missing from
+    # it, absent or someone else's, gets the same 404 the single GET gives.
+    if fields is not None:
+        schema = partial_schema(schema, fields)
+    found = {row.id: row for row in rows}
+    entries = [
+        {"id": item_id, "status": status.HTTP_200_OK, "item": found[item_id]}
+        if item_id in found
+        else {"id": item_id, "status": status.HTTP_404_NOT_FOUND, "detail": not_found}
+        for item_id in ids
+    ]
+    return list_response(BatchItemResponse[schema], entries)
@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db_setup import get_db
 from app.core.security import verify_token
 from app.models.user import User
+from app.services.quota import ai_quota
+from app.services.tag_index import TagFilter
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
@@ -47,3 +49,32 @@ async def get_current_user(
             detail="User account is disabled",
         )
     return user
+
+
+async def enforce_ai_quota(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    await ai_quota.enforce(db, current_user)
+
+
+def _parse_ids(value: Optional[str], name: str) -> List[uuid.UUID]:
+    if not value:
+        return []
+    try:
+        return [uuid.UUID(part.strip()) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must be a comma-separated list of ids",
+        )
+
+
+def get_tag_filter(
+    tag_ids: Optional[str] = None,
+    exclude_tag_ids: Optional[str] = None,
+) -> TagFilter:
+    return TagFilter(
+        include=_parse_ids(tag_ids, "tag_ids"),
+        exclude=_parse_ids(exclude_tag_ids, "exclude_tag_ids"),
+    )
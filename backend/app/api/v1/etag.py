@@ -0,0 +1,48 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import DateTime, Select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+
+async def list_etag(
+    db: AsyncSession, request: Request, query: Select, version_column: ColumnElement, extra: Any = None
+) -> str:
+    # Weak validator for a filtered list: row count and the sum of
+    # version_column over the same WHERE clause (one aggregate, no rows
+    # loaded), plus the query string so each page and filter combination
+    # differs. Not the max: a version is taken before its transaction commits,
+    # so an update committing after a poll can land below a newer row's
+    # version and leave the max unchanged, while any rewrite changes its
+    # row's term in the sum. Deletes change the count. extra is folded in for
+    # state the WHERE clause depends on but the rows do not carry, such as
+    # the tag version behind a tag filter.
+    if isinstance(version_column.type, DateTime):
+        version_column = func.extract("epoch", version_column)
+    result = await db.execute(
+        query.with_only_columns(func.count(), func.sum(version_column), maintain_column_froms=True)
+        .order_by(None)
+        .offset(None)
+        .limit(None)
+    )
+    count, total = result.one()
+    digest = hashlib.sha1(f"{request.url.path}?{request.url.query}|{count}|{total}|{extra}".encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    # Weak comparison (RFC 9110 13.1.2): the W/ prefix is ignored on both sides.
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in candidates or etag.removeprefix("W/") in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    return response
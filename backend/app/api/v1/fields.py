@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(schema: Type[BaseModel], fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    # "?fields=title,subject_id" -> ("id", "title", "subject_id"). The id is
+    # always returned so partial rows can still be addressed.
+    if not fields:
+        return None
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field: {', '.join(unknown)}",
+        )
+    if "id" in schema.model_fields and "id" not in names:
+        names = ("id",) + names
+    return names
+
+
+def field_options(model: Type[Any], fields: Optional[Tuple[str, ...]]) -> List[Any]:
+    # Loader options restricting the SELECT to the requested columns; the
+    # primary key is always loaded by the ORM.
+    if fields is None:
+        return []
+    columns = inspect(model).column_attrs.keys()
+    return [load_only(*(getattr(model, name) for name in fields if name in columns))]
+
+
+@lru_cache(maxsize=256)
+def partial_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    return create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
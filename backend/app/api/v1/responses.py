@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.api.v1.fields import partial_schema
+
+
+@lru_cache(maxsize=None)
+def list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    # Built once per schema; the core validator and serializer are compiled
+    # when the adapter is created, not on every request.
+    return TypeAdapter(List[schema])
+
+
+def dump_list(schema: Type[BaseModel], rows: Sequence[Any]) -> bytes:
+    adapter = list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def list_response(
+    schema: Type[BaseModel], rows: Sequence[Any], fields: Optional[Tuple[str, ...]] = None
+) -> Response:
+    # ORM rows -> JSON bytes in two pydantic-core passes over the whole list.
+    # Returning a Response skips FastAPI's response_model handling, which would
+    # validate every item again and encode through Python dicts; the route
+    # keeps response_model for the OpenAPI schema.
+    if fields is not None:
+        schema = partial_schema(schema, fields)
+    return Response(content=dump_list(schema, rows), media_type="application/json")
+
+
+def item_response(schema: Type[BaseModel], row: Any, fields: Optional[Tuple[str, ...]] = None) -> Response:
+    if fields is not None:
+        schema = partial_schema(schema, fields)
+    return Response(content=schema.model_validate(row).model_dump_json(), media_type="application/json")
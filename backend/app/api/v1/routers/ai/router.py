@@ -1,7 +1,8 @@
 import uuid
-from typing import List, Optional
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,16 +12,44 @@ from app.models.ai_conversation import AiConversation
 from app.models.ai_conversation_metrics import AiConversationMetrics
 from app.models.ai_generated_content import AiGeneratedContent
 from app.models.ai_message import AiMessage
+from app.models.ai_message_context import AiMessageContext
 from app.models.ai_message_feedback import AiMessageFeedback
 from app.models.chatbot_session import ChatbotSession
 from app.models.user import User
 from app.schemas.ai_conversation import AiConversationCreate, AiConversationUpdate, AiConversationResponse
 from app.schemas.ai_conversation_metrics import AiConversationMetricsResponse
-from app.schemas.ai_generated_content import AiGeneratedContentCreate, AiGeneratedContentResponse
+from app.schemas.ai_generated_content import AiGeneratedContentCreate, AiGeneratedContentUpdate, AiGeneratedContentResponse
 from app.schemas.ai_message import AiMessageCreate, AiMessageResponse
+from app.schemas.ai_message_context import AiMessageContextResponse
 from app.schemas.ai_message_feedback import AiMessageFeedbackCreate, AiMessageFeedbackResponse
+from app.schemas.batch import BatchGetRequest, BatchItemResponse
 from app.schemas.chatbot_session import ChatbotSessionCreate, ChatbotSessionResponse
-from app.api.v1.dependencies import get_current_user
+from app.services.generation import load_source_text
+from app.services.messages import (
+    append_message,
+    build_context,
+    fork_conversation,
+    get_history_message,
+    history_query,
+    load_subtree,
+)
+from app.services.subject_overview import subject_overviews
+from app.services.usage import (
+    estimate_tokens,
+    record_conversation_started,
+    record_generation,
+    record_generation_tokens,
+    record_message,
+)
+from app.services.quota import ai_quota
+from app.services.response_cache import cache_key, response_cache
+from app.services.retrieval import RETRIEVAL_METHOD, hybrid_retriever
+from app.services.semantic_cache import semantic_cache, semantic_cache_subject
+from app.api.v1.batch import batch_ids, batch_response
+from app.api.v1.dependencies import enforce_ai_quota, get_current_user
+from app.api.v1.etag import list_etag, not_modified, with_etag
+from app.api.v1.fields import field_options, parse_fields
+from app.api.v1.responses import item_response, list_response
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
@@ -43,12 +72,13 @@ async def _get_conversation(
 
 
 async def _get_message(
-    message_id: uuid.UUID, current_user: User, db: AsyncSession
+    message_id: uuid.UUID, current_user: User, db: AsyncSession, options: Sequence[Any] = ()
 ) -> AiMessage:
     result = await db.execute(
         select(AiMessage)
         .join(AiConversation, AiMessage.conversation_id == AiConversation.id)
         .where(AiMessage.id == message_id, AiConversation.user_id == current_user.id)
+        .options(*options)
     )
     msg = result.scalar_one_or_none()
     if msg is None:
@@ -60,22 +90,28 @@ async def _get_message(
 
 @router.get("/conversations", response_model=List[AiConversationResponse])
 async def list_conversations(
+    request: Request,
     skip: int = 0,
     limit: int = 20,
     subject_id: Optional[uuid.UUID] = None,
     is_archived: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[AiConversationResponse]:
+) -> Response:
     query = select(AiConversation).where(AiConversation.user_id == current_user.id)
     if subject_id is not None:
         query = query.where(AiConversation.subject_id == subject_id)
     if is_archived is not None:
         query = query.where(AiConversation.is_archived == is_archived)
+    etag = await list_etag(db, request, query, AiConversation.updated_at)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
     query = query.order_by(AiConversation.created_at.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
     convs = result.scalars().all()
-    return [AiConversationResponse.model_validate(c) for c in convs]
+    return with_etag(list_response(AiConversationResponse, convs), etag)
 
 
 @router.post("/conversations", response_model=AiConversationResponse, status_code=status.HTTP_201_CREATED)
@@ -96,7 +132,9 @@ async def create_conversation(
     )
     db.add(conv)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(conv)
+    record_conversation_started(current_user)
     return AiConversationResponse.model_validate(conv)
 
 
@@ -122,6 +160,7 @@ async def update_conversation(
     for field, value in update_data.items():
         setattr(conv, field, value)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(conv)
     return AiConversationResponse.model_validate(conv)
 
@@ -133,8 +172,54 @@ async def delete_conversation(
     db: AsyncSession = Depends(get_db),
 ) -> None:
     conv = await _get_conversation(conversation_id, current_user, db)
+    # Forks read their shared prefix from this conversation's messages, so it
+    # cannot go while any remain. The row lock makes a concurrent fork wait
+    # on the delete instead of slipping in after the check.
+    await db.execute(select(AiConversation.id).where(AiConversation.id == conv.id).with_for_update())
+    forks = await db.execute(
+        select(AiConversation.id).where(AiConversation.forked_from_conversation_id == conv.id).limit(1)
+    )
+    if forks.scalar_one_or_none() is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Conversation has forks; delete them first",
+        )
     await db.delete(conv)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
+
+
+class ForkRequest(BaseModel):
+    message_id: uuid.UUID
+    title: Optional[str] = None
+
+
+@router.post("/conversations/{conversation_id}/fork", response_model=AiConversationResponse, status_code=status.HTTP_201_CREATED)
+async def fork_conversation_at_message(
+    conversation_id: uuid.UUID,
+    payload: ForkRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AiConversationResponse:
+    conv = await _get_conversation(conversation_id, current_user, db)
+    at_message = await get_history_message(db, conversation_id, payload.message_id)
+    if at_message is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found in this conversation")
+    fork = await fork_conversation(db, conv, at_message, payload.title)
+    subject_overviews.invalidate(current_user.id)
+    record_conversation_started(current_user)
+    return AiConversationResponse.model_validate(fork)
+
+
+@router.get("/conversations/{conversation_id}/context")
+async def get_conversation_context(
+    conversation_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    await _get_conversation(conversation_id, current_user, db)
+    messages = await build_context(db, conversation_id, current_user.id)
+    return {"conversation_id": str(conversation_id), "messages": messages}
 
 
 # ── Messages ───────────────────────────────────────────────────────────────────
@@ -145,17 +230,19 @@ async def list_messages(
     skip: int = 0,
     limit: int = 20,
     role: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[AiMessageResponse]:
+) -> Response:
+    selected = parse_fields(AiMessageResponse, fields)
     await _get_conversation(conversation_id, current_user, db)
-    query = select(AiMessage).where(AiMessage.conversation_id == conversation_id)
+    query = history_query(conversation_id).options(*field_options(AiMessage, selected))
     if role is not None:
         query = query.where(AiMessage.role == role)
     query = query.order_by(AiMessage.message_order.asc()).offset(skip).limit(limit)
     result = await db.execute(query)
     messages = result.scalars().all()
-    return [AiMessageResponse.model_validate(m) for m in messages]
+    return list_response(AiMessageResponse, messages, selected)
 
 
 @router.post("/conversations/{conversation_id}/messages", response_model=AiMessageResponse, status_code=status.HTTP_201_CREATED)
@@ -165,48 +252,86 @@ async def create_message(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> AiMessageResponse:
-    conv = await _get_conversation(conversation_id, current_user, db)
-
-    msg = AiMessage(
-        conversation_id=conversation_id,
-        parent_message_id=payload.parent_message_id,
+    await _get_conversation(conversation_id, current_user, db)
+    parent = None
+    if payload.parent_message_id is not None:
+        parent = await get_history_message(db, conversation_id, payload.parent_message_id)
+        if parent is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent message not found")
+
+    # A user turn is what triggers a model call; assistant turns posted back
+    # are charged for their tokens but never rejected. Checked after the
+    # lookups above so a request that 404s spends no quota.
+    if payload.role == "user":
+        await ai_quota.enforce(db, current_user)
+
+    msg = await append_message(
+        db,
+        conversation_id,
+        current_user.id,
+        parent,
         role=payload.role,
         content=payload.content,
         content_preview=payload.content_preview,
-        message_order=payload.message_order,
-        thread_depth=payload.thread_depth,
-        is_thread_root=payload.is_thread_root,
         context_window_position=payload.context_window_position,
         has_large_content=payload.has_large_content,
         tokens_used=payload.tokens_used,
         model_used=payload.model_used,
         processing_time_ms=payload.processing_time_ms,
     )
-    db.add(msg)
-    conv.total_messages = (conv.total_messages or 0) + 1
-    from datetime import datetime, timezone
-    conv.last_message_at = datetime.now(timezone.utc)
+    if msg is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+
+    if msg.role == "assistant" and parent is not None and parent.role == "user" and parent.content:
+        subject_id = await semantic_cache_subject(db, conversation_id)
+        if subject_id is not None:
+            await semantic_cache.add(db, subject_id, parent.content, msg.id)
+
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(msg)
+    record_message(current_user, msg.role, msg.tokens_used)
     return AiMessageResponse.model_validate(msg)
 
 
+@router.post("/messages/batch-get", response_model=List[BatchItemResponse[AiMessageResponse]])
+async def batch_get_messages(
+    payload: BatchGetRequest,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    ids = batch_ids(payload)
+    selected = parse_fields(AiMessageResponse, fields)
+    result = await db.execute(
+        select(AiMessage)
+        .join(AiConversation, AiMessage.conversation_id == AiConversation.id)
+        .where(AiMessage.id.in_(set(ids)), AiConversation.user_id == current_user.id)
+        .options(*field_options(AiMessage, selected))
+    )
+    return batch_response(AiMessageResponse, ids, result.scalars().all(), "Message not found", selected)
+
+
 @router.get("/messages/{message_id}", response_model=AiMessageResponse)
 async def get_message(
     message_id: uuid.UUID,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> AiMessageResponse:
-    msg = await _get_message(message_id, current_user, db)
-    return AiMessageResponse.model_validate(msg)
+) -> Response:
+    selected = parse_fields(AiMessageResponse, fields)
+    msg = await _get_message(message_id, current_user, db, field_options(AiMessage, selected))
+    return item_response(AiMessageResponse, msg, selected)
 
 
 @router.get("/messages/{message_id}/thread", response_model=List[AiMessageResponse])
 async def get_message_thread(
     message_id: uuid.UUID,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[AiMessageResponse]:
+) -> Response:
+    selected = parse_fields(AiMessageResponse, fields)
     root_msg = await _get_message(message_id, current_user, db)
 
     result = await db.execute(
@@ -215,12 +340,127 @@ async def get_message_thread(
             AiMessage.conversation_id == root_msg.conversation_id,
             AiMessage.parent_message_id == root_msg.id,
         )
+        .options(*field_options(AiMessage, selected))
         .order_by(AiMessage.message_order.asc())
     )
     replies = result.scalars().all()
-    return [AiMessageResponse.model_validate(root_msg)] + [
-        AiMessageResponse.model_validate(r) for r in replies
-    ]
+    return list_response(AiMessageResponse, [root_msg, *replies], selected)
+
+
+@router.get("/messages/{message_id}/subtree", response_model=List[AiMessageResponse])
+async def get_message_subtree(
+    message_id: uuid.UUID,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    selected = parse_fields(AiMessageResponse, fields)
+    root_msg = await _get_message(message_id, current_user, db)
+    messages = await load_subtree(db, root_msg, field_options(AiMessage, selected))
+    return list_response(AiMessageResponse, messages, selected)
+
+
+@router.post("/messages/{message_id}/retrieve", response_model=AiMessageContextResponse, status_code=status.HTTP_201_CREATED)
+async def retrieve_message_context(
+    message_id: uuid.UUID,
+    k: int = 8,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AiMessageContextResponse:
+    # Hybrid lexical + vector retrieval over the user's embedded chunks, scoped
+    # to the conversation's subject when it has one, recorded as message context.
+    msg = await _get_message(message_id, current_user, db)
+    if not msg.content:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Message has no content to retrieve for")
+    conv = await _get_conversation(msg.conversation_id, current_user, db)
+    results = await hybrid_retriever.retrieve(db, current_user.id, msg.content, min(max(k, 1), 50), conv.subject_id)
+
+    context = AiMessageContext(
+        message_id=msg.id,
+        conversation_id=msg.conversation_id,
+        context_type="retrieval",
+        retrieval_query=msg.content,
+        retrieval_method=RETRIEVAL_METHOD,
+        retrieved_chunks={
+            "chunks": [
+                {
+                    "embedding_vector_id": str(r.chunk.id),
+                    "source_type": r.chunk.source_type,
+                    "source_id": str(r.chunk.source_id),
+                    "chunk_index": r.chunk.chunk_index,
+                    "content_text": r.chunk.content_text,
+                    "relevance_score": r.relevance_score,
+                    "bm25_rank": r.bm25_rank,
+                    "vector_rank": r.vector_rank,
+                }
+                for r in results
+            ]
+        },
+        source_notes=list({r.chunk.source_id for r in results if r.chunk.source_type == "note"}) or None,
+        source_documents=list({r.chunk.source_id for r in results if r.chunk.source_type == "document"}) or None,
+        relevance_score=round(Decimal(results[0].relevance_score), 6) if results else None,
+    )
+    db.add(context)
+    await db.commit()
+    await db.refresh(context)
+    return AiMessageContextResponse.model_validate(context)
+
+
+@router.post("/messages/{message_id}/cached-answer", response_model=AiMessageResponse, status_code=status.HTTP_201_CREATED)
+async def answer_from_semantic_cache(
+    message_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AiMessageResponse:
+    # Called for a freshly posted user message before running the model: if a
+    # near-duplicate question in the same subject has been answered, the answer
+    # is appended as the assistant reply and no model call is needed.
+    question = await _get_message(message_id, current_user, db)
+    if question.role != "user":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only user messages can be answered")
+
+    match = None
+    subject_id = await semantic_cache_subject(db, question.conversation_id)
+    if subject_id is not None and question.content:
+        match = await semantic_cache.lookup(db, subject_id, question.content)
+    if match is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No cached answer")
+    entry_id, answer_id, score = match
+
+    cached = await db.get(AiMessage, answer_id)
+    if cached is None:
+        # The answer was deleted after it was cached.
+        await semantic_cache.discard(db, subject_id, entry_id)
+        await db.commit()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No cached answer")
+    msg = await append_message(
+        db,
+        question.conversation_id,
+        current_user.id,
+        question,
+        role="assistant",
+        content=cached.content,
+        content_preview=cached.content_preview,
+        model_used=cached.model_used,
+        tokens_used=0,
+    )
+    if msg is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+    db.add(
+        AiMessageContext(
+            message_id=msg.id,
+            conversation_id=msg.conversation_id,
+            context_type="cached_answer",
+            retrieval_query=question.content,
+            retrieval_method="semantic_cache",
+            retrieved_chunks={"cache_entry_id": str(entry_id), "answer_message_id": str(answer_id)},
+            relevance_score=round(Decimal(score), 4),
+        )
+    )
+    await db.commit()
+    await db.refresh(msg)
+    record_message(current_user, msg.role, msg.tokens_used)
+    return AiMessageResponse.model_validate(msg)
 
 
 # ── Feedback ───────────────────────────────────────────────────────────────────
@@ -258,43 +498,78 @@ class GenerateRequest(BaseModel):
     source_type: str
     source_id: uuid.UUID
     count: Optional[int] = None
+    model: Optional[str] = None
+    prompt_version_id: Optional[uuid.UUID] = None
+    temperature: Optional[float] = None
 
 
-@router.post("/generate/flashcards", response_model=AiGeneratedContentResponse, status_code=status.HTTP_201_CREATED)
-async def generate_flashcards(
+async def _create_generated_content(
     payload: GenerateRequest,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> AiGeneratedContentResponse:
+    content_type: str,
+    generated_content: dict,
+    current_user: User,
+    db: AsyncSession,
+) -> AiGeneratedContent:
+    # Identical requests from the same user (same source text, model, prompt
+    # version and sampling params) are answered from the response cache;
+    # misses are queued with the cache key so completing them fills the cache.
+    # Misses are charged an estimate from the source length up front; the
+    # completing PATCH trues it up with the reported count.
+    source_text = await load_source_text(db, current_user, payload.source_type, payload.source_id)
+    tokens_used = None
+    if source_text:
+        key = cache_key(
+            current_user.id,
+            payload.model,
+            payload.prompt_version_id,
+            source_text,
+            {"content_type": content_type, "count": payload.count, "temperature": payload.temperature},
+        )
+        cached = await response_cache.get(db, key)
+        if cached is not None:
+            generated_content = {**cached, "cached": True}
+        else:
+            generated_content = {
+                **generated_content,
+                "cache": {"key": key, "prompt_version_id": str(payload.prompt_version_id) if payload.prompt_version_id else None},
+            }
+            tokens_used = estimate_tokens(source_text)
+
     content = AiGeneratedContent(
         user_id=current_user.id,
-        content_type="flashcards",
+        content_type=content_type,
         source_type=payload.source_type,
         source_id=payload.source_id,
-        generated_content={"count": payload.count, "status": "queued"},
+        generated_content=generated_content,
+        model_used=payload.model,
+        tokens_used=tokens_used,
     )
     db.add(content)
     await db.commit()
     await db.refresh(content)
+    record_generation(current_user, content.content_type, content.tokens_used)
+    return content
+
+
+@router.post("/generate/flashcards", response_model=AiGeneratedContentResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(enforce_ai_quota)])
+async def generate_flashcards(
+    payload: GenerateRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AiGeneratedContentResponse:
+    content = await _create_generated_content(
+        payload, "flashcards", {"count": payload.count, "status": "queued"}, current_user, db
+    )
     return AiGeneratedContentResponse.model_validate(content)
 
 
-@router.post("/generate/summary", response_model=AiGeneratedContentResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/generate/summary", response_model=AiGeneratedContentResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(enforce_ai_quota)])
 async def generate_summary(
     payload: GenerateRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> AiGeneratedContentResponse:
-    content = AiGeneratedContent(
-        user_id=current_user.id,
-        content_type="summary",
-        source_type=payload.source_type,
-        source_id=payload.source_id,
-        generated_content={"status": "queued"},
-    )
-    db.add(content)
-    await db.commit()
-    await db.refresh(content)
+    content = await _create_generated_content(payload, "summary", {"status": "queued"}, current_user, db)
     return AiGeneratedContentResponse.model_validate(content)
 
 
@@ -315,6 +590,59 @@ async def list_generated_content(
     return [AiGeneratedContentResponse.model_validate(i) for i in items]
 
 
+@router.patch("/generated/{content_id}", response_model=AiGeneratedContentResponse)
+async def update_generated_content(
+    content_id: uuid.UUID,
+    payload: AiGeneratedContentUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AiGeneratedContentResponse:
+    result = await db.execute(
+        select(AiGeneratedContent).where(
+            AiGeneratedContent.id == content_id,
+            AiGeneratedContent.user_id == current_user.id,
+        )
+    )
+    content = result.scalar_one_or_none()
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Generated content not found")
+
+    pending_cache = (content.generated_content or {}).get("cache")
+    charged_tokens = content.tokens_used or 0
+    update_data = payload.model_dump(exclude_unset=True)
+    if "tokens_used" in update_data:
+        # Only ever raised: the estimate charged at creation is a floor, and
+        # each increase is charged once.
+        update_data["tokens_used"] = max(update_data["tokens_used"] or 0, charged_tokens)
+    if update_data.get("generated_content") is not None:
+        # The cache key is server-set when the request is queued; a client
+        # must not be able to point its completion at another key.
+        update_data["generated_content"] = {k: v for k, v in update_data["generated_content"].items() if k != "cache"}
+        if pending_cache:
+            update_data["generated_content"]["cache"] = pending_cache
+    for field, value in update_data.items():
+        setattr(content, field, value)
+
+    completed = content.generated_content or {}
+    if pending_cache and "generated_content" in update_data and completed.get("status") == "completed":
+        response = {k: v for k, v in completed.items() if k != "cache"}
+        await response_cache.put(
+            db,
+            pending_cache["key"],
+            content.content_type,
+            response,
+            model=content.model_used,
+            prompt_version_id=uuid.UUID(pending_cache["prompt_version_id"]) if pending_cache.get("prompt_version_id") else None,
+            tokens_used=content.tokens_used,
+        )
+        content.generated_content = response
+
+    await db.commit()
+    await db.refresh(content)
+    record_generation_tokens(current_user, (content.tokens_used or 0) - charged_tokens)
+    return AiGeneratedContentResponse.model_validate(content)
+
+
 # ── Chatbot sessions ───────────────────────────────────────────────────────────
 
 @router.get("/sessions", response_model=List[ChatbotSessionResponse])
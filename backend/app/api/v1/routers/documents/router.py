@@ -1,15 +1,23 @@
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db_setup import get_db
 from app.models.document import Document
 from app.models.user import User
+from app.schemas.batch import BatchGetRequest, BatchItemResponse
 from app.schemas.document import DocumentCreate, DocumentUpdate, DocumentResponse
-from app.api.v1.dependencies import get_current_user
+from app.services.subject_overview import subject_overviews
+from app.services.sync import record_deletion
+from app.services.tag_index import TagFilter, tag_index
+from app.services.tagging import detach_all_tags
+from app.api.v1.batch import batch_ids, batch_response
+from app.api.v1.dependencies import get_current_user, get_tag_filter
+from app.api.v1.fields import field_options, parse_fields
+from app.api.v1.responses import item_response, list_response
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
@@ -20,18 +28,28 @@ async def list_documents(
     limit: int = 20,
     subject_id: Optional[uuid.UUID] = None,
     processing_status: Optional[str] = None,
+    fields: Optional[str] = None,
+    tag_filter: TagFilter = Depends(get_tag_filter),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[DocumentResponse]:
-    query = select(Document).where(Document.user_id == current_user.id)
+) -> Response:
+    selected = parse_fields(DocumentResponse, fields)
+    query = (
+        select(Document)
+        .where(Document.user_id == current_user.id)
+        .options(*field_options(Document, selected))
+    )
     if subject_id is not None:
         query = query.where(Document.subject_id == subject_id)
     if processing_status is not None:
         query = query.where(Document.processing_status == processing_status)
+    tagged = await tag_index.where(db, current_user.id, "document", Document.id, tag_filter)
+    if tagged is not None:
+        query = query.where(tagged)
     query = query.order_by(Document.uploaded_at.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
     docs = result.scalars().all()
-    return [DocumentResponse.model_validate(d) for d in docs]
+    return list_response(DocumentResponse, docs, selected)
 
 
 @router.post("", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
@@ -52,26 +70,48 @@ async def create_document(
     )
     db.add(doc)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(doc)
     return DocumentResponse.model_validate(doc)
 
 
+@router.post("/batch-get", response_model=List[BatchItemResponse[DocumentResponse]])
+async def batch_get_documents(
+    payload: BatchGetRequest,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    ids = batch_ids(payload)
+    selected = parse_fields(DocumentResponse, fields)
+    result = await db.execute(
+        select(Document)
+        .where(Document.id.in_(set(ids)), Document.user_id == current_user.id)
+        .options(*field_options(Document, selected))
+    )
+    return batch_response(DocumentResponse, ids, result.scalars().all(), "Document not found", selected)
+
+
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: uuid.UUID,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> DocumentResponse:
+) -> Response:
+    selected = parse_fields(DocumentResponse, fields)
     result = await db.execute(
-        select(Document).where(
+        select(Document)
+        .where(
             Document.id == document_id,
             Document.user_id == current_user.id,
         )
+        .options(*field_options(Document, selected))
     )
     doc = result.scalar_one_or_none()
     if doc is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
-    return DocumentResponse.model_validate(doc)
+    return item_response(DocumentResponse, doc, selected)
 
 
 @router.patch("/{document_id}", response_model=DocumentResponse)
@@ -96,6 +136,7 @@ async def update_document(
         setattr(doc, field, value)
 
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(doc)
     return DocumentResponse.model_validate(doc)
 
@@ -115,5 +156,9 @@ async def delete_document(
     doc = result.scalar_one_or_none()
     if doc is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
+    await detach_all_tags(db, "document", {doc.id})
+    record_deletion(db, current_user.id, "document", doc.id)
     await db.delete(doc)
     await db.commit()
+    tag_index.invalidate(current_user.id)
+    subject_overviews.invalidate(current_user.id)
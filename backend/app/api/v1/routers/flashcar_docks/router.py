@@ -1,8 +1,9 @@
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db_setup import get_db
@@ -11,29 +12,47 @@ from app.models.flashcard_deck import FlashcardDeck
 from app.models.user import User
 from app.schemas.flashcard import FlashcardResponse
 from app.schemas.flashcard_deck import FlashcardDeckCreate, FlashcardDeckUpdate, FlashcardDeckResponse
-from app.api.v1.dependencies import get_current_user
+from app.schemas.tag import TagAssignmentResponse
+from app.services.subject_overview import subject_overviews
+from app.services.sync import record_deletion
+from app.services.tag_index import TagFilter, tag_index
+from app.services.tagging import attach_tags_to_deck, owned_tag_ids
+from app.api.v1.dependencies import get_current_user, get_tag_filter
+from app.api.v1.etag import list_etag, not_modified, with_etag
+from app.api.v1.fields import field_options, parse_fields
+from app.api.v1.responses import list_response
 
 router = APIRouter(prefix="/flashcard-decks", tags=["Flashcard Decks"])
 
 
+class TagIdsRequest(BaseModel):
+    tag_ids: List[uuid.UUID]
+
+
 @router.get("", response_model=List[FlashcardDeckResponse])
 async def list_decks(
+    request: Request,
     skip: int = 0,
     limit: int = 20,
     subject_id: Optional[uuid.UUID] = None,
     is_archived: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[FlashcardDeckResponse]:
+) -> Response:
     query = select(FlashcardDeck).where(FlashcardDeck.user_id == current_user.id)
     if subject_id is not None:
         query = query.where(FlashcardDeck.subject_id == subject_id)
     if is_archived is not None:
         query = query.where(FlashcardDeck.is_archived == is_archived)
+    etag = await list_etag(db, request, query, FlashcardDeck.sync_version)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
     query = query.order_by(FlashcardDeck.created_at.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
     decks = result.scalars().all()
-    return [FlashcardDeckResponse.model_validate(d) for d in decks]
+    return with_etag(list_response(FlashcardDeckResponse, decks), etag)
 
 
 @router.post("", response_model=FlashcardDeckResponse, status_code=status.HTTP_201_CREATED)
@@ -52,6 +71,7 @@ async def create_deck(
     )
     db.add(deck)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(deck)
     return FlashcardDeckResponse.model_validate(deck)
 
@@ -96,6 +116,7 @@ async def update_deck(
         setattr(deck, field, value)
 
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(deck)
     return FlashcardDeckResponse.model_validate(deck)
 
@@ -115,8 +136,10 @@ async def delete_deck(
     deck = result.scalar_one_or_none()
     if deck is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flashcard deck not found")
+    record_deletion(db, current_user.id, "deck", deck.id)
     await db.delete(deck)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
 
 
 @router.get("/{deck_id}/cards", response_model=List[FlashcardResponse])
@@ -125,9 +148,11 @@ async def list_deck_cards(
     skip: int = 0,
     limit: int = 20,
     is_suspended: Optional[bool] = None,
+    fields: Optional[str] = None,
+    tag_filter: TagFilter = Depends(get_tag_filter),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[FlashcardResponse]:
+) -> Response:
     deck_result = await db.execute(
         select(FlashcardDeck).where(
             FlashcardDeck.id == deck_id,
@@ -138,10 +163,47 @@ async def list_deck_cards(
     if deck is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flashcard deck not found")
 
-    query = select(Flashcard).where(Flashcard.deck_id == deck_id)
+    selected = parse_fields(FlashcardResponse, fields)
+    query = (
+        select(Flashcard)
+        .where(Flashcard.deck_id == deck_id)
+        .options(*field_options(Flashcard, selected))
+    )
     if is_suspended is not None:
         query = query.where(Flashcard.is_suspended == is_suspended)
+    tagged = await tag_index.where(db, current_user.id, "flashcard", Flashcard.id, tag_filter)
+    if tagged is not None:
+        query = query.where(tagged)
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
     cards = result.scalars().all()
-    return [FlashcardResponse.model_validate(c) for c in cards]
+    return list_response(FlashcardResponse, cards, selected)
+
+
+@router.post("/{deck_id}/cards/tags", response_model=TagAssignmentResponse)
+async def add_tags_to_deck_cards(
+    deck_id: uuid.UUID,
+    payload: TagIdsRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> TagAssignmentResponse:
+    result = await db.execute(
+        select(FlashcardDeck.id).where(
+            FlashcardDeck.id == deck_id,
+            FlashcardDeck.user_id == current_user.id,
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Flashcard deck not found")
+
+    tag_ids = set(payload.tag_ids)
+    if await owned_tag_ids(db, current_user.id, tag_ids) != tag_ids:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found")
+
+    count_result = await db.execute(select(func.count(Flashcard.id)).where(Flashcard.deck_id == deck_id))
+    changed = await attach_tags_to_deck(db, deck_id, tag_ids)
+    await db.commit()
+    tag_index.invalidate(current_user.id)
+    return TagAssignmentResponse(
+        item_type="flashcard", items=count_result.scalar_one(), tags=len(tag_ids), changed=changed
+    )
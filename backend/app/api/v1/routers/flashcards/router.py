@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,11 +11,21 @@ from app.core.db_setup import get_db
 from app.models.flashcard import Flashcard
 from app.models.flashcard_deck import FlashcardDeck
 from app.models.flashcard_review import FlashcardReview
-from app.models.tag import Tag
 from app.models.user import User
+from app.services.counters import counter_buffer, increment
+from app.services.progress import record_review
+from app.services.singleflight import request_key, singleflight
+from app.services.subject_overview import subject_overviews
+from app.services.sync import record_deletion
+from app.services.tag_index import tag_index
+from app.services.tagging import attach_tags, detach_all_tags, owned_tag_ids
+from app.schemas.batch import BatchGetRequest, BatchItemResponse
 from app.schemas.flashcard import FlashcardCreate, FlashcardUpdate, FlashcardResponse
 from app.schemas.flashcard_review import FlashcardReviewCreate, FlashcardReviewResponse
+from app.api.v1.batch import batch_ids, batch_response
 from app.api.v1.dependencies import get_current_user
+from app.api.v1.fields import field_options, parse_fields
+from app.api.v1.responses import item_response, list_response
 
 router = APIRouter(prefix="/flashcards", tags=["Flashcards"])
 
@@ -25,12 +35,13 @@ class TagIdsRequest(BaseModel):
 
 
 async def _get_card_owned_by_user(
-    card_id: uuid.UUID, current_user: User, db: AsyncSession
+    card_id: uuid.UUID, current_user: User, db: AsyncSession, options: Sequence[Any] = ()
 ) -> Flashcard:
     result = await db.execute(
         select(Flashcard)
         .join(FlashcardDeck, Flashcard.deck_id == FlashcardDeck.id)
         .where(Flashcard.id == card_id, FlashcardDeck.user_id == current_user.id)
+        .options(*options)
     )
     card = result.scalar_one_or_none()
     if card is None:
@@ -40,25 +51,36 @@ async def _get_card_owned_by_user(
 
 @router.get("/due", response_model=List[FlashcardResponse])
 async def list_due_cards(
+    request: Request,
     skip: int = 0,
     limit: int = 20,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[FlashcardResponse]:
+) -> Response:
     now = datetime.now(timezone.utc)
-    result = await db.execute(
-        select(Flashcard)
-        .join(FlashcardDeck, Flashcard.deck_id == FlashcardDeck.id)
-        .where(
-            FlashcardDeck.user_id == current_user.id,
-            Flashcard.is_suspended == False,  # noqa: E712
-            (Flashcard.next_review_date.is_(None)) | (Flashcard.next_review_date <= now),
+    selected = parse_fields(FlashcardResponse, fields)
+
+    async def load(session: AsyncSession) -> bytes:
+        # Clients poll this on every screen; identical concurrent polls share
+        # one query and one serialized body.
+        result = await session.execute(
+            select(Flashcard)
+            .join(FlashcardDeck, Flashcard.deck_id == FlashcardDeck.id)
+            .where(
+                FlashcardDeck.user_id == current_user.id,
+                Flashcard.is_suspended == False,  # noqa: E712
+                (Flashcard.next_review_date.is_(None)) | (Flashcard.next_review_date <= now),
+            )
+            .options(*field_options(Flashcard, selected))
+            .offset(skip)
+            .limit(limit)
         )
-        .offset(skip)
-        .limit(limit)
-    )
-    cards = result.scalars().all()
-    return [FlashcardResponse.model_validate(c) for c in cards]
+        cards = result.scalars().all()
+        return list_response(FlashcardResponse, cards, selected).body
+
+    content = await singleflight.do(request_key(request, current_user.id), load, db)
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("", response_model=FlashcardResponse, status_code=status.HTTP_201_CREATED)
@@ -88,20 +110,41 @@ async def create_flashcard(
         difficulty_rating=payload.difficulty_rating,
     )
     db.add(card)
-    deck.total_cards = (deck.total_cards or 0) + 1
+    await increment(db, FlashcardDeck.total_cards, deck.id)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(card)
     return FlashcardResponse.model_validate(card)
 
 
+@router.post("/batch-get", response_model=List[BatchItemResponse[FlashcardResponse]])
+async def batch_get_flashcards(
+    payload: BatchGetRequest,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    ids = batch_ids(payload)
+    selected = parse_fields(FlashcardResponse, fields)
+    result = await db.execute(
+        select(Flashcard)
+        .join(FlashcardDeck, Flashcard.deck_id == FlashcardDeck.id)
+        .where(Flashcard.id.in_(set(ids)), FlashcardDeck.user_id == current_user.id)
+        .options(*field_options(Flashcard, selected))
+    )
+    return batch_response(FlashcardResponse, ids, result.scalars().all(), "Flashcard not found", selected)
+
+
 @router.get("/{card_id}", response_model=FlashcardResponse)
 async def get_flashcard(
     card_id: uuid.UUID,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> FlashcardResponse:
-    card = await _get_card_owned_by_user(card_id, current_user, db)
-    return FlashcardResponse.model_validate(card)
+) -> Response:
+    selected = parse_fields(FlashcardResponse, fields)
+    card = await _get_card_owned_by_user(card_id, current_user, db, field_options(Flashcard, selected))
+    return item_response(FlashcardResponse, card, selected)
 
 
 @router.patch("/{card_id}", response_model=FlashcardResponse)
@@ -118,6 +161,7 @@ async def update_flashcard(
         setattr(card, field, value)
 
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(card)
     return FlashcardResponse.model_validate(card)
 
@@ -129,16 +173,13 @@ async def delete_flashcard(
     db: AsyncSession = Depends(get_db),
 ) -> None:
     card = await _get_card_owned_by_user(card_id, current_user, db)
-
-    deck_result = await db.execute(
-        select(FlashcardDeck).where(FlashcardDeck.id == card.deck_id)
-    )
-    deck = deck_result.scalar_one_or_none()
-    if deck is not None and deck.total_cards > 0:
-        deck.total_cards -= 1
-
+    await increment(db, FlashcardDeck.total_cards, card.deck_id, -1)
+    await detach_all_tags(db, "flashcard", {card.id})
+    record_deletion(db, current_user.id, "flashcard", card.id)
     await db.delete(card)
     await db.commit()
+    tag_index.invalidate(current_user.id)
+    subject_overviews.invalidate(current_user.id)
 
 
 @router.post("/{card_id}/review", response_model=FlashcardReviewResponse, status_code=status.HTTP_201_CREATED)
@@ -162,12 +203,14 @@ async def create_review(
         new_interval=payload.new_interval,
     )
     db.add(review)
-    card.total_reviews = (card.total_reviews or 0) + 1
-    if payload.quality_rating is not None and payload.quality_rating >= 3:
-        card.correct_reviews = (card.correct_reviews or 0) + 1
-
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(review)
+
+    counter_buffer.add(Flashcard.total_reviews, card.id)
+    if payload.quality_rating is not None and payload.quality_rating >= 3:
+        counter_buffer.add(Flashcard.correct_reviews, card.id)
+    record_review(current_user, payload.new_interval, review.reviewed_at)
     return FlashcardReviewResponse.model_validate(review)
 
 
@@ -176,7 +219,7 @@ async def list_reviews(
     card_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[FlashcardReviewResponse]:
+) -> Response:
     card = await _get_card_owned_by_user(card_id, current_user, db)
     result = await db.execute(
         select(FlashcardReview)
@@ -184,7 +227,7 @@ async def list_reviews(
         .order_by(FlashcardReview.reviewed_at.desc())
     )
     reviews = result.scalars().all()
-    return [FlashcardReviewResponse.model_validate(r) for r in reviews]
+    return list_response(FlashcardReviewResponse, reviews)
 
 
 @router.post("/{card_id}/tags", response_model=FlashcardResponse)
@@ -196,14 +239,10 @@ async def add_tags_to_flashcard(
 ) -> FlashcardResponse:
     card = await _get_card_owned_by_user(card_id, current_user, db)
 
-    for tag_id in payload.tag_ids:
-        tag_result = await db.execute(
-            select(Tag).where(Tag.id == tag_id, Tag.user_id == current_user.id)
-        )
-        tag = tag_result.scalar_one_or_none()
-        if tag is not None and tag not in card.tags:
-            card.tags.append(tag)
+    tag_ids = await owned_tag_ids(db, current_user.id, payload.tag_ids)
+    await attach_tags(db, "flashcard", {card.id}, tag_ids)
 
     await db.commit()
+    tag_index.invalidate(current_user.id)
     await db.refresh(card)
     return FlashcardResponse.model_validate(card)
@@ -9,6 +9,8 @@ from app.core.db_setup import get_db
 from app.models.study_goal import StudyGoal
 from app.models.user import User
 from app.schemas.study_goal import StudyGoalCreate, StudyGoalUpdate, StudyGoalResponse
+from app.services.subject_overview import subject_overviews
+from app.services.sync import record_deletion
 from app.api.v1.dependencies import get_current_user
 
 router = APIRouter(prefix="/goals", tags=["Study Goals"])
@@ -51,6 +53,7 @@ async def create_goal(
     )
     db.add(goal)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(goal)
     return StudyGoalResponse.model_validate(goal)
 
@@ -95,6 +98,7 @@ async def update_goal(
         setattr(goal, field, value)
 
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(goal)
     return StudyGoalResponse.model_validate(goal)
 
@@ -114,5 +118,7 @@ async def delete_goal(
     goal = result.scalar_one_or_none()
     if goal is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
+    record_deletion(db, current_user.id, "goal", goal.id)
     await db.delete(goal)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
@@ -1,17 +1,26 @@
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db_setup import get_db
 from app.models.note import Note
-from app.models.tag import Tag
 from app.models.user import User
+from app.schemas.batch import BatchGetRequest, BatchItemResponse
 from app.schemas.note import NoteCreate, NoteUpdate, NoteResponse
-from app.api.v1.dependencies import get_current_user
+from app.services.progress import record_note_created
+from app.services.subject_overview import subject_overviews
+from app.services.sync import record_deletion
+from app.services.tag_index import TagFilter, tag_index
+from app.services.tagging import attach_tags, detach_all_tags, detach_tags, owned_tag_ids
+from app.api.v1.batch import batch_ids, batch_response
+from app.api.v1.dependencies import get_current_user, get_tag_filter
+from app.api.v1.etag import list_etag, not_modified, with_etag
+from app.api.v1.fields import field_options, parse_fields
+from app.api.v1.responses import item_response, list_response
 
 router = APIRouter(prefix="/notes", tags=["Notes"])
 
@@ -22,14 +31,18 @@ class TagIdsRequest(BaseModel):
 
 @router.get("", response_model=List[NoteResponse])
 async def list_notes(
+    request: Request,
     skip: int = 0,
     limit: int = 20,
     subject_id: Optional[uuid.UUID] = None,
     is_archived: Optional[bool] = None,
     is_pinned: Optional[bool] = None,
+    fields: Optional[str] = None,
+    tag_filter: TagFilter = Depends(get_tag_filter),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[NoteResponse]:
+) -> Response:
+    selected = parse_fields(NoteResponse, fields)
     query = select(Note).where(Note.user_id == current_user.id)
     if subject_id is not None:
         query = query.where(Note.subject_id == subject_id)
@@ -37,10 +50,26 @@ async def list_notes(
         query = query.where(Note.is_archived == is_archived)
     if is_pinned is not None:
         query = query.where(Note.is_pinned == is_pinned)
-    query = query.order_by(Note.updated_at.desc()).offset(skip).limit(limit)
+    tagged = await tag_index.where(db, current_user.id, "note", Note.id, tag_filter)
+    tag_version = None
+    if tagged is not None:
+        query = query.where(tagged)
+        # Moving a tag between notes leaves every note's updated_at alone.
+        tag_version = await tag_index.version(db, current_user.id)
+    etag = await list_etag(db, request, query, Note.sync_version, tag_version)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    query = (
+        query.options(*field_options(Note, selected))
+        .order_by(Note.updated_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
     result = await db.execute(query)
     notes = result.scalars().all()
-    return [NoteResponse.model_validate(n) for n in notes]
+    return with_etag(list_response(NoteResponse, notes, selected), etag)
 
 
 @router.post("", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
@@ -62,23 +91,46 @@ async def create_note(
     )
     db.add(note)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(note)
+    record_note_created(current_user, note.created_at)
     return NoteResponse.model_validate(note)
 
 
+@router.post("/batch-get", response_model=List[BatchItemResponse[NoteResponse]])
+async def batch_get_notes(
+    payload: BatchGetRequest,
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    ids = batch_ids(payload)
+    selected = parse_fields(NoteResponse, fields)
+    result = await db.execute(
+        select(Note)
+        .where(Note.id.in_(set(ids)), Note.user_id == current_user.id)
+        .options(*field_options(Note, selected))
+    )
+    return batch_response(NoteResponse, ids, result.scalars().all(), "Note not found", selected)
+
+
 @router.get("/{note_id}", response_model=NoteResponse)
 async def get_note(
     note_id: uuid.UUID,
+    fields: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> NoteResponse:
+) -> Response:
+    selected = parse_fields(NoteResponse, fields)
     result = await db.execute(
-        select(Note).where(Note.id == note_id, Note.user_id == current_user.id)
+        select(Note)
+        .where(Note.id == note_id, Note.user_id == current_user.id)
+        .options(*field_options(Note, selected))
     )
     note = result.scalar_one_or_none()
     if note is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
-    return NoteResponse.model_validate(note)
+    return item_response(NoteResponse, note, selected)
 
 
 @router.patch("/{note_id}", response_model=NoteResponse)
@@ -100,6 +152,7 @@ async def update_note(
         setattr(note, field, value)
 
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(note)
     return NoteResponse.model_validate(note)
 
@@ -116,8 +169,12 @@ async def delete_note(
     note = result.scalar_one_or_none()
     if note is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
+    await detach_all_tags(db, "note", {note.id})
+    record_deletion(db, current_user.id, "note", note.id)
     await db.delete(note)
     await db.commit()
+    tag_index.invalidate(current_user.id)
+    subject_overviews.invalidate(current_user.id)
 
 
 @router.post("/{note_id}/tags", response_model=NoteResponse)
@@ -134,15 +191,11 @@ async def add_tags_to_note(
     if note is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
 
-    for tag_id in payload.tag_ids:
-        tag_result = await db.execute(
-            select(Tag).where(Tag.id == tag_id, Tag.user_id == current_user.id)
-        )
-        tag = tag_result.scalar_one_or_none()
-        if tag is not None and tag not in note.tags:
-            note.tags.append(tag)
+    tag_ids = await owned_tag_ids(db, current_user.id, payload.tag_ids)
+    await attach_tags(db, "note", {note.id}, tag_ids)
 
     await db.commit()
+    tag_index.invalidate(current_user.id)
     await db.refresh(note)
     return NoteResponse.model_validate(note)
 
@@ -161,11 +214,9 @@ async def remove_tag_from_note(
     if note is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
 
-    tag_result = await db.execute(select(Tag).where(Tag.id == tag_id))
-    tag = tag_result.scalar_one_or_none()
-    if tag is not None and tag in note.tags:
-        note.tags.remove(tag)
+    await detach_tags(db, "note", {note.id}, {tag_id})
 
     await db.commit()
+    tag_index.invalidate(current_user.id)
     await db.refresh(note)
     return NoteResponse.model_validate(note)
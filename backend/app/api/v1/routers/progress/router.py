@@ -1,35 +1,43 @@
 from datetime import date, timedelta
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db_setup import get_db
 from app.models.daily_progress import DailyProgress
 from app.models.user import User
+from app.models.user_streak import UserStreak
 from app.schemas.daily_progress import DailyProgressCreate, DailyProgressUpdate, DailyProgressResponse
+from app.services.progress import local_date, rebuild_streaks, record_study_day
+from app.services.singleflight import request_key, singleflight
 from app.api.v1.dependencies import get_current_user
+from app.api.v1.etag import list_etag, not_modified, with_etag
+from app.api.v1.responses import list_response
 
 router = APIRouter(prefix="/progress", tags=["Progress"])
 
 
 @router.get("/daily", response_model=List[DailyProgressResponse])
 async def list_daily_progress(
+    request: Request,
     skip: int = 0,
     limit: int = 20,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[DailyProgressResponse]:
+) -> Response:
+    query = select(DailyProgress).where(DailyProgress.user_id == current_user.id)
+    etag = await list_etag(db, request, query, DailyProgress.updated_at)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
     result = await db.execute(
-        select(DailyProgress)
-        .where(DailyProgress.user_id == current_user.id)
-        .order_by(DailyProgress.date.desc())
-        .offset(skip)
-        .limit(limit)
+        query.order_by(DailyProgress.date.desc()).offset(skip).limit(limit)
     )
     records = result.scalars().all()
-    return [DailyProgressResponse.model_validate(r) for r in records]
+    return with_etag(list_response(DailyProgressResponse, records), etag)
 
 
 @router.get("/daily/{progress_date}", response_model=DailyProgressResponse)
@@ -78,6 +86,8 @@ async def create_daily_progress(
         streak_days=payload.streak_days,
     )
     db.add(record)
+    if record.total_study_minutes > 0:
+        await record_study_day(db, current_user.id, record.date)
     await db.commit()
     await db.refresh(record)
     return DailyProgressResponse.model_validate(record)
@@ -103,6 +113,8 @@ async def update_daily_progress(
     update_data = payload.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(record, field, value)
+    if record.total_study_minutes > 0:
+        await record_study_day(db, current_user.id, record.date)
 
     await db.commit()
     await db.refresh(record)
@@ -111,39 +123,32 @@ async def update_daily_progress(
 
 @router.get("/streak")
 async def get_streak(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    result = await db.execute(
-        select(DailyProgress)
-        .where(DailyProgress.user_id == current_user.id)
-        .order_by(DailyProgress.date.desc())
-        .limit(365)
-    )
-    records = result.scalars().all()
-
-    if not records:
-        return {"streak_days": 0, "last_study_date": None}
-
-    last_study_date: Optional[date] = records[0].date
-    streak = 0
-    check_date = date.today()
-
-    for record in records:
-        if record.date == check_date:
-            if record.total_study_minutes > 0:
-                streak += 1
-                check_date = check_date - timedelta(days=1)
-            else:
-                break
-        elif record.date == check_date - timedelta(days=1):
-            check_date = check_date - timedelta(days=1)
-            if record.total_study_minutes > 0:
-                streak += 1
-                check_date = check_date - timedelta(days=1)
-            else:
-                break
-        else:
-            break
-
-    return {"streak_days": streak, "last_study_date": last_study_date}
+    async def load(session: AsyncSession) -> Optional[dict]:
+        result = await session.execute(select(UserStreak).where(UserStreak.user_id == current_user.id))
+        streak = result.scalar_one_or_none()
+        if streak is None:
+            return None
+        if streak.last_study_date is None:
+            return {"streak_days": 0, "longest_streak": 0, "last_study_date": None}
+
+        # The stored streak stays current until a full local day passes without study.
+        yesterday = local_date(current_user) - timedelta(days=1)
+        current = streak.current_streak if streak.last_study_date >= yesterday else 0
+        return {
+            "streak_days": current,
+            "longest_streak": streak.longest_streak,
+            "last_study_date": streak.last_study_date,
+        }
+
+    streak = await singleflight.do(request_key(request, current_user.id), load, db)
+    if streak is None:
+        # First read for a user with history predating streak tracking. The
+        # rebuild writes, so it runs here rather than in the shared flight.
+        await rebuild_streaks(db, current_user.id)
+        streak = await load(db)
+    # Shared between concurrent callers; copied so no caller sees another's mutations.
+    return dict(streak)
@@ -0,0 +1,39 @@
+import uuid
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_setup import get_db
+from app.models.user import User
+from app.schemas.search import SearchResultResponse
+from app.services.search import SEARCH_TYPES, search
+from app.api.v1.dependencies import get_current_user
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("", response_model=List[SearchResultResponse])
+async def search_content(
+    q: str,
+    types: Optional[str] = None,
+    subject_id: Optional[uuid.UUID] = None,
+    tag_id: Optional[uuid.UUID] = None,
+    skip: int = 0,
+    limit: int = 20,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> List[SearchResultResponse]:
+    if not q.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Query must not be empty")
+    requested = SEARCH_TYPES
+    if types:
+        requested = tuple(dict.fromkeys(t.strip() for t in types.split(",") if t.strip()))
+        unknown = [t for t in requested if t not in SEARCH_TYPES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown search type: {', '.join(unknown)}",
+            )
+    hits = await search(db, current_user.id, q, requested, subject_id, tag_id, skip, limit)
+    return [SearchResultResponse.model_validate(hit) for hit in hits]
@@ -10,6 +10,9 @@ from app.core.db_setup import get_db
 from app.models.study_session import StudySession
 from app.models.user import User
 from app.schemas.study_session import StudySessionCreate, StudySessionUpdate, StudySessionResponse
+from app.services.progress import record_study_minutes
+from app.services.subject_overview import subject_overviews
+from app.services.sync import record_deletion
 from app.api.v1.dependencies import get_current_user
 
 router = APIRouter(prefix="/study-sessions", tags=["Study Sessions"])
@@ -48,6 +51,7 @@ async def create_session(
     )
     db.add(session)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(session)
     return StudySessionResponse.model_validate(session)
 
@@ -92,6 +96,7 @@ async def update_session(
         setattr(session, field, value)
 
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(session)
     return StudySessionResponse.model_validate(session)
 
@@ -111,8 +116,10 @@ async def delete_session(
     session = result.scalar_one_or_none()
     if session is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Study session not found")
+    record_deletion(db, current_user.id, "session", session.id)
     await db.delete(session)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
 
 
 @router.post("/{session_id}/complete", response_model=StudySessionResponse)
@@ -132,6 +139,7 @@ async def complete_session(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Study session not found")
 
     now = datetime.now(timezone.utc)
+    was_completed = session.is_completed
     session.is_completed = True
     session.ended_at = now
 
@@ -143,5 +151,8 @@ async def complete_session(
         session.duration_minutes = int(duration_seconds / 60)
 
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(session)
+    if not was_completed:
+        record_study_minutes(current_user, session.duration_minutes or 0, now)
     return StudySessionResponse.model_validate(session)
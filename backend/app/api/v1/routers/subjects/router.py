@@ -1,14 +1,21 @@
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db_setup import get_db
 from app.models.study_subject import StudySubject
 from app.models.user import User
-from app.schemas.study_subject import StudySubjectCreate, StudySubjectUpdate, StudySubjectResponse
+from app.schemas.study_subject import (
+    StudySubjectCreate,
+    StudySubjectUpdate,
+    StudySubjectResponse,
+    SubjectOverviewResponse,
+)
+from app.services.subject_overview import subject_overviews
+from app.services.sync import record_deletion
 from app.api.v1.dependencies import get_current_user
 
 router = APIRouter(prefix="/subjects", tags=["Subjects"])
@@ -68,6 +75,20 @@ async def get_subject(
     return StudySubjectResponse.model_validate(subject)
 
 
+@router.get("/{subject_id}/overview", response_model=SubjectOverviewResponse)
+async def get_subject_overview(
+    subject_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    # Counts, due cards, goal progress and the newest items of each kind,
+    # replacing the per-collection list calls the subject page used to make.
+    content = await subject_overviews.get(db, current_user.id, subject_id)
+    if content is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subject not found")
+    return Response(content=content, media_type="application/json")
+
+
 @router.patch("/{subject_id}", response_model=StudySubjectResponse)
 async def update_subject(
     subject_id: uuid.UUID,
@@ -90,6 +111,7 @@ async def update_subject(
         setattr(subject, field, value)
 
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
     await db.refresh(subject)
     return StudySubjectResponse.model_validate(subject)
 
@@ -109,5 +131,7 @@ async def delete_subject(
     subject = result.scalar_one_or_none()
     if subject is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subject not found")
+    record_deletion(db, current_user.id, "subject", subject.id)
     await db.delete(subject)
     await db.commit()
+    subject_overviews.invalidate(current_user.id)
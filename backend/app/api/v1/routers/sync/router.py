@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_setup import get_db
+from app.models.user import User
+from app.schemas.sync import SyncResponse
+from app.services.sync import changes_since
+from app.api.v1.dependencies import get_current_user
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+MAX_SYNC_LIMIT = 1000
+
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+    since: int = 0,
+    limit: int = 500,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    # since=0 returns everything, a page at a time; afterwards clients pass
+    # back the cursor from the previous response.
+    changes = await changes_since(db, current_user.id, since, max(1, min(limit, MAX_SYNC_LIMIT)))
+    return Response(content=SyncResponse.model_validate(changes).model_dump_json(), media_type="application/json")
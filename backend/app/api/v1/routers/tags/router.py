@@ -0,0 +1,121 @@
+import uuid
+from typing import List, Set, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_setup import get_db
+from app.models.tag import Tag
+from app.models.user import User
+from app.schemas.tag import TagCreate, TagResponse, TagAssignmentResponse, TagSuggestionResponse
+from app.services import tagging
+from app.services.tag_index import tag_index
+from app.api.v1.dependencies import get_current_user
+
+router = APIRouter(prefix="/tags", tags=["Tags"])
+
+MAX_BULK_ITEMS = 5000
+
+
+class BulkTagRequest(BaseModel):
+    item_type: str
+    item_ids: List[uuid.UUID]
+    tag_ids: List[uuid.UUID]
+
+
+@router.get("", response_model=List[TagResponse])
+async def list_tags(
+    skip: int = 0,
+    limit: int = 100,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> List[TagResponse]:
+    result = await db.execute(
+        select(Tag).where(Tag.user_id == current_user.id).order_by(Tag.name).offset(skip).limit(limit)
+    )
+    tags = result.scalars().all()
+    return [TagResponse.model_validate(t) for t in tags]
+
+
+@router.get("/suggest", response_model=List[TagSuggestionResponse])
+async def suggest_tags(
+    prefix: str = "",
+    limit: int = 10,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> List[TagSuggestionResponse]:
+    suggestions = await tag_index.suggest(db, current_user.id, prefix, limit)
+    return [TagSuggestionResponse(id=s.id, name=s.name, usage_count=s.usage_count) for s in suggestions]
+
+
+@router.post("", response_model=TagResponse, status_code=status.HTTP_201_CREATED)
+async def create_tag(
+    payload: TagCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> TagResponse:
+    result = await db.execute(select(Tag).where(Tag.user_id == current_user.id, Tag.name == payload.name))
+    if result.scalar_one_or_none() is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Tag already exists")
+
+    tag = Tag(user_id=current_user.id, name=payload.name)
+    db.add(tag)
+    await db.commit()
+    await db.refresh(tag)
+    tag_index.invalidate(current_user.id)
+    return TagResponse.model_validate(tag)
+
+
+async def _validate_bulk(
+    payload: BulkTagRequest, current_user: User, db: AsyncSession
+) -> Tuple[Set[uuid.UUID], Set[uuid.UUID]]:
+    if payload.item_type not in tagging.TAGGABLE_TYPES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown item type")
+    item_ids = set(payload.item_ids)
+    tag_ids = set(payload.tag_ids)
+    if len(item_ids) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_ITEMS} items per request",
+        )
+
+    if await tagging.owned_tag_ids(db, current_user.id, tag_ids) != tag_ids:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found")
+    if await tagging.owned_item_ids(db, current_user.id, payload.item_type, item_ids) != item_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{payload.item_type.capitalize()} not found",
+        )
+    return item_ids, tag_ids
+
+
+@router.post("/attach", response_model=TagAssignmentResponse)
+async def attach_tags(
+    payload: BulkTagRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> TagAssignmentResponse:
+    item_ids, tag_ids = await _validate_bulk(payload, current_user, db)
+    changed = await tagging.attach_tags(db, payload.item_type, item_ids, tag_ids)
+    await db.commit()
+    tag_index.invalidate(current_user.id)
+    return TagAssignmentResponse(
+        item_type=payload.item_type, items=len(item_ids), tags=len(tag_ids), changed=changed
+    )
+
+
+@router.post("/detach", response_model=TagAssignmentResponse)
+async def detach_tags(
+    payload: BulkTagRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> TagAssignmentResponse:
+    item_ids, tag_ids = await _validate_bulk(payload, current_user, db)
+    changed = await tagging.detach_tags(db, payload.item_type, item_ids, tag_ids)
+    await db.commit()
+    tag_index.invalidate(current_user.id)
+    return TagAssignmentResponse(
+        item_type=payload.item_type, items=len(item_ids), tags=len(tag_ids), changed=changed
+    )
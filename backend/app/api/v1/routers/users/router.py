@@ -1,6 +1,6 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,7 +15,9 @@ from app.schemas.user_preferences import (
     UserPreferencesResponse,
 )
 from app.schemas.ai_usage_stats import AiUsageStatsResponse
+from app.services.singleflight import request_key, singleflight
 from app.api.v1.dependencies import get_current_user
+from app.api.v1.responses import item_response
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -50,16 +52,21 @@ async def delete_me(
 
 @router.get("/me/preferences", response_model=UserPreferencesResponse)
 async def get_preferences(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> UserPreferencesResponse:
-    result = await db.execute(
-        select(UserPreferences).where(UserPreferences.user_id == current_user.id)
-    )
-    prefs = result.scalar_one_or_none()
-    if prefs is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Preferences not found")
-    return UserPreferencesResponse.model_validate(prefs)
+) -> Response:
+    async def load(session: AsyncSession) -> bytes:
+        result = await session.execute(
+            select(UserPreferences).where(UserPreferences.user_id == current_user.id)
+        )
+        prefs = result.scalar_one_or_none()
+        if prefs is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Preferences not found")
+        return item_response(UserPreferencesResponse, prefs).body
+
+    content = await singleflight.do(request_key(request, current_user.id), load, db)
+    return Response(content=content, media_type="application/json")
 
 
 @router.put("/me/preferences", response_model=UserPreferencesResponse)
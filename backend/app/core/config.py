@@ -7,6 +7,18 @@ class Settings(BaseSettings):
     DATABASE_URL: str = ""
     debug: bool = False
     secret_key: str = ""
+    counter_flush_interval_seconds: float = 2.0
+    rollup_flush_interval_seconds: float = 5.0
+    quota_reconcile_interval_seconds: float = 30.0
+    llm_max_concurrency: int = 8
+    llm_interactive_reserved_slots: int = 2
+    response_cache_max_entries: int = 1000
+    response_cache_ttl_seconds: float = 86400.0
+    semantic_cache_threshold: float = 0.85
+    semantic_cache_max_entries_per_subject: int = 500
+    semantic_cache_ttl_days: int = 30
+    subject_overview_max_entries: int = 1000
+    subject_overview_ttl_seconds: float = 60.0
     model_config = SettingsConfigDict(
         env_file=f".env.{os.getenv('ENVIRONMENT', 'dev')}",
         extra="ignore",
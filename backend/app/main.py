@@ -3,6 +3,10 @@ from fastapi import FastAPI, Depends
 from app.core.config import Settings, get_settings
 from contextlib import asynccontextmanager
 from app.core.db_setup import engine, Base
+from app.services.counters import counter_buffer
+from app.services.progress import progress_rollup
+from app.services.quota import ai_quota
+from app.services.usage import usage_rollup
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -12,8 +16,17 @@ async def lifespan(app: FastAPI):
 
     print("Database connected")
 
+    counter_buffer.start()
+    progress_rollup.start()
+    usage_rollup.start()
+    ai_quota.start()
+
     yield
 
+    await ai_quota.stop()
+    await usage_rollup.stop()
+    await progress_rollup.stop()
+    await counter_buffer.stop()
     await engine.dispose()
     print("Database connection closed")
 
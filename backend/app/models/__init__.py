@@ -14,6 +14,7 @@ from app.models.note import Note
 from app.models.document import Document
 from app.models.study_goal import StudyGoal
 from app.models.daily_progress import DailyProgress
+from app.models.user_streak import UserStreak
 from app.models.system_prompt import SystemPrompt
 from app.models.system_prompt_version import SystemPromptVersion
 from app.models.ai_conversation import AiConversation
@@ -28,6 +29,8 @@ from app.models.ai_message_feedback import AiMessageFeedback
 from app.models.ai_generated_content import AiGeneratedContent
 from app.models.ai_gen_note_source import AiGenNoteSource
 from app.models.ai_gen_document_source import AiGenDocumentSource
+from app.models.ai_response_cache import AiResponseCache
+from app.models.ai_semantic_cache_entry import AiSemanticCacheEntry
 from app.models.chatbot_session import ChatbotSession
 from app.models.embedding_vector import EmbeddingVector
 from app.models.audit_log import AuditLog
@@ -35,6 +38,7 @@ from app.models.study_group import StudyGroup
 from app.models.study_group_member import StudyGroupMember
 from app.models.shared_resource import SharedResource
 from app.models.refresh_token import RefreshToken
+from app.models.sync_tombstone import SyncTombstone
 
 __all__ = [
     "User",
@@ -52,6 +56,7 @@ __all__ = [
     "StudySession",
     "StudyGoal",
     "DailyProgress",
+    "UserStreak",
     "AiConversation",
     "AiMessage",
     "AiMessageIntent",
@@ -64,6 +69,8 @@ __all__ = [
     "AiGeneratedContent",
     "AiGenNoteSource",
     "AiGenDocumentSource",
+    "AiResponseCache",
+    "AiSemanticCacheEntry",
     "ChatbotSession",
     "SystemPrompt",
     "SystemPromptVersion",
@@ -73,4 +80,5 @@ __all__ = [
     "StudyGroupMember",
     "SharedResource",
     "RefreshToken",
+    "SyncTombstone",
 ]
@@ -33,10 +33,18 @@ class AiConversation(Base):
     related_document_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("documents.id"), nullable=True)
     related_deck_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("flashcard_decks.id"), nullable=True)
     total_messages: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    message_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    # A fork shares its parent's history up to and including forked_at_message_order
+    # instead of copying those messages.
+    forked_from_conversation_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("ai_conversations.id"), nullable=True)
+    forked_at_message_order: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
     last_message_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     user: Mapped["User"] = relationship("User", back_populates="ai_conversations")
@@ -44,6 +52,10 @@ class AiConversation(Base):
     related_note: Mapped[Optional["Note"]] = relationship("Note", back_populates="ai_conversations", foreign_keys=[related_note_id])
     related_document: Mapped[Optional["Document"]] = relationship("Document", back_populates="ai_conversations", foreign_keys=[related_document_id])
     related_deck: Mapped[Optional["FlashcardDeck"]] = relationship("FlashcardDeck", back_populates="ai_conversations", foreign_keys=[related_deck_id])
+    forked_from: Mapped[Optional["AiConversation"]] = relationship(
+        "AiConversation", remote_side="AiConversation.id", back_populates="forks"
+    )
+    forks: Mapped[List["AiConversation"]] = relationship("AiConversation", back_populates="forked_from")
     messages: Mapped[List["AiMessage"]] = relationship("AiMessage", back_populates="conversation")
     metrics: Mapped[Optional["AiConversationMetrics"]] = relationship("AiConversationMetrics", back_populates="conversation", uselist=False)
     feedback: Mapped[List["AiMessageFeedback"]] = relationship("AiMessageFeedback", back_populates="conversation")
@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, UniqueConstraint, func
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, Numeric, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,6 +29,9 @@ class AiConversationMetrics(Base):
     total_tokens_used: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     avg_tokens_per_message: Mapped[Optional[Decimal]] = mapped_column(Numeric, nullable=True)
     avg_response_time_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Running sums behind avg_response_time_ms, so appends never rescan messages.
+    response_time_total_ms: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    response_time_samples: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     thread_depth_max: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     conversation_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     user_rating: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
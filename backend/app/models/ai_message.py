@@ -4,7 +4,8 @@ import uuid
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db_setup import Base
@@ -17,11 +18,16 @@ if TYPE_CHECKING:
     from app.models.ai_message_content_store import AiMessageContentStore
     from app.models.ai_message_context import AiMessageContext
     from app.models.embedding_vector import EmbeddingVector
+    from app.models.ai_semantic_cache_entry import AiSemanticCacheEntry
 
 
 class AiMessage(Base):
     __tablename__ = "ai_messages"
-    __table_args__ = (UniqueConstraint("conversation_id", "message_order"),)
+    __table_args__ = (
+        UniqueConstraint("conversation_id", "message_order"),
+        Index("ix_ai_messages_conversation_thread_path", "conversation_id", "thread_path"),
+        Index("ix_ai_messages_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     conversation_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("ai_conversations.id"), nullable=False)
     parent_message_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("ai_messages.id"), nullable=True)
@@ -31,11 +37,19 @@ class AiMessage(Base):
     message_order: Mapped[int] = mapped_column(Integer, nullable=False)
     thread_depth: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     is_thread_root: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    # Materialized path of zero-padded message_order segments ("00000001/00000004"),
+    # compared bytewise so a subtree is one contiguous index range.
+    thread_path: Mapped[Optional[str]] = mapped_column(String(collation="C"), nullable=True)
     context_window_position: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     has_large_content: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     tokens_used: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     model_used: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     processing_time_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(content, ''))", persisted=True),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -59,3 +73,4 @@ class AiMessage(Base):
         primaryjoin="and_(EmbeddingVector.source_id == AiMessage.id, EmbeddingVector.source_type == 'ai_message')",
         overlaps="embedding_vectors"
     )
+    semantic_cache_entries: Mapped[List["AiSemanticCacheEntry"]] = relationship("AiSemanticCacheEntry", back_populates="answer_message")
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.db_setup import Base
+
+if TYPE_CHECKING:
+    from app.models.system_prompt_version import SystemPromptVersion
+
+
+class AiResponseCache(Base):
+    __tablename__ = "ai_response_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    model: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    prompt_version_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("system_prompt_versions.id"), nullable=True)
+    content_type: Mapped[str] = mapped_column(String, nullable=False)
+    response: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    tokens_used: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+    prompt_version: Mapped[Optional["SystemPromptVersion"]] = relationship("SystemPromptVersion", back_populates="response_cache_entries")
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.db_setup import Base
+
+if TYPE_CHECKING:
+    from app.models.study_subject import StudySubject
+    from app.models.ai_message import AiMessage
+
+
+class AiSemanticCacheEntry(Base):
+    __tablename__ = "ai_semantic_cache_entries"
+
+    subject_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("study_subjects.id"), nullable=False, index=True)
+    question_text: Mapped[str] = mapped_column(Text, nullable=False)
+    question_embedding: Mapped[list] = mapped_column(JSONB, nullable=False)
+    embedding_model: Mapped[str] = mapped_column(String, nullable=False)
+    answer_message_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("ai_messages.id"), nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    last_hit_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    subject: Mapped["StudySubject"] = relationship("StudySubject", back_populates="semantic_cache_entries")
+    answer_message: Mapped["AiMessage"] = relationship("AiMessage", back_populates="semantic_cache_entries")
@@ -4,11 +4,12 @@ import uuid
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db_setup import Base
+from app.models.sync_version import sync_version_column
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -21,6 +22,9 @@ if TYPE_CHECKING:
 
 class EmbeddingVector(Base):
     __tablename__ = "embedding_vectors"
+    __table_args__ = (
+        Index("ix_embedding_vectors_user_version", "user_id", "sync_version"),
+    )
 
     source_type: Mapped[str] = mapped_column(String, nullable=False)
     source_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
@@ -37,6 +41,9 @@ class EmbeddingVector(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    # Restamped on every write, so HybridRetriever can tell when a user's
+    # chunks or vectors changed without reading them.
+    sync_version: Mapped[int] = sync_version_column()
 
     user: Mapped["User"] = relationship("User", back_populates="embedding_vectors")
     subject: Mapped[Optional["StudySubject"]] = relationship(
@@ -5,11 +5,13 @@ from datetime import datetime
 from decimal import Decimal
 from typing import List, Optional, TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, Text, String, func
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db_setup import Base
 from app.models.associations import flashcard_tags
+from app.models.sync_version import sync_version_column
 
 if TYPE_CHECKING:
     from app.models.flashcard_deck import FlashcardDeck
@@ -20,6 +22,9 @@ if TYPE_CHECKING:
 
 class Flashcard(Base):
     __tablename__ = "flashcards"
+    __table_args__ = (
+        Index("ix_flashcards_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     deck_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("flashcard_decks.id"), nullable=False)
     front_content: Mapped[str] = mapped_column(Text, nullable=False)
@@ -36,9 +41,15 @@ class Flashcard(Base):
     total_reviews: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     correct_reviews: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     is_suspended: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed("setweight(to_tsvector('english', front_content), 'A') || setweight(to_tsvector('english', back_content), 'B') || setweight(to_tsvector('english', coalesce(hint, '') || ' ' || coalesce(explanation, '')), 'C')", persisted=True),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    sync_version: Mapped[int] = sync_version_column()
 
     deck: Mapped["FlashcardDeck"] = relationship("FlashcardDeck", back_populates="flashcards")
     reviews: Mapped[List["FlashcardReview"]] = relationship("FlashcardReview", back_populates="flashcard")
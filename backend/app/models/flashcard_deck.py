@@ -8,6 +8,7 @@ from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db_setup import Base
+from app.models.sync_version import sync_version_column
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -30,7 +31,11 @@ class FlashcardDeck(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
     last_studied_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    sync_version: Mapped[int] = sync_version_column()
 
     user: Mapped["User"] = relationship("User", back_populates="flashcard_decks")
     subject: Mapped[Optional["StudySubject"]] = relationship("StudySubject", back_populates="flashcard_decks")
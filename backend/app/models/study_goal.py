@@ -9,6 +9,7 @@ from sqlalchemy import Boolean, Date, ForeignKey, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db_setup import Base
+from app.models.sync_version import sync_version_column
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -27,6 +28,7 @@ class StudyGoal(Base):
     end_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    sync_version: Mapped[int] = sync_version_column()
 
     user: Mapped["User"] = relationship("User", back_populates="study_goals")
     subject: Mapped[Optional["StudySubject"]] = relationship("StudySubject", back_populates="study_goals")
@@ -9,6 +9,7 @@ from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Numeric, String,
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db_setup import Base
+from app.models.sync_version import sync_version_column
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -32,6 +33,7 @@ class StudySession(Base):
     focus_score: Mapped[Optional[Decimal]] = mapped_column(Numeric, nullable=True)
     mood_rating: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     is_completed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    sync_version: Mapped[int] = sync_version_column()
 
     user: Mapped["User"] = relationship("User", back_populates="study_sessions")
     subject: Mapped[Optional["StudySubject"]] = relationship("StudySubject", back_populates="study_sessions")
@@ -8,6 +8,7 @@ from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db_setup import Base
+from app.models.sync_version import sync_version_column
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -21,6 +22,7 @@ if TYPE_CHECKING:
     from app.models.ai_message_entity import AiMessageEntity
     from app.models.chatbot_session import ChatbotSession
     from app.models.ai_conversation_metrics import AiConversationMetrics
+    from app.models.ai_semantic_cache_entry import AiSemanticCacheEntry
 
 
 class StudySubject(Base):
@@ -37,6 +39,7 @@ class StudySubject(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
     )
+    sync_version: Mapped[int] = sync_version_column()
 
     user: Mapped["User"] = relationship("User", back_populates="study_subjects")
     notes: Mapped[List["Note"]] = relationship("Note", back_populates="subject")
@@ -49,3 +52,4 @@ class StudySubject(Base):
     linked_entities: Mapped[List["AiMessageEntity"]] = relationship("AiMessageEntity", back_populates="linked_subject", foreign_keys="AiMessageEntity.linked_subject_id")
     chatbot_sessions_active: Mapped[List["ChatbotSession"]] = relationship("ChatbotSession", back_populates="active_subject", foreign_keys="ChatbotSession.active_subject_id")
     conversation_metrics: Mapped[List["AiConversationMetrics"]] = relationship("AiConversationMetrics", back_populates="primary_subject", foreign_keys="AiConversationMetrics.primary_subject_id")
+    semantic_cache_entries: Mapped[List["AiSemanticCacheEntry"]] = relationship("AiSemanticCacheEntry", back_populates="subject")
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.db_setup import Base
+from app.models.sync_version import sync_version_column
+
+
+class SyncTombstone(Base):
+    # Records a hard delete so /sync can tell clients to drop the item.
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_version", "user_id", "sync_version"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    item_type: Mapped[str] = mapped_column(String, nullable=False)
+    item_id: Mapped[uuid.UUID] = mapped_column(nullable=False)
+    sync_version: Mapped[int] = sync_version_column()
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Text, cast, func, text
+from sqlalchemy.orm import MappedColumn, mapped_column
+from sqlalchemy.sql.elements import ColumnElement
+
+# sync_version is the 64-bit id of the transaction that last wrote the row.
+# Transaction ids only grow, so a single integer cursor orders changes across
+# every synced table, and unlike a sequence value drawn mid-transaction it can
+# be bounded safely: every transaction below the snapshot xmin has finished,
+# so no row with a lower sync_version can still become visible. ORM inserts
+# and updates, and Core update() statements, stamp it through the column
+# defaults below; an INSERT ... ON CONFLICT DO UPDATE has to set it itself.
+
+
+def current_sync_version() -> ColumnElement:
+    return cast(cast(func.pg_current_xact_id(), Text), BigInteger)
+
+
+def sync_horizon() -> ColumnElement:
+    # Lowest transaction id that may still be running; rows below it are final.
+    return cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+
+def sync_version_column() -> MappedColumn:
+    return mapped_column(
+        BigInteger,
+        default=current_sync_version(),
+        onupdate=current_sync_version(),
+        server_default=text("(pg_current_xact_id()::text::bigint)"),
+        nullable=False,
+        index=True,
+    )
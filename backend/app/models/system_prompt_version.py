@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import List, TYPE_CHECKING
 
 from sqlalchemy import DateTime, ForeignKey, Integer, Text, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -11,6 +11,7 @@ from app.core.db_setup import Base
 
 if TYPE_CHECKING:
     from app.models.system_prompt import SystemPrompt
+    from app.models.ai_response_cache import AiResponseCache
 
 
 class SystemPromptVersion(Base):
@@ -27,3 +28,4 @@ class SystemPromptVersion(Base):
     )
 
     prompt: Mapped["SystemPrompt"] = relationship("SystemPrompt", back_populates="versions")
+    response_cache_entries: Mapped[List["AiResponseCache"]] = relationship("AiResponseCache", back_populates="prompt_version")
@@ -4,11 +4,12 @@ import uuid
 from datetime import datetime
 from typing import List, TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.db_setup import Base
 from app.models.associations import flashcard_tags, note_tags, document_tags
+from app.models.sync_version import sync_version_column
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -19,12 +20,18 @@ if TYPE_CHECKING:
 
 class Tag(Base):
     __tablename__ = "tags"
+    # Names are unique per user, not across users.
+    __table_args__ = (UniqueConstraint("user_id", "name"),)
 
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
-    name: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    # Number of notes, documents and flashcards carrying the tag; kept in step
+    # by app.services.tagging and used to rank autocomplete suggestions.
+    usage_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    sync_version: Mapped[int] = sync_version_column()
 
     user: Mapped["User"] = relationship("User", back_populates="tags")
     flashcards: Mapped[List["Flashcard"]] = relationship(
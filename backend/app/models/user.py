@@ -19,6 +19,7 @@ if TYPE_CHECKING:
     from app.models.study_session import StudySession
     from app.models.study_goal import StudyGoal
     from app.models.daily_progress import DailyProgress
+    from app.models.user_streak import UserStreak
     from app.models.ai_conversation import AiConversation
     from app.models.ai_generated_content import AiGeneratedContent
     from app.models.study_group_member import StudyGroupMember
@@ -42,6 +43,7 @@ class User(Base):
     full_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     timezone: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     study_goal_minutes_per_day: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    plan: Mapped[str] = mapped_column(String, default="free", server_default="free", nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -60,6 +62,7 @@ class User(Base):
     study_sessions: Mapped[List["StudySession"]] = relationship("StudySession", back_populates="user")
     study_goals: Mapped[List["StudyGoal"]] = relationship("StudyGoal", back_populates="user")
     daily_progress: Mapped[List["DailyProgress"]] = relationship("DailyProgress", back_populates="user")
+    streak: Mapped[Optional["UserStreak"]] = relationship("UserStreak", back_populates="user", uselist=False)
     ai_conversations: Mapped[List["AiConversation"]] = relationship("AiConversation", back_populates="user")
     ai_generated_content: Mapped[List["AiGeneratedContent"]] = relationship("AiGeneratedContent", back_populates="user")
     study_group_members: Mapped[List["StudyGroupMember"]] = relationship("StudyGroupMember", back_populates="user")
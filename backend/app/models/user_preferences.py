@@ -28,6 +28,7 @@ class UserPreferences(Base):
     enable_socratic_mode: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     enable_step_by_step: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     enable_rag_context: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    enable_semantic_cache: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
     max_context_messages: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
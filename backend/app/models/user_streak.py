@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
+from typing import Optional, TYPE_CHECKING
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.db_setup import Base
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+class UserStreak(Base):
+    __tablename__ = "user_streaks"
+    __table_args__ = (UniqueConstraint("user_id"),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    current_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    longest_streak: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_study_date: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    user: Mapped["User"] = relationship("User", back_populates="streak")
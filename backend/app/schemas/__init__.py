@@ -4,8 +4,11 @@ from app.schemas.user_preferences import (
 )
 from app.schemas.study_subject import (
     StudySubjectBase, StudySubjectCreate, StudySubjectUpdate, StudySubjectResponse,
+    SubjectOverviewCounts, SubjectOverviewItem, SubjectGoalProgress, SubjectOverviewResponse,
+)
+from app.schemas.tag import (
+    TagBase, TagCreate, TagUpdate, TagResponse, TagAssignmentResponse, TagSuggestionResponse,
 )
-from app.schemas.tag import TagBase, TagCreate, TagUpdate, TagResponse
 from app.schemas.flashcard_deck import (
     FlashcardDeckBase, FlashcardDeckCreate, FlashcardDeckUpdate, FlashcardDeckResponse,
 )
@@ -93,6 +96,10 @@ from app.schemas.shared_resource import (
 from app.schemas.refresh_token import (
     RefreshTokenBase, RefreshTokenCreate, RefreshTokenUpdate, RefreshTokenResponse,
 )
+from app.schemas.user_streak import UserStreakBase, UserStreakResponse
+from app.schemas.search import SearchResultResponse
+from app.schemas.sync import SyncResponse, SyncTombstoneResponse
+from app.schemas.batch import BatchGetRequest, BatchItemResponse
 
 __all__ = [
     # user
@@ -101,8 +108,10 @@ __all__ = [
     "UserPreferencesBase", "UserPreferencesCreate", "UserPreferencesUpdate", "UserPreferencesResponse",
     # study_subject
     "StudySubjectBase", "StudySubjectCreate", "StudySubjectUpdate", "StudySubjectResponse",
+    "SubjectOverviewCounts", "SubjectOverviewItem", "SubjectGoalProgress", "SubjectOverviewResponse",
     # tag
-    "TagBase", "TagCreate", "TagUpdate", "TagResponse",
+    "TagBase", "TagCreate", "TagUpdate", "TagResponse", "TagAssignmentResponse",
+    "TagSuggestionResponse",
     # flashcard_deck
     "FlashcardDeckBase", "FlashcardDeckCreate", "FlashcardDeckUpdate", "FlashcardDeckResponse",
     # flashcard
@@ -165,4 +174,12 @@ __all__ = [
     "SharedResourceBase", "SharedResourceCreate", "SharedResourceUpdate", "SharedResourceResponse",
     # refresh_token
     "RefreshTokenBase", "RefreshTokenCreate", "RefreshTokenUpdate", "RefreshTokenResponse",
+    # user_streak
+    "UserStreakBase", "UserStreakResponse",
+    # search
+    "SearchResultResponse",
+    # sync
+    "SyncResponse", "SyncTombstoneResponse",
+    # batch
+    "BatchGetRequest", "BatchItemResponse",
 ]
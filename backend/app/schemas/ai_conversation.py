@@ -35,6 +35,8 @@ class AiConversationUpdate(BaseModel):
 class AiConversationResponse(AiConversationBase):
     id: uuid.UUID
     total_messages: int
+    forked_from_conversation_id: Optional[uuid.UUID] = None
+    forked_at_message_order: Optional[int] = None
     created_at: datetime
     last_message_at: Optional[datetime] = None
 
@@ -22,7 +22,8 @@ class AiMessageBase(BaseModel):
 
 
 class AiMessageCreate(AiMessageBase):
-    pass
+    # Allocated by the server; accepted only for backwards compatibility.
+    message_order: Optional[int] = None
 
 
 class AiMessageUpdate(BaseModel):
@@ -37,6 +38,7 @@ class AiMessageUpdate(BaseModel):
 
 class AiMessageResponse(AiMessageBase):
     id: uuid.UUID
+    thread_path: Optional[str] = None
     created_at: datetime
 
     model_config = {"from_attributes": True}
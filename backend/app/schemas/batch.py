@@ -0,0 +1,19 @@
+import uuid
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class BatchGetRequest(BaseModel):
+    ids: List[uuid.UUID]
+
+
+class BatchItemResponse(BaseModel, Generic[T]):
+    # One entry per requested id, in request order: item on 200, detail
+    # otherwise.
+    id: uuid.UUID
+    status: int
+    item: Optional[T] = None
+    detail: Optional[str] = None
@@ -0,0 +1,15 @@
+import uuid
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SearchResultResponse(BaseModel):
+    type: str
+    id: uuid.UUID
+    title: Optional[str] = None
+    snippet: Optional[str] = None
+    rank: float
+    subject_id: Optional[uuid.UUID] = None
+
+    model_config = {"from_attributes": True}
@@ -1,6 +1,7 @@
 import uuid
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -30,3 +31,42 @@ class StudySubjectResponse(StudySubjectBase):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class SubjectOverviewCounts(BaseModel):
+    notes: int
+    documents: int
+    decks: int
+    cards: int
+    due_cards: int
+    goals: int
+    completed_goals: int
+    sessions: int
+    study_minutes: int
+    conversations: int
+
+
+class SubjectOverviewItem(BaseModel):
+    id: uuid.UUID
+    title: Optional[str] = None
+    at: datetime
+
+
+class SubjectGoalProgress(BaseModel):
+    id: uuid.UUID
+    goal_type: str
+    target_value: Optional[Decimal] = None
+    current_value: Optional[Decimal] = None
+    end_date: Optional[date] = None
+    is_completed: bool
+
+
+class SubjectOverviewResponse(BaseModel):
+    subject: StudySubjectResponse
+    counts: SubjectOverviewCounts
+    goals: List[SubjectGoalProgress]
+    recent_notes: List[SubjectOverviewItem]
+    recent_documents: List[SubjectOverviewItem]
+    recent_decks: List[SubjectOverviewItem]
+    recent_sessions: List[SubjectOverviewItem]
+    recent_conversations: List[SubjectOverviewItem]
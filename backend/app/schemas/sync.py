@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.document import DocumentResponse
+from app.schemas.flashcard import FlashcardResponse
+from app.schemas.flashcard_deck import FlashcardDeckResponse
+from app.schemas.note import NoteResponse
+from app.schemas.study_goal import StudyGoalResponse
+from app.schemas.study_session import StudySessionResponse
+from app.schemas.study_subject import StudySubjectResponse
+from app.schemas.tag import TagResponse
+
+
+class SyncTombstoneResponse(BaseModel):
+    item_type: str
+    item_id: uuid.UUID
+    deleted_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class SyncResponse(BaseModel):
+    # Pass cursor back as ?since= on the next call; while has_more is true
+    # there are further changes past this page.
+    cursor: int
+    has_more: bool
+    subjects: List[StudySubjectResponse] = []
+    notes: List[NoteResponse] = []
+    documents: List[DocumentResponse] = []
+    tags: List[TagResponse] = []
+    decks: List[FlashcardDeckResponse] = []
+    cards: List[FlashcardResponse] = []
+    goals: List[StudyGoalResponse] = []
+    sessions: List[StudySessionResponse] = []
+    deleted: List[SyncTombstoneResponse] = []
+
+    model_config = {"from_attributes": True}
@@ -10,7 +10,7 @@ class TagBase(BaseModel):
 
 
 class TagCreate(TagBase):
-    user_id: uuid.UUID
+    pass
 
 
 class TagUpdate(BaseModel):
@@ -20,6 +20,20 @@ class TagUpdate(BaseModel):
 class TagResponse(TagBase):
     id: uuid.UUID
     user_id: uuid.UUID
+    usage_count: int = 0
     created_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class TagAssignmentResponse(BaseModel):
+    item_type: str
+    items: int
+    tags: int
+    changed: int
+
+
+class TagSuggestionResponse(BaseModel):
+    id: uuid.UUID
+    name: str
+    usage_count: int
@@ -25,6 +25,7 @@ class UserUpdate(BaseModel):
 
 class UserResponse(UserBase):
     id: uuid.UUID
+    plan: str
     is_active: bool
     is_verified: bool
     created_at: datetime
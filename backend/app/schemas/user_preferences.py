@@ -16,6 +16,7 @@ class UserPreferencesBase(BaseModel):
     enable_socratic_mode: bool = False
     enable_step_by_step: bool = False
     enable_rag_context: bool = False
+    enable_semantic_cache: bool = False
     max_context_messages: Optional[int] = None
 
 
@@ -33,6 +34,7 @@ class UserPreferencesUpdate(BaseModel):
     enable_socratic_mode: Optional[bool] = None
     enable_step_by_step: Optional[bool] = None
     enable_rag_context: Optional[bool] = None
+    enable_semantic_cache: Optional[bool] = None
     max_context_messages: Optional[int] = None
 
 
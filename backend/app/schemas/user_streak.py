@@ -0,0 +1,19 @@
+import uuid
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class UserStreakBase(BaseModel):
+    user_id: uuid.UUID
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_study_date: Optional[date] = None
+
+
+class UserStreakResponse(UserStreakBase):
+    id: uuid.UUID
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
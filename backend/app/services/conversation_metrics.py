@@ -0,0 +1,134 @@
+import asyncio
+import uuid
+from typing import List
+
+from sqlalchemy import BigInteger, Integer, Numeric, case, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_setup import AsyncSessionLocal
+from app.models.ai_conversation import AiConversation
+from app.models.ai_conversation_metrics import AiConversationMetrics
+from app.models.ai_message import AiMessage
+
+_RECOMPUTED_COLUMNS = [
+    "total_messages",
+    "user_messages",
+    "assistant_messages",
+    "total_tokens_used",
+    "avg_tokens_per_message",
+    "response_time_total_ms",
+    "response_time_samples",
+    "avg_response_time_ms",
+    "thread_depth_max",
+    "primary_subject_id",
+]
+
+
+async def record_message_metrics(db: AsyncSession, msg: AiMessage, user_id: uuid.UUID) -> None:
+    # Folds one appended message into the conversation's running sums with a
+    # single upsert; averages are derived from the updated sums in the same SET.
+    tokens = msg.tokens_used or 0
+    response_time = msg.processing_time_ms
+    subject_id = (
+        select(AiConversation.subject_id)
+        .where(AiConversation.id == msg.conversation_id)
+        .scalar_subquery()
+    )
+    stmt = insert(AiConversationMetrics).values(
+        id=uuid.uuid4(),
+        conversation_id=msg.conversation_id,
+        user_id=user_id,
+        total_messages=1,
+        user_messages=1 if msg.role == "user" else 0,
+        assistant_messages=1 if msg.role == "assistant" else 0,
+        total_tokens_used=tokens,
+        avg_tokens_per_message=tokens,
+        response_time_total_ms=response_time or 0,
+        response_time_samples=1 if response_time is not None else 0,
+        avg_response_time_ms=response_time,
+        thread_depth_max=msg.thread_depth,
+        primary_subject_id=subject_id,
+    )
+    m = AiConversationMetrics
+    new = stmt.excluded
+    total_messages = m.total_messages + 1
+    total_tokens = m.total_tokens_used + new.total_tokens_used
+    response_total = m.response_time_total_ms + new.response_time_total_ms
+    response_samples = m.response_time_samples + new.response_time_samples
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["conversation_id"],
+            set_={
+                "total_messages": total_messages,
+                "user_messages": m.user_messages + new.user_messages,
+                "assistant_messages": m.assistant_messages + new.assistant_messages,
+                "total_tokens_used": total_tokens,
+                "avg_tokens_per_message": cast(total_tokens, Numeric) / total_messages,
+                "response_time_total_ms": response_total,
+                "response_time_samples": response_samples,
+                "avg_response_time_ms": case(
+                    (response_samples > 0, cast(response_total / response_samples, Integer)),
+                    else_=None,
+                ),
+                "thread_depth_max": func.greatest(m.thread_depth_max, new.thread_depth_max),
+                "primary_subject_id": new.primary_subject_id,
+                "calculated_at": func.now(),
+            },
+        )
+    )
+
+
+async def _recompute_chunk(conversation_ids: List[uuid.UUID]) -> int:
+    totals = (
+        select(
+            func.gen_random_uuid(),
+            AiConversation.id,
+            AiConversation.user_id,
+            func.count(AiMessage.id),
+            func.count(AiMessage.id).filter(AiMessage.role == "user"),
+            func.count(AiMessage.id).filter(AiMessage.role == "assistant"),
+            func.coalesce(func.sum(AiMessage.tokens_used), 0),
+            cast(func.coalesce(func.sum(AiMessage.tokens_used), 0), Numeric) / func.count(AiMessage.id),
+            func.coalesce(func.sum(cast(AiMessage.processing_time_ms, BigInteger)), 0),
+            func.count(AiMessage.processing_time_ms),
+            cast(func.avg(AiMessage.processing_time_ms), Integer),
+            func.max(AiMessage.thread_depth),
+            AiConversation.subject_id,
+        )
+        .join(AiMessage, AiMessage.conversation_id == AiConversation.id)
+        .where(AiConversation.id.in_(conversation_ids))
+        .group_by(AiConversation.id)
+    )
+    stmt = insert(AiConversationMetrics).from_select(
+        ["id", "conversation_id", "user_id", *_RECOMPUTED_COLUMNS], totals
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["conversation_id"],
+        set_={
+            **{name: stmt.excluded[name] for name in _RECOMPUTED_COLUMNS},
+            "calculated_at": func.now(),
+        },
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.rowcount
+
+
+async def recompute_conversation_metrics(chunk_size: int = 500, concurrency: int = 4) -> int:
+    # Full rebuild from ai_messages: conversations are split into id-ordered
+    # chunks and each chunk is aggregated in its own session and transaction,
+    # with up to `concurrency` chunks in flight.
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(AiConversation.id).order_by(AiConversation.id))
+        conversation_ids = list(result.scalars().all())
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(chunk: List[uuid.UUID]) -> int:
+        async with semaphore:
+            return await _recompute_chunk(chunk)
+
+    chunks = [conversation_ids[i:i + chunk_size] for i in range(0, len(conversation_ids), chunk_size)]
+    return sum(await asyncio.gather(*(run(chunk) for chunk in chunks)))
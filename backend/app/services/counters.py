@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from typing import Dict, Optional, Set, Tuple, Type
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import get_settings
+from app.core.db_setup import AsyncSessionLocal, Base
+from app.models.ai_conversation import AiConversation
+from app.models.ai_message import AiMessage
+from app.models.flashcard import Flashcard
+from app.models.flashcard_deck import FlashcardDeck
+from app.models.flashcard_review import FlashcardReview
+
+logger = logging.getLogger(__name__)
+
+
+async def increment(
+    db: AsyncSession, column: InstrumentedAttribute, row_id: uuid.UUID, n: int = 1
+) -> Optional[int]:
+    # Single UPDATE ... SET x = x + :n RETURNING x, so concurrent writers never
+    # lose increments and the row does not need to be loaded first. Counters are
+    # clamped at zero so a stray decrement cannot drive them negative.
+    model = column.class_
+    result = await db.execute(
+        update(model)
+        .where(model.id == row_id)
+        .values({column.key: func.greatest(column + n, 0)})
+        .returning(column)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+class CounterBuffer:
+    # Coalesces increments for hot rows in memory and applies them with one
+    # UPDATE per row every flush interval. Reads may lag by up to one interval.
+
+    def __init__(self, flush_interval: float, max_pending_rows: int = 1000) -> None:
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max_pending_rows
+        self._pending: Dict[Tuple[Type[Base], uuid.UUID], Dict[str, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # Threshold flushes started from add(); the loop only keeps weak refs to tasks.
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._flush_lock = asyncio.Lock()
+
+    def add(self, column: InstrumentedAttribute, row_id: uuid.UUID, n: int = 1) -> None:
+        deltas = self._pending.setdefault((column.class_, row_id), defaultdict(int))
+        deltas[column.key] += n
+        if len(self._pending) >= self.max_pending_rows:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            try:
+                async with AsyncSessionLocal() as db:
+                    # Stable row order keeps concurrent flushers from deadlocking.
+                    for (model, row_id), deltas in sorted(pending.items(), key=lambda item: str(item[0][1])):
+                        values = {
+                            key: func.greatest(getattr(model, key) + n, 0)
+                            for key, n in deltas.items()
+                            if n
+                        }
+                        if not values:
+                            continue
+                        await db.execute(
+                            update(model)
+                            .where(model.id == row_id)
+                            .values(values)
+                            .execution_options(synchronize_session=False)
+                        )
+                    await db.commit()
+            except Exception:
+                logger.exception("Counter flush failed; re-queueing %d rows", len(pending))
+                for key, deltas in pending.items():
+                    merged = self._pending.setdefault(key, defaultdict(int))
+                    for column_key, n in deltas.items():
+                        merged[column_key] += n
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
+
+
+counter_buffer = CounterBuffer(flush_interval=get_settings().counter_flush_interval_seconds)
+
+
+async def reconcile_counters(db: AsyncSession) -> Dict[str, int]:
+    # Recomputes every denormalized counter from its source table. Only rows
+    # whose stored value has drifted are rewritten.
+    card_count = (
+        select(func.count(Flashcard.id))
+        .where(Flashcard.deck_id == FlashcardDeck.id)
+        .scalar_subquery()
+    )
+    review_count = (
+        select(func.count(FlashcardReview.id))
+        .where(FlashcardReview.flashcard_id == Flashcard.id)
+        .scalar_subquery()
+    )
+    correct_count = (
+        select(func.count(FlashcardReview.id))
+        .where(
+            FlashcardReview.flashcard_id == Flashcard.id,
+            FlashcardReview.quality_rating >= 3,
+        )
+        .scalar_subquery()
+    )
+    # A fork also counts the shared prefix it shows, forked_at_message_order messages long.
+    message_count = (
+        select(func.count(AiMessage.id))
+        .where(AiMessage.conversation_id == AiConversation.id)
+        .scalar_subquery()
+    ) + func.coalesce(AiConversation.forked_at_message_order, 0)
+
+    statements = {
+        "flashcard_decks.total_cards": update(FlashcardDeck)
+        .where(FlashcardDeck.total_cards != card_count)
+        .values(total_cards=card_count),
+        "flashcards.total_reviews": update(Flashcard)
+        .where(
+            (Flashcard.total_reviews != review_count)
+            | (Flashcard.correct_reviews != correct_count)
+        )
+        .values(total_reviews=review_count, correct_reviews=correct_count),
+        "ai_conversations.total_messages": update(AiConversation)
+        .where(AiConversation.total_messages != message_count)
+        .values(total_messages=message_count),
+    }
+
+    fixed: Dict[str, int] = {}
+    for name, stmt in statements.items():
+        result = await db.execute(stmt.execution_options(synchronize_session=False))
+        fixed[name] = result.rowcount
+    await db.commit()
+    return fixed
@@ -0,0 +1,38 @@
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+
+# Dependency-free embedder: signed feature hashing of word unigrams, word
+# bigrams and character trigrams into a fixed-width, L2-normalised vector.
+# It captures lexical overlap and light paraphrase (reordering, inflection),
+# not meaning; vectors from different EMBEDDING_MODELs are not comparable.
+EMBEDDING_MODEL = "hashing-v1"
+EMBEDDING_DIM = 512
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _features(text: str) -> List[str]:
+    words = tokenize(text)
+    features = [f"w:{w}" for w in words]
+    features += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"#{w}#"
+        features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return features
+
+
+def embed(text: str) -> np.ndarray:
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for feature in _features(text):
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        vector[value % EMBEDDING_DIM] += 1.0 if (value >> 63) & 1 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
@@ -0,0 +1,40 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document
+from app.models.note import Note
+from app.models.shared_resource import SharedResource
+from app.models.study_group_member import StudyGroupMember
+from app.models.user import User
+
+_SOURCES = {
+    "note": (Note, Note.content),
+    "document": (Document, Document.extracted_text),
+}
+
+
+async def load_source_text(
+    db: AsyncSession, user: User, source_type: str, source_id: uuid.UUID
+) -> Optional[str]:
+    # Text a generation request works from, if the user may read the source:
+    # their own note/document, or one shared into a study group they belong to.
+    source = _SOURCES.get(source_type)
+    if source is None:
+        return None
+    model, text_column = source
+    shared_with_user = exists().where(
+        SharedResource.resource_type == source_type,
+        SharedResource.resource_id == model.id,
+        SharedResource.group_id == StudyGroupMember.group_id,
+        StudyGroupMember.user_id == user.id,
+    )
+    result = await db.execute(
+        select(text_column).where(
+            model.id == source_id,
+            or_(model.user_id == user.id, shared_with_user),
+        )
+    )
+    return result.scalar_one_or_none()
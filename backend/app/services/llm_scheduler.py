@@ -0,0 +1,166 @@
+import asyncio
+import heapq
+import itertools
+import statistics
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import get_settings
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)
+
+# Recent queue waits kept per lane for the percentile metrics.
+WAIT_SAMPLE_SIZE = 1000
+
+
+@dataclass(eq=False)
+class _Ticket:
+    user_id: uuid.UUID
+    enqueued: float
+    future: asyncio.Future
+    cancelled: bool = False
+
+
+class _Lane:
+    def __init__(self) -> None:
+        self.heap: List[Tuple[float, int, _Ticket]] = []
+        self.virtual_time = 0.0
+        self.last_finish: Dict[uuid.UUID, float] = {}
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.waits: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+
+class LLMScheduler:
+    # Admission control for model calls. Interactive requests always go first and
+    # `interactive_reserved` slots are never handed to batch work, so a batch flood
+    # cannot push chat latency up. Within a lane, users are served by self-clocked
+    # weighted fair queuing: each request gets a finish tag of
+    # max(lane virtual time, user's previous tag) + cost / weight and the smallest
+    # tag runs next, so one user with a deep queue cannot starve the others.
+
+    def __init__(self, max_concurrency: int, interactive_reserved: int) -> None:
+        self.max_concurrency = max_concurrency
+        self.batch_limit = max(1, max_concurrency - interactive_reserved)
+        self._lanes: Dict[str, _Lane] = {lane: _Lane() for lane in LANES}
+        self._seq = itertools.count()
+        self._running = 0
+
+    def _has_capacity(self, lane: str) -> bool:
+        if self._running >= self.max_concurrency:
+            return False
+        return lane == INTERACTIVE or self._lanes[BATCH].running < self.batch_limit
+
+    def _admit(self, state: _Lane, finish_tag: float, waited: float) -> None:
+        state.virtual_time = max(state.virtual_time, finish_tag)
+        state.running += 1
+        state.admitted += 1
+        state.waits.append(waited)
+        self._running += 1
+
+    async def acquire(
+        self, user_id: uuid.UUID, lane: str = INTERACTIVE, cost: float = 1.0, weight: float = 1.0
+    ) -> None:
+        state = self._lanes[lane]
+        finish_tag = max(state.virtual_time, state.last_finish.get(user_id, 0.0)) + cost / weight
+        state.last_finish[user_id] = finish_tag
+
+        ahead = state.queued + (self._lanes[INTERACTIVE].queued if lane == BATCH else 0)
+        if ahead == 0 and self._has_capacity(lane):
+            self._admit(state, finish_tag, 0.0)
+            return
+
+        ticket = _Ticket(user_id=user_id, enqueued=time.monotonic(), future=asyncio.get_running_loop().create_future())
+        heapq.heappush(state.heap, (finish_tag, next(self._seq), ticket))
+        state.queued += 1
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                # Granted a slot in the same tick we were cancelled; give it back.
+                self.release(lane)
+            elif not ticket.cancelled:
+                ticket.cancelled = True
+                state.queued -= 1
+            raise
+
+    def release(self, lane: str = INTERACTIVE) -> None:
+        state = self._lanes[lane]
+        state.running -= 1
+        self._running -= 1
+        if state.running == 0 and state.queued == 0:
+            # Idle lane: forget finish tags so the dict does not grow with every user seen.
+            state.virtual_time = 0.0
+            state.last_finish.clear()
+        self._dispatch()
+
+    def _next_ticket(self, lane: str) -> Optional[Tuple[float, _Ticket]]:
+        state = self._lanes[lane]
+        heap = state.heap
+        # A waiter's future can be cancelled before its task runs the cleanup above.
+        while heap and (heap[0][2].cancelled or heap[0][2].future.done()):
+            _, _, ticket = heapq.heappop(heap)
+            if not ticket.cancelled:
+                ticket.cancelled = True
+                state.queued -= 1
+        if not heap:
+            return None
+        finish_tag, _, ticket = heapq.heappop(heap)
+        return finish_tag, ticket
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_concurrency:
+            lane = INTERACTIVE
+            entry = self._next_ticket(INTERACTIVE)
+            if entry is None and self._has_capacity(BATCH):
+                lane = BATCH
+                entry = self._next_ticket(BATCH)
+            if entry is None:
+                return
+            finish_tag, ticket = entry
+            state = self._lanes[lane]
+            state.queued -= 1
+            self._admit(state, finish_tag, time.monotonic() - ticket.enqueued)
+            ticket.future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(
+        self, user_id: uuid.UUID, lane: str = INTERACTIVE, cost: float = 1.0, weight: float = 1.0
+    ) -> AsyncIterator[None]:
+        await self.acquire(user_id, lane, cost, weight)
+        try:
+            yield
+        finally:
+            self.release(lane)
+
+    def stats(self) -> Dict:
+        lanes = {}
+        for name, state in self._lanes.items():
+            waits = sorted(state.waits)
+            lanes[name] = {
+                "running": state.running,
+                "queued": state.queued,
+                "admitted": state.admitted,
+                "wait_ms_p50": round(statistics.median(waits) * 1000, 2) if waits else 0.0,
+                "wait_ms_p95": round(waits[int(len(waits) * 0.95) - 1] * 1000, 2) if waits else 0.0,
+                "wait_ms_max": round(waits[-1] * 1000, 2) if waits else 0.0,
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "batch_limit": self.batch_limit,
+            "running": self._running,
+            "lanes": lanes,
+        }
+
+
+llm_scheduler = LLMScheduler(
+    max_concurrency=get_settings().llm_max_concurrency,
+    interactive_reserved=get_settings().llm_interactive_reserved_slots,
+)
@@ -0,0 +1,221 @@
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Integer, Select, and_, cast, func, null, or_, select, update
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.ai_conversation import AiConversation
+from app.models.ai_message import AiMessage
+from app.models.user_preferences import UserPreferences
+from app.services.conversation_metrics import record_message_metrics
+
+THREAD_PATH_SEPARATOR = "/"
+DEFAULT_CONTEXT_MESSAGES = 20
+
+
+def thread_path_segment(message_order: int) -> str:
+    return f"{message_order:08d}"
+
+
+def child_thread_path(parent_path: Optional[str], message_order: int) -> str:
+    segment = thread_path_segment(message_order)
+    if parent_path is None:
+        return segment
+    return parent_path + THREAD_PATH_SEPARATOR + segment
+
+
+async def allocate_message_order(
+    db: AsyncSession, conversation_id: uuid.UUID, user_id: uuid.UUID
+) -> Optional[int]:
+    # Reserves the next message_order with one atomic UPDATE ... RETURNING on the
+    # conversation row, which also bumps total_messages and last_message_at and
+    # checks ownership. Concurrent appenders queue on the row lock instead of
+    # colliding on the (conversation_id, message_order) constraint. The lock is
+    # held until the caller commits, so insert the message and commit promptly.
+    # Returns None when the conversation does not exist or is not the user's.
+    #
+    # Conversations that predate message_seq start at 0 while already holding
+    # messages; GREATEST with the highest stored order (an index lookup on the
+    # unique constraint) seeds them on their first append.
+    highest_order = (
+        select(func.coalesce(func.max(AiMessage.message_order), 0))
+        .where(AiMessage.conversation_id == conversation_id)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(AiConversation)
+        .where(AiConversation.id == conversation_id, AiConversation.user_id == user_id)
+        .values(
+            message_seq=func.greatest(AiConversation.message_seq, highest_order) + 1,
+            total_messages=AiConversation.total_messages + 1,
+            last_message_at=func.now(),
+        )
+        .returning(AiConversation.message_seq)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def append_message(
+    db: AsyncSession,
+    conversation_id: uuid.UUID,
+    user_id: uuid.UUID,
+    parent: Optional[AiMessage],
+    **fields,
+) -> Optional[AiMessage]:
+    # Allocates the order, derives thread position from the parent and folds
+    # the message into the conversation metrics. The caller commits.
+    message_order = await allocate_message_order(db, conversation_id, user_id)
+    if message_order is None:
+        return None
+
+    if parent is None:
+        thread_path = child_thread_path(None, message_order)
+    elif parent.thread_path is not None:
+        thread_path = child_thread_path(parent.thread_path, message_order)
+    else:
+        # Parent predates materialized paths; subtree reads fall back to the CTE.
+        thread_path = None
+
+    msg = AiMessage(
+        conversation_id=conversation_id,
+        parent_message_id=parent.id if parent is not None else None,
+        message_order=message_order,
+        thread_depth=parent.thread_depth + 1 if parent is not None else 0,
+        is_thread_root=parent is None,
+        thread_path=thread_path,
+        **fields,
+    )
+    db.add(msg)
+    await db.flush()
+    await record_message_metrics(db, msg, user_id)
+    return msg
+
+
+async def load_subtree(db: AsyncSession, root: AiMessage, options: Sequence[Any] = ()) -> List[AiMessage]:
+    # Returns root and all of its descendants in depth-first order, within the
+    # root's own conversation: replies made in forks of it belong to those
+    # forks, and both branches below leave them out alike.
+    if root.thread_path is not None:
+        # Every descendant path starts with "<root>/"; "/" sorts directly before
+        # the digits, so the subtree is the half-open range [root, root + "0").
+        result = await db.execute(
+            select(AiMessage)
+            .where(
+                AiMessage.conversation_id == root.conversation_id,
+                AiMessage.thread_path >= root.thread_path,
+                AiMessage.thread_path < root.thread_path + "0",
+            )
+            .options(*options)
+            .order_by(AiMessage.thread_path)
+        )
+        return list(result.scalars().all())
+
+    # Messages written before thread_path existed: walk parent links in one
+    # recursive query, carrying the array of orders as the depth-first sort key.
+    tree = (
+        select(AiMessage.id.label("id"), array([AiMessage.message_order]).label("path"))
+        .where(AiMessage.id == root.id)
+        .cte("subtree", recursive=True)
+    )
+    child = aliased(AiMessage)
+    tree = tree.union_all(
+        select(child.id, func.array_append(tree.c.path, child.message_order))
+        .where(child.parent_message_id == tree.c.id, child.conversation_id == root.conversation_id)
+    )
+    result = await db.execute(
+        select(AiMessage).join(tree, AiMessage.id == tree.c.id).options(*options).order_by(tree.c.path)
+    )
+    return list(result.scalars().all())
+
+
+def _history_chain(conversation_id: uuid.UUID):
+    # One row per conversation in the fork ancestry, with the highest
+    # message_order visible from the starting conversation (NULL = all).
+    chain = (
+        select(
+            AiConversation.id.label("conversation_id"),
+            cast(null(), Integer).label("max_order"),
+            AiConversation.forked_from_conversation_id.label("parent_id"),
+            AiConversation.forked_at_message_order.label("fork_order"),
+        )
+        .where(AiConversation.id == conversation_id)
+        .cte("history_chain", recursive=True)
+    )
+    parent = aliased(AiConversation)
+    return chain.union_all(
+        select(
+            parent.id,
+            # LEAST ignores NULL, so an unbounded child narrows to its fork point.
+            func.least(chain.c.max_order, chain.c.fork_order),
+            parent.forked_from_conversation_id,
+            parent.forked_at_message_order,
+        ).where(parent.id == chain.c.parent_id)
+    )
+
+
+def history_query(conversation_id: uuid.UUID) -> Select:
+    # Messages visible in a conversation, including the prefix shared with the
+    # conversations it was forked from. Forks continue their parent's
+    # message_order sequence, so ordering by it yields a single timeline.
+    chain = _history_chain(conversation_id)
+    return select(AiMessage).join(
+        chain,
+        and_(
+            AiMessage.conversation_id == chain.c.conversation_id,
+            or_(chain.c.max_order.is_(None), AiMessage.message_order <= chain.c.max_order),
+        ),
+    )
+
+
+async def get_history_message(
+    db: AsyncSession, conversation_id: uuid.UUID, message_id: uuid.UUID
+) -> Optional[AiMessage]:
+    result = await db.execute(history_query(conversation_id).where(AiMessage.id == message_id))
+    return result.scalar_one_or_none()
+
+
+async def fork_conversation(
+    db: AsyncSession, conv: AiConversation, at_message: AiMessage, title: Optional[str] = None
+) -> AiConversation:
+    # Constant cost regardless of history length: the fork stores only a
+    # pointer to its parent and the fork point, and its own message sequence
+    # resumes after the shared prefix. Orders along a timeline run 1..n, so
+    # the fork point is also the number of prefix messages it starts with.
+    fork = AiConversation(
+        user_id=conv.user_id,
+        subject_id=conv.subject_id,
+        title=title if title is not None else conv.title,
+        conversation_type=conv.conversation_type,
+        related_note_id=conv.related_note_id,
+        related_document_id=conv.related_document_id,
+        related_deck_id=conv.related_deck_id,
+        forked_from_conversation_id=conv.id,
+        forked_at_message_order=at_message.message_order,
+        message_seq=at_message.message_order,
+        total_messages=at_message.message_order,
+        last_message_at=at_message.created_at,
+    )
+    db.add(fork)
+    await db.commit()
+    await db.refresh(fork)
+    return fork
+
+
+async def build_context(
+    db: AsyncSession, conversation_id: uuid.UUID, user_id: uuid.UUID
+) -> List[Dict[str, Optional[str]]]:
+    # The most recent history messages, oldest first, capped by the user's
+    # max_context_messages preference.
+    prefs_result = await db.execute(
+        select(UserPreferences.max_context_messages).where(UserPreferences.user_id == user_id)
+    )
+    max_messages = prefs_result.scalar_one_or_none() or DEFAULT_CONTEXT_MESSAGES
+    result = await db.execute(
+        history_query(conversation_id).order_by(AiMessage.message_order.desc()).limit(max_messages)
+    )
+    messages = list(result.scalars().all())
+    messages.reverse()
+    return [{"role": m.role, "content": m.content} for m in messages]
@@ -0,0 +1,296 @@
+import asyncio
+import random
+import re
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from app.services.llm_scheduler import INTERACTIVE, llm_scheduler
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_REASONING_WORDS = re.compile(
+    r"\b(why|explain|prove|derive|compare|contrast|analy[sz]e|evaluate|justify|step by step)\b", re.I
+)
+_MATH_OR_CODE = re.compile(r"[=^∫∑{}<>]|\bdef\b|\bclass\b|\d+\s*[-+*/]\s*\d+")
+
+
+class BackendError(Exception):
+    pass
+
+
+@dataclass
+class Completion:
+    content: str
+    model: str
+    tokens_used: int
+    latency_ms: int
+    hedged: bool = False
+
+
+class ModelBackend(ABC):
+    name: str
+    tier: str
+    cost_per_1k_tokens: float
+
+    @abstractmethod
+    async def complete(self, prompt: str, max_tokens: int) -> Completion:
+        ...
+
+
+class FakeBackend(ModelBackend):
+    # Offline stand-in for a model API: log-normal latency around latency_ms and
+    # a configurable failure rate, both adjustable at runtime to simulate incidents.
+
+    def __init__(
+        self,
+        name: str,
+        tier: str,
+        cost_per_1k_tokens: float,
+        latency_ms: float,
+        latency_sigma: float = 0.3,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.tier = tier
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    async def complete(self, prompt: str, max_tokens: int) -> Completion:
+        started = time.perf_counter()
+        await asyncio.sleep(self.latency_ms * self._random.lognormvariate(0, self.latency_sigma) / 1000)
+        if self._random.random() < self.error_rate:
+            raise BackendError(f"{self.name} failed")
+        return Completion(
+            content=f"[{self.name}] response to: {prompt[:80]}",
+            model=self.name,
+            tokens_used=min(max_tokens, len(prompt.split()) + 64),
+            latency_ms=int((time.perf_counter() - started) * 1000),
+        )
+
+
+class BackendHealth:
+    # EWMA latency, latency deviation and error rate, plus a consecutive-failure
+    # circuit breaker:
+    # `failure_threshold` failures in a row open the circuit for `cooldown`
+    # seconds, after which a single probe request is let through (half-open).
+
+    def __init__(self, alpha: float, failure_threshold: int, cooldown: float, initial_latency_ms: float) -> None:
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.latency_ms = initial_latency_ms
+        self.deviation_ms = initial_latency_ms / 2
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.requests = 0
+
+    def available(self) -> bool:
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN:
+            return not self.probe_in_flight
+        return self.state == CLOSED
+
+    def started(self) -> None:
+        self.requests += 1
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = True
+
+    def succeeded(self, latency_ms: float) -> None:
+        self.deviation_ms += self.alpha * (abs(latency_ms - self.latency_ms) - self.deviation_ms)
+        self.latency_ms += self.alpha * (latency_ms - self.latency_ms)
+        self.error_rate += self.alpha * (0.0 - self.error_rate)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.probe_in_flight = False
+
+    def failed(self) -> None:
+        self.error_rate += self.alpha * (1.0 - self.error_rate)
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+
+    def abandoned(self, elapsed_ms: float) -> None:
+        # A losing hedge was cancelled. That is no error, but it took at least
+        # elapsed_ms, so count it as a latency sample to keep the EWMA honest.
+        self.deviation_ms += self.alpha * (abs(elapsed_ms - self.latency_ms) - self.deviation_ms)
+        self.latency_ms += self.alpha * (max(elapsed_ms, self.latency_ms) - self.latency_ms)
+        self.probe_in_flight = False
+
+
+def estimate_complexity(prompt: str) -> float:
+    # Cheap 0..1 heuristic from prompt length, reasoning verbs and math/code markers.
+    score = min(len(prompt.split()) / 400, 0.5)
+    score += min(len(_REASONING_WORDS.findall(prompt)) * 0.15, 0.3)
+    score += 0.2 if _MATH_OR_CODE.search(prompt) else 0.0
+    return min(score, 1.0)
+
+
+class ModelRouter:
+    # Chooses a backend per request. Prompts at or above `large_threshold`
+    # complexity prefer the large tier; within the preferred tier backends are
+    # ranked by EWMA latency, cost and EWMA error rate, and backends with an
+    # open circuit are skipped. If the primary has not answered within its EWMA
+    # latency plus hedge_deviations x its EWMA deviation (a running estimate of
+    # a high percentile), the request is duplicated on the runner-up and the
+    # first success wins. When both fail, the remaining
+    # candidates are tried in order.
+
+    def __init__(
+        self,
+        backends: List[ModelBackend],
+        large_threshold: float = 0.5,
+        hedge_deviations: float = 2.0,
+        hedge_min_ms: float = 200.0,
+        alpha: float = 0.2,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        cost_weight: float = 200.0,
+        error_weight: float = 2000.0,
+    ) -> None:
+        self.backends = {b.name: b for b in backends}
+        self.health = {
+            b.name: BackendHealth(alpha, failure_threshold, cooldown, getattr(b, "latency_ms", 1000.0))
+            for b in backends
+        }
+        self.large_threshold = large_threshold
+        self.hedge_deviations = hedge_deviations
+        self.hedge_min_ms = hedge_min_ms
+        self.cost_weight = cost_weight
+        self.error_weight = error_weight
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def rank(self, prompt: str, preferred_model: Optional[str] = None) -> List[ModelBackend]:
+        tier = "large" if estimate_complexity(prompt) >= self.large_threshold else "small"
+
+        def key(backend: ModelBackend) -> tuple:
+            health = self.health[backend.name]
+            penalty = (
+                health.latency_ms
+                + self.cost_weight * backend.cost_per_1k_tokens
+                + self.error_weight * health.error_rate
+            )
+            return (backend.name != preferred_model, backend.tier != tier, penalty)
+
+        candidates = [b for b in self.backends.values() if self.health[b.name].available()]
+        return sorted(candidates, key=key)
+
+    async def _attempt(self, backend: ModelBackend, prompt: str, max_tokens: int) -> Completion:
+        health = self.health[backend.name]
+        health.started()
+        started = time.perf_counter()
+        try:
+            completion = await backend.complete(prompt, max_tokens)
+        except asyncio.CancelledError:
+            health.abandoned((time.perf_counter() - started) * 1000)
+            raise
+        except Exception:
+            health.failed()
+            raise
+        health.succeeded((time.perf_counter() - started) * 1000)
+        return completion
+
+    async def _hedged(
+        self, candidates: List[ModelBackend], prompt: str, max_tokens: int, tried: Set[str]
+    ) -> Completion:
+        primary = candidates[0]
+        tried.add(primary.name)
+        tasks = {asyncio.create_task(self._attempt(primary, prompt, max_tokens)): primary}
+        health = self.health[primary.name]
+        hedge_delay = max(self.hedge_min_ms, health.latency_ms + self.hedge_deviations * health.deviation_ms) / 1000
+        can_hedge = len(candidates) > 1
+        last_error: Optional[BaseException] = None
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=hedge_delay if can_hedge else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    can_hedge = False
+                    self.hedges_fired += 1
+                    tried.add(candidates[1].name)
+                    tasks[asyncio.create_task(self._attempt(candidates[1], prompt, max_tokens))] = candidates[1]
+                    continue
+                for task in done:
+                    backend = tasks.pop(task)
+                    if task.exception() is None:
+                        completion = task.result()
+                        completion.hedged = backend is not primary
+                        if completion.hedged:
+                            self.hedges_won += 1
+                        return completion
+                    last_error = task.exception()
+            raise last_error or BackendError("no backend available")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def complete(
+        self,
+        user_id: uuid.UUID,
+        prompt: str,
+        lane: str = INTERACTIVE,
+        max_tokens: int = 1024,
+        preferred_model: Optional[str] = None,
+    ) -> Completion:
+        candidates = self.rank(prompt, preferred_model)
+        if not candidates:
+            raise BackendError("no backend available")
+        tried: Set[str] = set()
+        async with llm_scheduler.slot(user_id, lane):
+            try:
+                return await self._hedged(candidates, prompt, max_tokens, tried)
+            except Exception as error:
+                last_error = error
+            for backend in candidates:
+                if backend.name in tried or not self.health[backend.name].available():
+                    continue
+                try:
+                    return await self._attempt(backend, prompt, max_tokens)
+                except Exception as error:
+                    last_error = error
+            raise last_error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hedges_fired": self.hedges_fired,
+            "hedges_won": self.hedges_won,
+            "backends": {
+                name: {
+                    "tier": self.backends[name].tier,
+                    "ewma_latency_ms": round(health.latency_ms, 1),
+                    "ewma_error_rate": round(health.error_rate, 4),
+                    "circuit": health.state,
+                    "requests": health.requests,
+                }
+                for name, health in self.health.items()
+            },
+        }
+
+
+def fake_backends() -> List[ModelBackend]:
+    return [
+        FakeBackend("fake-small-a", "small", cost_per_1k_tokens=0.2, latency_ms=300),
+        FakeBackend("fake-small-b", "small", cost_per_1k_tokens=0.3, latency_ms=400),
+        FakeBackend("fake-large", "large", cost_per_1k_tokens=3.0, latency_ms=1500),
+    ]
+
+
+# No hosted model client exists in this tree yet; the router runs on the fake
+# backends until real ModelBackend implementations are registered.
+model_router = ModelRouter(fake_backends())
@@ -0,0 +1,219 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import Date, Integer, String, case, cast, column, func, literal, select, table, union_all
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.daily_progress import DailyProgress
+from app.models.flashcard_review import FlashcardReview
+from app.models.note import Note
+from app.models.study_session import StudySession
+from app.models.user import User
+from app.models.user_streak import UserStreak
+from app.services.rollups import RollupBuffer
+
+# A review that schedules the card three weeks or more out counts as mastering it.
+MASTERED_INTERVAL_DAYS = 21
+
+progress_rollup = RollupBuffer(
+    DailyProgress,
+    ("user_id", "date"),
+    flush_interval=get_settings().rollup_flush_interval_seconds,
+)
+
+
+def user_zone(user: User) -> ZoneInfo:
+    try:
+        return ZoneInfo(user.timezone) if user.timezone else ZoneInfo("UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def local_date(user: User, at: Optional[datetime] = None) -> date:
+    at = at if at is not None else datetime.now(timezone.utc)
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return at.astimezone(user_zone(user)).date()
+
+
+def record_study_minutes(user: User, minutes: int, at: Optional[datetime] = None) -> None:
+    if minutes > 0:
+        progress_rollup.add((user.id, local_date(user, at)), total_study_minutes=minutes)
+
+
+def record_review(user: User, new_interval: Optional[int], at: Optional[datetime] = None) -> None:
+    mastered = 1 if new_interval is not None and new_interval >= MASTERED_INTERVAL_DAYS else 0
+    progress_rollup.add((user.id, local_date(user, at)), cards_reviewed=1, cards_mastered=mastered)
+
+
+def record_note_created(user: User, at: Optional[datetime] = None) -> None:
+    progress_rollup.add((user.id, local_date(user, at)), notes_created=1)
+
+
+_pg_timezone_names = table("pg_timezone_names", column("name", String))
+
+
+async def backfill_daily_progress(db: AsyncSession, user_id: Optional[uuid.UUID] = None) -> int:
+    # Recomputes the event-derived counters of every (user_id, date) from the
+    # source tables in one INSERT ... SELECT ... ON CONFLICT DO UPDATE. Days are
+    # bucketed in each user's timezone; unknown zone names fall back to UTC.
+    user_zones = (
+        select(
+            User.id.label("user_id"),
+            func.coalesce(_pg_timezone_names.c.name, "UTC").label("zone"),
+        )
+        .outerjoin(_pg_timezone_names, _pg_timezone_names.c.name == User.timezone)
+        .cte("user_zones")
+    )
+
+    sessions = select(
+        StudySession.user_id.label("user_id"),
+        StudySession.ended_at.label("at"),
+        func.coalesce(StudySession.duration_minutes, 0).label("minutes"),
+        literal(0).label("reviewed"),
+        literal(0).label("mastered"),
+        literal(0).label("notes"),
+    ).where(StudySession.is_completed == True, StudySession.ended_at.is_not(None))  # noqa: E712
+    reviews = select(
+        FlashcardReview.user_id,
+        FlashcardReview.reviewed_at,
+        literal(0),
+        literal(1),
+        case((FlashcardReview.new_interval >= MASTERED_INTERVAL_DAYS, 1), else_=0),
+        literal(0),
+    )
+    notes = select(
+        Note.user_id,
+        Note.created_at,
+        literal(0),
+        literal(0),
+        literal(0),
+        literal(1),
+    )
+    if user_id is not None:
+        sessions = sessions.where(StudySession.user_id == user_id)
+        reviews = reviews.where(FlashcardReview.user_id == user_id)
+        notes = notes.where(Note.user_id == user_id)
+    events = union_all(sessions, reviews, notes).subquery("events")
+
+    day = cast(func.timezone(user_zones.c.zone, events.c.at), Date)
+    totals = (
+        select(
+            func.gen_random_uuid(),
+            events.c.user_id,
+            day,
+            func.sum(events.c.minutes),
+            func.sum(events.c.reviewed),
+            func.sum(events.c.mastered),
+            func.sum(events.c.notes),
+        )
+        .join(user_zones, user_zones.c.user_id == events.c.user_id)
+        .group_by(events.c.user_id, day)
+    )
+    counters = ["total_study_minutes", "cards_reviewed", "cards_mastered", "notes_created"]
+    stmt = insert(DailyProgress).from_select(["id", "user_id", "date", *counters], totals)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "date"],
+        set_={**{name: stmt.excluded[name] for name in counters}, "updated_at": func.now()},
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
+
+
+async def record_study_day(db: AsyncSession, user_id: uuid.UUID, day: date) -> None:
+    # O(1) streak maintenance: extend the streak when day follows the last study
+    # date, restart it after a gap, and leave it alone for repeats or backdated
+    # days (rebuild_streaks picks those up).
+    last = UserStreak.last_study_date
+    current = case(
+        (last == day, UserStreak.current_streak),
+        (last == day - timedelta(days=1), UserStreak.current_streak + 1),
+        (last > day, UserStreak.current_streak),
+        else_=1,
+    )
+    stmt = insert(UserStreak).values(
+        id=uuid.uuid4(), user_id=user_id, current_streak=1, longest_streak=1, last_study_date=day
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                "current_streak": current,
+                "longest_streak": func.greatest(UserStreak.longest_streak, current),
+                "last_study_date": func.greatest(last, day),
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def _record_study_days(db: AsyncSession, rows: List[Dict]) -> None:
+    for row in sorted(rows, key=lambda r: (str(r["user_id"]), r["date"])):
+        if row.get("total_study_minutes", 0) > 0:
+            await record_study_day(db, row["user_id"], row["date"])
+
+
+progress_rollup.add_listener(_record_study_days)
+
+
+async def rebuild_streaks(db: AsyncSession, user_id: Optional[uuid.UUID] = None) -> int:
+    # Recomputes streaks from daily_progress in one statement. Consecutive study
+    # days share the same (date - row_number) value, so each group is a run;
+    # the latest run is the current streak and the longest run the record.
+    days = select(DailyProgress.user_id, DailyProgress.date).where(DailyProgress.total_study_minutes > 0)
+    if user_id is not None:
+        days = days.where(DailyProgress.user_id == user_id)
+    days = days.subquery("days")
+    islands = select(
+        days.c.user_id,
+        days.c.date,
+        (
+            days.c.date
+            - cast(func.row_number().over(partition_by=days.c.user_id, order_by=days.c.date), Integer)
+        ).label("run"),
+    ).subquery("islands")
+    runs = (
+        select(
+            islands.c.user_id,
+            func.count().label("length"),
+            func.max(islands.c.date).label("ended"),
+        )
+        .group_by(islands.c.user_id, islands.c.run)
+        .subquery("runs")
+    )
+    totals = select(
+        func.gen_random_uuid(),
+        runs.c.user_id,
+        func.max(runs.c.length),
+        func.max(runs.c.ended),
+        func.array_agg(aggregate_order_by(runs.c.length, runs.c.ended.desc()))[1],
+    ).group_by(runs.c.user_id)
+
+    stmt = insert(UserStreak).from_select(
+        ["id", "user_id", "longest_streak", "last_study_date", "current_streak"], totals
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "current_streak": stmt.excluded.current_streak,
+            "longest_streak": stmt.excluded.longest_streak,
+            "last_study_date": stmt.excluded.last_study_date,
+            "updated_at": func.now(),
+        },
+    )
+    result = await db.execute(stmt)
+    if user_id is not None:
+        # A user with no study days still gets a (zero) row, so readers that
+        # rebuild on a missing row do so once rather than on every read.
+        await db.execute(
+            insert(UserStreak)
+            .values(id=uuid.uuid4(), user_id=user_id, current_streak=0, longest_streak=0)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+        )
+    await db.commit()
+    return result.rowcount
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import math
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.db_setup import AsyncSessionLocal
+from app.models.ai_usage_stats import AiUsageStats
+from app.models.user import User
+from app.services.progress import local_date, user_zone
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PlanLimits:
+    requests_per_minute: int
+    burst: int
+    tokens_per_day: int
+
+
+PLAN_LIMITS: Dict[str, PlanLimits] = {
+    "free": PlanLimits(requests_per_minute=10, burst=5, tokens_per_day=50_000),
+    "pro": PlanLimits(requests_per_minute=60, burst=20, tokens_per_day=1_000_000),
+}
+DEFAULT_PLAN = "free"
+
+# Buckets of users idle this long are dropped; they are re-seeded on next use.
+IDLE_EVICT_SECONDS = 3600
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+
+    def try_consume(self, n: float = 1) -> float:
+        # Returns 0 when the tokens were taken, else the seconds until they would be.
+        self._refill()
+        if self.tokens >= n:
+            self.tokens -= n
+            return 0.0
+        return (n - self.tokens) / self.refill_per_second
+
+
+class _UserQuota:
+    def __init__(self, user: User, limits: PlanLimits, tokens_used: int) -> None:
+        self.plan = user.plan
+        self.limits = limits
+        self.requests = TokenBucket(limits.burst, limits.requests_per_minute / 60)
+        self.day = local_date(user)
+        self.tokens_used = tokens_used
+        self.last_seen = time.monotonic()
+
+
+class QuotaManager:
+    # Per-process quota state. Request rate is a token bucket per user; the daily
+    # token budget is the user's local-day total, seeded once from AiUsageStats and
+    # periodically raised to the persisted total so usage recorded by other
+    # workers is accounted for. The hot path never reads the database.
+
+    def __init__(self, reconcile_interval: float) -> None:
+        self.reconcile_interval = reconcile_interval
+        self._users: Dict[uuid.UUID, _UserQuota] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _load_tokens_used(self, db: AsyncSession, user: User, day: date) -> int:
+        result = await db.execute(
+            select(AiUsageStats.total_tokens_consumed).where(
+                AiUsageStats.user_id == user.id,
+                AiUsageStats.stat_date == day,
+            )
+        )
+        return result.scalar_one_or_none() or 0
+
+    async def _get(self, db: AsyncSession, user: User) -> _UserQuota:
+        quota = self._users.get(user.id)
+        limits = PLAN_LIMITS.get(user.plan, PLAN_LIMITS[DEFAULT_PLAN])
+        if quota is None or quota.plan != user.plan:
+            tokens_used = await self._load_tokens_used(db, user, local_date(user))
+            quota = self._users[user.id] = _UserQuota(user, limits, tokens_used)
+        today = local_date(user)
+        if quota.day != today:
+            quota.day = today
+            quota.tokens_used = 0
+        quota.last_seen = time.monotonic()
+        return quota
+
+    async def enforce(self, db: AsyncSession, user: User) -> None:
+        quota = await self._get(db, user)
+        if quota.tokens_used >= quota.limits.tokens_per_day:
+            now = datetime.now(user_zone(user))
+            midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), now.tzinfo)
+            self._reject("Daily AI token quota exceeded", (midnight - now).total_seconds())
+        wait = quota.requests.try_consume()
+        if wait > 0:
+            self._reject("AI request rate limit exceeded", wait)
+
+    def charge(self, user_id: uuid.UUID, tokens: int) -> None:
+        quota = self._users.get(user_id)
+        if quota is not None and tokens > 0:
+            quota.tokens_used += tokens
+
+    @staticmethod
+    def _reject(detail: str, retry_after: float) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    async def reconcile(self) -> None:
+        cutoff = time.monotonic() - IDLE_EVICT_SECONDS
+        for user_id in [uid for uid, q in self._users.items() if q.last_seen < cutoff]:
+            del self._users[user_id]
+        if not self._users:
+            return
+        keys = [(user_id, quota.day) for user_id, quota in self._users.items()]
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(AiUsageStats.user_id, AiUsageStats.stat_date, AiUsageStats.total_tokens_consumed).where(
+                    tuple_(AiUsageStats.user_id, AiUsageStats.stat_date).in_(keys)
+                )
+            )
+            for user_id, stat_date, tokens in result.all():
+                quota = self._users.get(user_id)
+                if quota is not None and quota.day == stat_date:
+                    quota.tokens_used = max(quota.tokens_used, tokens)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception:
+                logger.exception("AI quota reconcile failed")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+ai_quota = QuotaManager(reconcile_interval=get_settings().quota_reconcile_interval_seconds)
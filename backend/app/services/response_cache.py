@@ -0,0 +1,141 @@
+import hashlib
+import json
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.ai_response_cache import AiResponseCache
+
+
+def normalize_context(text: str) -> str:
+    # Formatting-only differences (Unicode forms, whitespace runs, edges)
+    # must not produce distinct keys.
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(
+    user_id: uuid.UUID,
+    model: Optional[str],
+    prompt_version_id: Optional[uuid.UUID],
+    context: str,
+    params: Dict[str, Any],
+) -> str:
+    # Entries are filled from content the requesting client completes, so
+    # they are scoped to that user and never served to anyone else.
+    context_hash = hashlib.sha256(normalize_context(context).encode()).hexdigest()
+    material = json.dumps(
+        [str(user_id), model, str(prompt_version_id) if prompt_version_id else None, context_hash, params],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResponseCache:
+    # Two tiers: an in-process LRU with TTL in front of the ai_response_cache
+    # table, which is shared by all workers and survives restarts. Table rows
+    # expire by expires_at and are removed by purge_expired().
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.memory_hits = 0
+        self.table_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remember(self, key: str, expires_at: float, response: Dict[str, Any]) -> None:
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, db: AsyncSession, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return response
+            del self._entries[key]
+
+        result = await db.execute(
+            select(AiResponseCache.response, AiResponseCache.expires_at).where(
+                AiResponseCache.cache_key == key,
+                AiResponseCache.expires_at > func.now(),
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            self.misses += 1
+            return None
+        self._remember(key, row.expires_at.timestamp(), row.response)
+        self.table_hits += 1
+        return row.response
+
+    async def put(
+        self,
+        db: AsyncSession,
+        key: str,
+        content_type: str,
+        response: Dict[str, Any],
+        model: Optional[str] = None,
+        prompt_version_id: Optional[uuid.UUID] = None,
+        tokens_used: Optional[int] = None,
+    ) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        stmt = insert(AiResponseCache).values(
+            id=uuid.uuid4(),
+            cache_key=key,
+            model=model,
+            prompt_version_id=prompt_version_id,
+            content_type=content_type,
+            response=response,
+            tokens_used=tokens_used,
+            expires_at=expires_at,
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["cache_key"],
+                set_={
+                    "response": stmt.excluded.response,
+                    "tokens_used": stmt.excluded.tokens_used,
+                    "expires_at": stmt.excluded.expires_at,
+                },
+            )
+        )
+        self._remember(key, expires_at.timestamp(), response)
+
+    async def purge_expired(self, db: AsyncSession) -> int:
+        result = await db.execute(
+            delete(AiResponseCache).where(AiResponseCache.expires_at <= func.now())
+        )
+        return result.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.table_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "table_hits": self.table_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.memory_hits + self.table_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+response_cache = ResponseCache(
+    max_entries=get_settings().response_cache_max_entries,
+    ttl_seconds=get_settings().response_cache_ttl_seconds,
+)
@@ -0,0 +1,220 @@
+import math
+import uuid
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.embedding_vector import EmbeddingVector
+from app.services.embeddings import EMBEDDING_DIM, EMBEDDING_MODEL, embed, tokenize
+
+RETRIEVAL_METHOD = "hybrid_bm25_vector_rrf"
+
+# Standard constants: BM25 term saturation / length normalisation and the RRF
+# damping term from Cormack et al.
+BM25_K1 = 1.2
+BM25_B = 0.75
+RRF_K = 60
+
+
+@dataclass
+class Chunk:
+    id: uuid.UUID
+    source_type: str
+    source_id: uuid.UUID
+    subject_id: Optional[uuid.UUID]
+    chunk_index: Optional[int]
+    content_text: str
+
+
+@dataclass
+class RetrievedChunk:
+    chunk: Chunk
+    relevance_score: float
+    bm25_rank: Optional[int]
+    vector_rank: Optional[int]
+
+
+class BM25Index:
+    def __init__(self, texts: Sequence[str]) -> None:
+        self.size = len(texts)
+        lengths = np.zeros(self.size, dtype=np.float32)
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for i, text in enumerate(texts):
+            terms = Counter(tokenize(text))
+            lengths[i] = sum(terms.values())
+            for term, tf in terms.items():
+                postings[term].append((i, tf))
+        average = float(lengths.mean()) if self.size else 0.0
+        self._norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / (average or 1.0))
+        self._postings = {
+            term: (
+                np.fromiter((i for i, _ in items), dtype=np.int32, count=len(items)),
+                np.fromiter((tf for _, tf in items), dtype=np.float32, count=len(items)),
+                math.log(1 + (self.size - len(items) + 0.5) / (len(items) + 0.5)),
+            )
+            for term, items in postings.items()
+        }
+
+    def scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            docs, tf, idf = posting
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + self._norm[docs])
+        return scores
+
+
+class VectorIndex:
+    def __init__(self, vectors: np.ndarray) -> None:
+        self.matrix = vectors
+
+    def scores(self, query: str) -> np.ndarray:
+        return self.matrix @ embed(query)
+
+
+def _top(scores: np.ndarray, mask: Optional[np.ndarray], k: int) -> List[int]:
+    # Indices of the k best positive scores, best first.
+    if mask is not None:
+        scores = np.where(mask, scores, 0.0)
+    k = min(k, int(np.count_nonzero(scores > 0)))
+    if k == 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    return [int(i) for i in top[np.argsort(-scores[top])]]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[int]], k: int = RRF_K) -> List[Tuple[int, float]]:
+    fused: Dict[int, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking, start=1):
+            fused[doc] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridIndex:
+    # Lexical and dense indexes over the same chunks. Each side returns its top
+    # `depth` candidates and the two rankings are merged with reciprocal rank
+    # fusion, so exact terms (codes, formulas, names) found by BM25 and
+    # paraphrases found by the embedding both surface without having to
+    # calibrate their raw scores against each other.
+
+    def __init__(self, chunks: List[Chunk], vectors: Optional[np.ndarray] = None) -> None:
+        self.chunks = chunks
+        self.bm25 = BM25Index([c.content_text for c in chunks])
+        if vectors is None:
+            vectors = (
+                np.stack([embed(c.content_text) for c in chunks])
+                if chunks
+                else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+            )
+        self.vectors = VectorIndex(vectors)
+        self._subjects = np.array([str(c.subject_id) for c in chunks], dtype=object)
+
+    def _mask(self, subject_id: Optional[uuid.UUID]) -> Optional[np.ndarray]:
+        return self._subjects == str(subject_id) if subject_id is not None else None
+
+    def search_bm25(self, query: str, k: int, subject_id: Optional[uuid.UUID] = None) -> List[int]:
+        return _top(self.bm25.scores(query), self._mask(subject_id), k)
+
+    def search_vector(self, query: str, k: int, subject_id: Optional[uuid.UUID] = None) -> List[int]:
+        return _top(self.vectors.scores(query), self._mask(subject_id), k)
+
+    def search(
+        self, query: str, k: int = 10, subject_id: Optional[uuid.UUID] = None, depth: int = 50
+    ) -> List[RetrievedChunk]:
+        lexical = self.search_bm25(query, depth, subject_id)
+        dense = self.search_vector(query, depth, subject_id)
+        lexical_rank = {doc: rank for rank, doc in enumerate(lexical, start=1)}
+        dense_rank = {doc: rank for rank, doc in enumerate(dense, start=1)}
+        return [
+            RetrievedChunk(
+                chunk=self.chunks[doc],
+                relevance_score=round(score, 6),
+                bm25_rank=lexical_rank.get(doc),
+                vector_rank=dense_rank.get(doc),
+            )
+            for doc, score in reciprocal_rank_fusion([lexical, dense])[:k]
+        ]
+
+
+class HybridRetriever:
+    # Per-user HybridIndex over that user's EmbeddingVector rows, rebuilt when
+    # the row count or the sum of their sync_version changes. Every write
+    # stamps a row with a newer sync_version, so chunks whose text, subject or
+    # vector were rewritten in place are caught as well as added and removed
+    # ones, and the check is one index-only aggregate per search. Writers
+    # outside the ORM must set sync_version = DEFAULT on update. Stored
+    # embeddings are reused when they come from the query embedder; chunks
+    # embedded by other models are re-embedded, since vectors from different
+    # models cannot be compared.
+
+    def __init__(self, max_users: int = 128) -> None:
+        self.max_users = max_users
+        self._indexes: "OrderedDict[uuid.UUID, Tuple[tuple, HybridIndex]]" = OrderedDict()
+
+    async def _index(self, db: AsyncSession, user_id: uuid.UUID) -> HybridIndex:
+        result = await db.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(EmbeddingVector.sync_version), 0),
+            ).where(EmbeddingVector.user_id == user_id)
+        )
+        version = tuple(result.one())
+        cached = self._indexes.get(user_id)
+        if cached is not None and cached[0] == version:
+            self._indexes.move_to_end(user_id)
+            return cached[1]
+
+        result = await db.execute(
+            select(EmbeddingVector)
+            .where(EmbeddingVector.user_id == user_id, EmbeddingVector.content_text.is_not(None))
+            .order_by(EmbeddingVector.id)
+        )
+        rows = result.scalars().all()
+        chunks = [
+            Chunk(
+                id=row.id,
+                source_type=row.source_type,
+                source_id=row.source_id,
+                subject_id=row.subject_id,
+                chunk_index=row.chunk_index,
+                content_text=row.content_text,
+            )
+            for row in rows
+        ]
+        vectors = (
+            np.stack([
+                np.asarray(row.embedding, dtype=np.float32)
+                if row.embedding_model == EMBEDDING_MODEL and row.embedding
+                else embed(row.content_text)
+                for row in rows
+            ])
+            if rows
+            else None
+        )
+        index = HybridIndex(chunks, vectors)
+        self._indexes[user_id] = (version, index)
+        self._indexes.move_to_end(user_id)
+        while len(self._indexes) > self.max_users:
+            self._indexes.popitem(last=False)
+        return index
+
+    async def retrieve(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        query: str,
+        k: int = 10,
+        subject_id: Optional[uuid.UUID] = None,
+    ) -> List[RetrievedChunk]:
+        index = await self._index(db, user_id)
+        return index.search(query, k, subject_id)
+
+
+hybrid_retriever = HybridRetriever()
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import uuid
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple, Type
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_setup import AsyncSessionLocal, Base
+
+logger = logging.getLogger(__name__)
+
+FlushListener = Callable[[AsyncSession, List[Dict]], Awaitable[None]]
+
+
+class RollupBuffer:
+    # Accumulates additive counter deltas per key in memory and writes them as one
+    # INSERT ... ON CONFLICT (key) DO UPDATE SET col = col + excluded.col per flush.
+    # Because every write is an increment, buffers in several worker processes
+    # can flush into the same rows without coordination.
+
+    def __init__(
+        self,
+        model: Type[Base],
+        key_columns: Tuple[str, ...],
+        flush_interval: float,
+        max_pending_events: int = 500,
+    ) -> None:
+        self.model = model
+        self.key_columns = key_columns
+        self.flush_interval = flush_interval
+        self.max_pending_events = max_pending_events
+        self._pending: Dict[tuple, Dict[str, int]] = {}
+        self._pending_events = 0
+        self._listeners: List[FlushListener] = []
+        self._task: Optional[asyncio.Task] = None
+        # Threshold flushes started from add(); the loop only keeps weak refs to tasks.
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._flush_lock = asyncio.Lock()
+
+    def add(self, key: tuple, **deltas: int) -> None:
+        counters = self._pending.setdefault(key, defaultdict(int))
+        for column, n in deltas.items():
+            counters[column] += n
+        self._pending_events += 1
+        if self._pending_events >= self.max_pending_events:
+            self._pending_events = 0
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    def add_listener(self, listener: FlushListener) -> None:
+        # Listeners run inside the flush transaction with the rows just upserted.
+        self._listeners.append(listener)
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+            self._pending_events = 0
+            try:
+                async with AsyncSessionLocal() as db:
+                    rows = await self._upsert(db, pending)
+                    for listener in self._listeners:
+                        await listener(db, rows)
+                    await db.commit()
+            except Exception:
+                logger.exception("%s rollup flush failed; re-queueing %d keys", self.model.__tablename__, len(pending))
+                for key, deltas in pending.items():
+                    merged = self._pending.setdefault(key, defaultdict(int))
+                    for column, n in deltas.items():
+                        merged[column] += n
+
+    async def _upsert(self, db: AsyncSession, pending: Dict[tuple, Dict[str, int]]) -> List[Dict]:
+        columns = sorted({column for deltas in pending.values() for column in deltas})
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                **dict(zip(self.key_columns, key)),
+                **{column: deltas.get(column, 0) for column in columns},
+            }
+            for key, deltas in sorted(pending.items(), key=lambda item: tuple(map(str, item[0])))
+        ]
+        stmt = insert(self.model).values(rows)
+        update_values = {
+            column: getattr(self.model, column) + stmt.excluded[column] for column in columns
+        }
+        # ON CONFLICT DO UPDATE does not fire column onupdate defaults.
+        if "updated_at" in self.model.__table__.c:
+            update_values["updated_at"] = func.now()
+        await db.execute(
+            stmt.on_conflict_do_update(index_elements=list(self.key_columns), set_=update_values)
+        )
+        return rows
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
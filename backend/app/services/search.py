@@ -0,0 +1,195 @@
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Select, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ai_conversation import AiConversation
+from app.models.ai_message import AiMessage
+from app.models.associations import document_tags, flashcard_tags, note_tags
+from app.models.document import Document
+from app.models.flashcard import Flashcard
+from app.models.flashcard_deck import FlashcardDeck
+from app.models.note import Note
+from app.services.embeddings import tokenize
+from app.services.retrieval import BM25Index
+
+SEARCH_TYPES = ("note", "document", "flashcard", "message")
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=8, FragmentDelimiter=\" … \""
+SNIPPET_WORDS = 20
+
+
+@dataclass
+class SearchHit:
+    type: str
+    id: uuid.UUID
+    title: Optional[str]
+    snippet: Optional[str]
+    rank: float
+    subject_id: Optional[uuid.UUID]
+
+
+def _source(
+    search_type: str,
+    user_id: uuid.UUID,
+    subject_id: Optional[uuid.UUID],
+    tag_id: Optional[uuid.UUID],
+    with_vector: bool,
+) -> Optional[Select]:
+    # One owned, filtered row set per searchable type, with uniform column
+    # labels: id, title, body, subject_id and (Postgres only) search_vector.
+    if search_type == "note":
+        columns = [Note.id, Note.title, Note.content.label("body"), Note.subject_id, Note.search_vector]
+        query = select(*columns).where(Note.user_id == user_id)
+        subject_column = Note.subject_id
+        tagged = Note.id.in_(select(note_tags.c.note_id).where(note_tags.c.tag_id == tag_id))
+    elif search_type == "document":
+        columns = [Document.id, Document.title, Document.extracted_text.label("body"), Document.subject_id, Document.search_vector]
+        query = select(*columns).where(Document.user_id == user_id)
+        subject_column = Document.subject_id
+        tagged = Document.id.in_(select(document_tags.c.document_id).where(document_tags.c.tag_id == tag_id))
+    elif search_type == "flashcard":
+        body = (Flashcard.front_content + "\n" + Flashcard.back_content).label("body")
+        columns = [Flashcard.id, FlashcardDeck.title, body, FlashcardDeck.subject_id, Flashcard.search_vector]
+        query = (
+            select(*columns)
+            .join(FlashcardDeck, Flashcard.deck_id == FlashcardDeck.id)
+            .where(FlashcardDeck.user_id == user_id)
+        )
+        subject_column = FlashcardDeck.subject_id
+        tagged = Flashcard.id.in_(select(flashcard_tags.c.flashcard_id).where(flashcard_tags.c.tag_id == tag_id))
+    else:
+        # Messages carry no tags, so a tag filter excludes them entirely.
+        if tag_id is not None:
+            return None
+        columns = [AiMessage.id, AiConversation.title, AiMessage.content.label("body"), AiConversation.subject_id, AiMessage.search_vector]
+        query = (
+            select(*columns)
+            .join(AiConversation, AiMessage.conversation_id == AiConversation.id)
+            .where(AiConversation.user_id == user_id)
+        )
+        subject_column = AiConversation.subject_id
+        tagged = None
+
+    if not with_vector:
+        query = query.with_only_columns(*columns[:4], maintain_column_froms=True)
+    if subject_id is not None:
+        query = query.where(subject_column == subject_id)
+    if tag_id is not None:
+        query = query.where(tagged)
+    return query
+
+
+async def search(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    q: str,
+    types: Sequence[str] = SEARCH_TYPES,
+    subject_id: Optional[uuid.UUID] = None,
+    tag_id: Optional[uuid.UUID] = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> List[SearchHit]:
+    if db.get_bind().dialect.name == "postgresql":
+        return await _search_postgres(db, user_id, q, types, subject_id, tag_id, skip, limit)
+    return await _search_in_memory(db, user_id, q, types, subject_id, tag_id, skip, limit)
+
+
+async def _search_postgres(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    q: str,
+    types: Sequence[str],
+    subject_id: Optional[uuid.UUID],
+    tag_id: Optional[uuid.UUID],
+    skip: int,
+    limit: int,
+) -> List[SearchHit]:
+    # Matching and ranking run on the GIN-indexed search_vector columns;
+    # ts_headline is only computed for the page of results being returned.
+    tsquery = func.websearch_to_tsquery("english", q)
+    ranked = []
+    for search_type in types:
+        source = _source(search_type, user_id, subject_id, tag_id, with_vector=True)
+        if source is None:
+            continue
+        rows = source.subquery()
+        ranked.append(
+            select(
+                literal(search_type).label("type"),
+                rows.c.id,
+                rows.c.title,
+                rows.c.body,
+                rows.c.subject_id,
+                func.ts_rank_cd(rows.c.search_vector, tsquery).label("rank"),
+            ).where(rows.c.search_vector.op("@@")(tsquery))
+        )
+    if not ranked:
+        return []
+
+    union = union_all(*ranked).subquery("matches")
+    page = select(union).order_by(union.c.rank.desc(), union.c.id).offset(skip).limit(limit).subquery("page")
+    result = await db.execute(
+        select(
+            page.c.type,
+            page.c.id,
+            page.c.title,
+            page.c.subject_id,
+            page.c.rank,
+            func.ts_headline("english", func.coalesce(page.c.body, ""), tsquery, HEADLINE_OPTIONS).label("snippet"),
+        ).order_by(page.c.rank.desc(), page.c.id)
+    )
+    return [
+        SearchHit(type=row.type, id=row.id, title=row.title, snippet=row.snippet, rank=float(row.rank), subject_id=row.subject_id)
+        for row in result.all()
+    ]
+
+
+def _snippet(body: Optional[str], terms: set) -> Optional[str]:
+    if not body:
+        return None
+    words = body.split()
+    hits = [i for i, word in enumerate(words) if set(tokenize(word)) & terms]
+    start = max(0, hits[0] - SNIPPET_WORDS // 4) if hits else 0
+    window = words[start:start + SNIPPET_WORDS]
+    marked = [f"<mark>{w}</mark>" if set(tokenize(w)) & terms else w for w in window]
+    return " ".join(marked)
+
+
+async def _search_in_memory(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    q: str,
+    types: Sequence[str],
+    subject_id: Optional[uuid.UUID],
+    tag_id: Optional[uuid.UUID],
+    skip: int,
+    limit: int,
+) -> List[SearchHit]:
+    # Fallback for databases without tsvector (e.g. SQLite test runs): the
+    # filtered rows are loaded and ranked with an in-process BM25 inverted index.
+    rows: List[Dict] = []
+    for search_type in types:
+        source = _source(search_type, user_id, subject_id, tag_id, with_vector=False)
+        if source is None:
+            continue
+        result = await db.execute(source)
+        rows += [{"type": search_type, **row._mapping} for row in result.all()]
+    if not rows:
+        return []
+
+    scores = BM25Index([f"{row['title'] or ''} {row['body'] or ''}" for row in rows]).scores(q)
+    order = sorted((i for i in range(len(rows)) if scores[i] > 0), key=lambda i: (-scores[i], str(rows[i]["id"])))
+    terms = set(tokenize(q))
+    return [
+        SearchHit(
+            type=rows[i]["type"],
+            id=rows[i]["id"],
+            title=rows[i]["title"],
+            snippet=_snippet(rows[i]["body"], terms),
+            rank=float(scores[i]),
+            subject_id=rows[i]["subject_id"],
+        )
+        for i in order[skip:skip + limit]
+    ]
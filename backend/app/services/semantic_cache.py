@@ -0,0 +1,187 @@
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.ai_conversation import AiConversation
+from app.models.ai_semantic_cache_entry import AiSemanticCacheEntry
+from app.models.user_preferences import UserPreferences
+from app.services.embeddings import EMBEDDING_DIM, EMBEDDING_MODEL, embed
+
+
+class _SubjectIndex:
+    def __init__(self, entry_ids: List[uuid.UUID], answer_ids: List[uuid.UUID], matrix: np.ndarray) -> None:
+        self.entry_ids = entry_ids
+        self.answer_ids = answer_ids
+        self.matrix = matrix
+        self.loaded_at = time.monotonic()
+
+
+class SemanticCache:
+    # Past (question, answer) pairs per study subject. Subjects belong to one
+    # user, so hits are only ever shared within that user's conversations.
+    # Lookups embed the new question and take the best cosine match against
+    # the subject's question matrix, held in memory and reloaded after
+    # index_ttl_seconds so entries written by other workers are picked up.
+    # Eviction: entries older than ttl_days are ignored and purged, and each
+    # subject keeps at most max_entries_per_subject, dropping the least
+    # recently hit first.
+
+    def __init__(
+        self,
+        threshold: float,
+        max_entries_per_subject: int,
+        ttl_days: int,
+        max_subjects: int = 256,
+        index_ttl_seconds: float = 60.0,
+    ) -> None:
+        self.threshold = threshold
+        self.max_entries_per_subject = max_entries_per_subject
+        self.ttl_days = ttl_days
+        self.max_subjects = max_subjects
+        self.index_ttl_seconds = index_ttl_seconds
+        self._indexes: "OrderedDict[uuid.UUID, _SubjectIndex]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(days=self.ttl_days)
+
+    async def _index(self, db: AsyncSession, subject_id: uuid.UUID) -> _SubjectIndex:
+        index = self._indexes.get(subject_id)
+        if index is not None and time.monotonic() - index.loaded_at < self.index_ttl_seconds:
+            self._indexes.move_to_end(subject_id)
+            return index
+
+        result = await db.execute(
+            select(
+                AiSemanticCacheEntry.id,
+                AiSemanticCacheEntry.answer_message_id,
+                AiSemanticCacheEntry.question_embedding,
+            ).where(
+                AiSemanticCacheEntry.subject_id == subject_id,
+                AiSemanticCacheEntry.embedding_model == EMBEDDING_MODEL,
+                AiSemanticCacheEntry.created_at > self._cutoff(),
+            )
+        )
+        rows = result.all()
+        matrix = (
+            np.asarray([row.question_embedding for row in rows], dtype=np.float32)
+            if rows
+            else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        )
+        index = _SubjectIndex([row.id for row in rows], [row.answer_message_id for row in rows], matrix)
+        self._indexes[subject_id] = index
+        self._indexes.move_to_end(subject_id)
+        while len(self._indexes) > self.max_subjects:
+            self._indexes.popitem(last=False)
+        return index
+
+    async def lookup(
+        self, db: AsyncSession, subject_id: uuid.UUID, question: str
+    ) -> Optional[Tuple[uuid.UUID, uuid.UUID, float]]:
+        # Returns (entry id, answer message id, similarity) of the best match above threshold.
+        index = await self._index(db, subject_id)
+        if not index.entry_ids:
+            self.misses += 1
+            return None
+        scores = index.matrix @ embed(question)
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        if score < self.threshold:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry_id = index.entry_ids[best]
+        await db.execute(
+            update(AiSemanticCacheEntry)
+            .where(AiSemanticCacheEntry.id == entry_id)
+            .values(hit_count=AiSemanticCacheEntry.hit_count + 1, last_hit_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        return entry_id, index.answer_ids[best], score
+
+    async def add(
+        self, db: AsyncSession, subject_id: uuid.UUID, question: str, answer_message_id: uuid.UUID
+    ) -> None:
+        db.add(
+            AiSemanticCacheEntry(
+                subject_id=subject_id,
+                question_text=question,
+                question_embedding=embed(question).tolist(),
+                embedding_model=EMBEDDING_MODEL,
+                answer_message_id=answer_message_id,
+            )
+        )
+        await db.flush()
+        await self._evict(db, subject_id)
+        self._indexes.pop(subject_id, None)
+
+    async def discard(self, db: AsyncSession, subject_id: uuid.UUID, entry_id: uuid.UUID) -> None:
+        # For an entry whose answer message no longer exists.
+        await db.execute(
+            delete(AiSemanticCacheEntry)
+            .where(AiSemanticCacheEntry.id == entry_id)
+            .execution_options(synchronize_session=False)
+        )
+        self._indexes.pop(subject_id, None)
+
+    async def _evict(self, db: AsyncSession, subject_id: uuid.UUID) -> None:
+        keep = (
+            select(AiSemanticCacheEntry.id)
+            .where(
+                AiSemanticCacheEntry.subject_id == subject_id,
+                AiSemanticCacheEntry.created_at > self._cutoff(),
+            )
+            .order_by(
+                func.coalesce(AiSemanticCacheEntry.last_hit_at, AiSemanticCacheEntry.created_at).desc()
+            )
+            .limit(self.max_entries_per_subject)
+        )
+        await db.execute(
+            delete(AiSemanticCacheEntry)
+            .where(
+                AiSemanticCacheEntry.subject_id == subject_id,
+                AiSemanticCacheEntry.id.not_in(keep),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "threshold": self.threshold,
+            "subjects_loaded": len(self._indexes),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+async def semantic_cache_subject(db: AsyncSession, conversation_id: uuid.UUID) -> Optional[uuid.UUID]:
+    # The cache is opt-in: only conversations with a subject whose owner has
+    # enable_semantic_cache set read from or write to it.
+    result = await db.execute(
+        select(AiConversation.subject_id)
+        .join(UserPreferences, UserPreferences.user_id == AiConversation.user_id)
+        .where(
+            AiConversation.id == conversation_id,
+            AiConversation.subject_id.is_not(None),
+            UserPreferences.enable_semantic_cache.is_(True),
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+semantic_cache = SemanticCache(
+    threshold=get_settings().semantic_cache_threshold,
+    max_entries_per_subject=get_settings().semantic_cache_max_entries_per_subject,
+    ttl_days=get_settings().semantic_cache_ttl_days,
+)
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_setup import AsyncSessionLocal
+
+T = TypeVar("T")
+
+
+def request_key(request: Request, user_id: Any) -> Tuple[Any, ...]:
+    # Same user, same route, same query parameters (in any order).
+    return (str(user_id), request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+
+class SingleFlight:
+    # Coalesces identical concurrent reads: the first caller for a key starts
+    # the work as a task and every caller that arrives while it is still
+    # running awaits the same task, so N simultaneous requests cost one query.
+    # Nothing is kept once the task finishes; this is not a cache.
+    #
+    # fn gets a session of its own for the length of the flight, so it does
+    # not depend on the leader's request staying open, and must only read.
+    # Every caller first ends the read transaction on its request session:
+    # each already holds a connection from authentication, and N waiters
+    # pinning N connections while the flight needs one more could drain the
+    # pool. The result is shared by reference, so return bytes or plain
+    # data, never ORM objects.
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if task.cancelled() or task.exception() is not None:
+            self.errors += 1
+
+    @staticmethod
+    async def _run(fn: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with AsyncSessionLocal() as session:
+            return await fn(session)
+
+    async def do(self, key: Hashable, fn: Callable[[AsyncSession], Awaitable[T]], db: AsyncSession) -> T:
+        # db is the caller's request session; it must have no pending writes.
+        self.calls += 1
+        await db.commit()
+        task = self._flights.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(self._run(fn))
+            self._flights[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        # Exceptions (HTTPException included) reach every waiter.
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": self.coalesced / self.calls if self.calls else 0.0,
+            "errors": self.errors,
+            "in_flight": len(self._flights),
+        }
+
+
+singleflight = SingleFlight()
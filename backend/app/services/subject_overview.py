@@ -0,0 +1,221 @@
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import JSON, Select, func, literal_column, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import get_settings
+from app.models.ai_conversation import AiConversation
+from app.models.document import Document
+from app.models.flashcard import Flashcard
+from app.models.flashcard_deck import FlashcardDeck
+from app.models.note import Note
+from app.models.study_goal import StudyGoal
+from app.models.study_session import StudySession
+from app.models.study_subject import StudySubject
+from app.schemas.study_subject import SubjectOverviewResponse
+
+RECENT_ITEMS = 5
+
+_EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def _count(model: Any, *where: ColumnElement) -> ColumnElement:
+    return select(func.count()).select_from(model).where(*where).scalar_subquery()
+
+
+def _recent(name: str, id_column: Any, title: Any, at: Any, *where: ColumnElement) -> Any:
+    # Newest RECENT_ITEMS rows for the subject as one JSON array, newest first.
+    rows = (
+        select(id_column.label("id"), title.label("title"), at.label("at"))
+        .where(*where)
+        .order_by(at.desc())
+        .limit(RECENT_ITEMS)
+        .correlate(StudySubject)
+        .subquery()
+    )
+    item = func.json_build_object("id", rows.c.id, "title", rows.c.title, "at", rows.c.at)
+    return (
+        select(func.coalesce(func.json_agg(aggregate_order_by(item, rows.c.at.desc())), _EMPTY_JSON_ARRAY, type_=JSON).label("recent"))
+        .select_from(rows)
+        .lateral(name)
+    )
+
+
+def overview_query(user_id: uuid.UUID, subject_id: uuid.UUID, now: datetime) -> Select:
+    # Everything the subject page shows, in one statement: scalar subqueries
+    # for plain counts and LATERAL joins for the parts that need several
+    # aggregates over the same rows or a LIMIT per list. Every subquery is
+    # correlated to the one subject row, so each reads only that subject's
+    # rows.
+    due = (Flashcard.is_suspended == False) & (  # noqa: E712
+        Flashcard.next_review_date.is_(None) | (Flashcard.next_review_date <= now)
+    )
+    cards = (
+        select(
+            func.count().label("cards"),
+            func.count().filter(due).label("due_cards"),
+        )
+        .select_from(Flashcard)
+        .join(FlashcardDeck, Flashcard.deck_id == FlashcardDeck.id)
+        .where(FlashcardDeck.subject_id == StudySubject.id, FlashcardDeck.user_id == user_id)
+        .lateral("card_counts")
+    )
+    sessions = (
+        select(
+            func.count().label("sessions"),
+            func.coalesce(func.sum(StudySession.duration_minutes), 0).label("study_minutes"),
+        )
+        .where(StudySession.subject_id == StudySubject.id, StudySession.user_id == user_id)
+        .lateral("session_counts")
+    )
+    goal = func.json_build_object(
+        "id", StudyGoal.id,
+        "goal_type", StudyGoal.goal_type,
+        "target_value", StudyGoal.target_value,
+        "current_value", StudyGoal.current_value,
+        "end_date", StudyGoal.end_date,
+        "is_completed", StudyGoal.is_completed,
+    )
+    goals = (
+        select(
+            func.count().label("goals"),
+            func.count().filter(StudyGoal.is_completed == True).label("completed_goals"),  # noqa: E712
+            func.coalesce(
+                func.json_agg(aggregate_order_by(goal, StudyGoal.end_date.asc().nulls_last())).filter(
+                    StudyGoal.is_active == True  # noqa: E712
+                ),
+                _EMPTY_JSON_ARRAY,
+                type_=JSON,
+            ).label("active_goals"),
+        )
+        .where(StudyGoal.subject_id == StudySubject.id, StudyGoal.user_id == user_id)
+        .lateral("goal_progress")
+    )
+    recent_notes = _recent(
+        "recent_notes", Note.id, Note.title, Note.updated_at,
+        Note.subject_id == StudySubject.id, Note.user_id == user_id,
+    )
+    recent_documents = _recent(
+        "recent_documents", Document.id, Document.title, Document.uploaded_at,
+        Document.subject_id == StudySubject.id, Document.user_id == user_id,
+    )
+    recent_decks = _recent(
+        "recent_decks", FlashcardDeck.id, FlashcardDeck.title, FlashcardDeck.updated_at,
+        FlashcardDeck.subject_id == StudySubject.id, FlashcardDeck.user_id == user_id,
+    )
+    recent_sessions = _recent(
+        "recent_sessions", StudySession.id, StudySession.session_type, StudySession.started_at,
+        StudySession.subject_id == StudySubject.id, StudySession.user_id == user_id,
+    )
+    recent_conversations = _recent(
+        "recent_conversations", AiConversation.id, AiConversation.title, AiConversation.updated_at,
+        AiConversation.subject_id == StudySubject.id, AiConversation.user_id == user_id,
+    )
+    laterals = [cards, sessions, goals, recent_notes, recent_documents, recent_decks, recent_sessions, recent_conversations]
+
+    query = select(
+        StudySubject,
+        _count(Note, Note.subject_id == StudySubject.id, Note.user_id == user_id).label("notes"),
+        _count(Document, Document.subject_id == StudySubject.id, Document.user_id == user_id).label("documents"),
+        _count(FlashcardDeck, FlashcardDeck.subject_id == StudySubject.id, FlashcardDeck.user_id == user_id).label("decks"),
+        _count(AiConversation, AiConversation.subject_id == StudySubject.id, AiConversation.user_id == user_id).label("conversations"),
+        cards.c.cards,
+        cards.c.due_cards,
+        sessions.c.sessions,
+        sessions.c.study_minutes,
+        goals.c.goals,
+        goals.c.completed_goals,
+        goals.c.active_goals,
+        recent_notes.c.recent.label("recent_notes"),
+        recent_documents.c.recent.label("recent_documents"),
+        recent_decks.c.recent.label("recent_decks"),
+        recent_sessions.c.recent.label("recent_sessions"),
+        recent_conversations.c.recent.label("recent_conversations"),
+    ).select_from(StudySubject)
+    for lateral in laterals:
+        query = query.join(lateral, true())
+    return query.where(StudySubject.id == subject_id, StudySubject.user_id == user_id)
+
+
+async def load_overview(db: AsyncSession, user_id: uuid.UUID, subject_id: uuid.UUID) -> Optional[bytes]:
+    result = await db.execute(overview_query(user_id, subject_id, datetime.now(timezone.utc)))
+    row = result.one_or_none()
+    if row is None:
+        return None
+    overview = SubjectOverviewResponse.model_validate({
+        "subject": row.StudySubject,
+        "counts": dict(row._mapping),
+        "goals": row.active_goals,
+        "recent_notes": row.recent_notes,
+        "recent_documents": row.recent_documents,
+        "recent_decks": row.recent_decks,
+        "recent_sessions": row.recent_sessions,
+        "recent_conversations": row.recent_conversations,
+    })
+    return overview.model_dump_json().encode()
+
+
+class SubjectOverviewCache:
+    # Serialized overviews keyed by (user, subject), each kept for ttl_seconds.
+    # Writes to anything an overview shows call invalidate(user_id) after
+    # committing, which drops all of that user's subjects since an item can
+    # move between subjects. The TTL bounds what writes cannot signal: cards
+    # falling due with time and counters flushed in the background.
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[uuid.UUID, uuid.UUID], Tuple[float, int, bytes]]" = OrderedDict()
+        self._generations: Dict[uuid.UUID, int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._generations[user_id] += 1
+        self.invalidations += 1
+
+    async def get(self, db: AsyncSession, user_id: uuid.UUID, subject_id: uuid.UUID) -> Optional[bytes]:
+        key = (user_id, subject_id)
+        generation = self._generations[user_id]
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, entry_generation, content = entry
+            if expires_at > time.monotonic() and entry_generation == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return content
+            del self._entries[key]
+
+        self.misses += 1
+        content = await load_overview(db, user_id, subject_id)
+        # Stored under the generation seen before the query, so a write that
+        # committed while it ran leaves the entry already stale.
+        if content is not None:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, generation, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return content
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+subject_overviews = SubjectOverviewCache(
+    max_entries=get_settings().subject_overview_max_entries,
+    ttl_seconds=get_settings().subject_overview_ttl_seconds,
+)
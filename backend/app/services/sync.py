@@ -0,0 +1,95 @@
+import uuid
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.document import Document
+from app.models.flashcard import Flashcard
+from app.models.flashcard_deck import FlashcardDeck
+from app.models.note import Note
+from app.models.study_goal import StudyGoal
+from app.models.study_session import StudySession
+from app.models.study_subject import StudySubject
+from app.models.sync_tombstone import SyncTombstone
+from app.models.sync_version import sync_horizon
+from app.models.tag import Tag
+
+# item_type -> (model, key in the /sync response)
+SYNC_TYPES: Dict[str, Tuple[Any, str]] = {
+    "subject": (StudySubject, "subjects"),
+    "note": (Note, "notes"),
+    "document": (Document, "documents"),
+    "tag": (Tag, "tags"),
+    "deck": (FlashcardDeck, "decks"),
+    "flashcard": (Flashcard, "cards"),
+    "goal": (StudyGoal, "goals"),
+    "session": (StudySession, "sessions"),
+}
+
+
+def record_deletion(db: AsyncSession, user_id: uuid.UUID, item_type: str, item_id: uuid.UUID) -> None:
+    # Call next to db.delete() so the tombstone commits with the delete.
+    db.add(SyncTombstone(user_id=user_id, item_type=item_type, item_id=item_id))
+
+
+def _changed(item_type: str, user_id: uuid.UUID) -> Select:
+    model = SYNC_TYPES[item_type][0]
+    if item_type == "flashcard":
+        return (
+            select(Flashcard)
+            .join(FlashcardDeck, Flashcard.deck_id == FlashcardDeck.id)
+            .where(FlashcardDeck.user_id == user_id)
+        )
+    return select(model).where(model.user_id == user_id)
+
+
+def _sources(user_id: uuid.UUID) -> List[Tuple[Any, str, Select]]:
+    # (version column, response key, query) for every synced table and the tombstones.
+    sources = [
+        (SYNC_TYPES[item_type][0].sync_version, key, _changed(item_type, user_id))
+        for item_type, (_, key) in SYNC_TYPES.items()
+    ]
+    sources.append(
+        (SyncTombstone.sync_version, "deleted", select(SyncTombstone).where(SyncTombstone.user_id == user_id))
+    )
+    return sources
+
+
+async def changes_since(db: AsyncSession, user_id: uuid.UUID, since: int, limit: int) -> Dict[str, Any]:
+    # Rows carry the id of the transaction that last wrote them (see
+    # app.models.sync_version). Only versions below the snapshot xmin are
+    # returned: those transactions have all finished, so nothing can later
+    # commit under the cursor. Changes from transactions still running show
+    # up on a later call, and a long-running transaction anywhere in the
+    # database holds the horizon back until it ends.
+    #
+    # Each source returns at most limit + 1 rows past the cursor and the page
+    # is the `limit` lowest versions overall. One transaction can write many
+    # rows under the same version, so a page never splits one: when the page
+    # is cut, the last transaction on it is fetched whole.
+    horizon = (await db.execute(select(sync_horizon()))).scalar_one()
+    sources = _sources(user_id)
+    candidates: List[Tuple[int, str, Any]] = []
+    for version, key, query in sources:
+        result = await db.execute(
+            query.where(version > since, version < horizon).order_by(version).limit(limit + 1)
+        )
+        candidates.extend((row.sync_version, key, row) for row in result.scalars().all())
+
+    candidates.sort(key=lambda candidate: candidate[0])
+    has_more = len(candidates) > limit
+    if has_more:
+        last = candidates[limit - 1][0]
+        candidates = [candidate for candidate in candidates if candidate[0] < last]
+        for version, key, query in sources:
+            result = await db.execute(query.where(version == last))
+            candidates.extend((last, key, row) for row in result.scalars().all())
+
+    changes: Dict[str, Any] = {key: [] for _, key in SYNC_TYPES.values()}
+    changes["deleted"] = []
+    for _, key, row in candidates:
+        changes[key].append(row)
+    changes["cursor"] = candidates[-1][0] if candidates else since
+    changes["has_more"] = has_more
+    return changes
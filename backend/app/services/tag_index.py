@@ -0,0 +1,213 @@
+import bisect
+import heapq
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.tag import Tag
+from app.services.tagging import TAG_ASSOCIATIONS
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+
+@dataclass
+class TagFilter:
+    include: List[uuid.UUID] = field(default_factory=list)
+    exclude: List[uuid.UUID] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+
+class TagPostings:
+    # Sorted-array postings for one user and item type: every tagged item gets
+    # a dense position, and each tag maps to the sorted int32 positions of its
+    # items, so AND / NOT over tags are numpy set operations on small arrays.
+
+    def __init__(self, pairs: Sequence[Tuple[uuid.UUID, uuid.UUID]]) -> None:
+        self.items: List[uuid.UUID] = sorted({item for item, _ in pairs})
+        position = {item: i for i, item in enumerate(self.items)}
+        grouped: Dict[uuid.UUID, List[int]] = defaultdict(list)
+        for item, tag in pairs:
+            grouped[tag].append(position[item])
+        self.postings = {tag: np.unique(np.array(p, dtype=np.int32)) for tag, p in grouped.items()}
+
+    def _posting(self, tag_id: uuid.UUID) -> np.ndarray:
+        return self.postings.get(tag_id, _EMPTY)
+
+    def _union(self, tag_ids: Sequence[uuid.UUID]) -> np.ndarray:
+        if not tag_ids:
+            return _EMPTY
+        return np.unique(np.concatenate([self._posting(t) for t in tag_ids]))
+
+    def match(self, include: Sequence[uuid.UUID], exclude: Sequence[uuid.UUID]) -> List[uuid.UUID]:
+        # Items carrying every included tag and none of the excluded ones.
+        # Rarest posting first keeps the running intersection small.
+        postings = sorted((self._posting(t) for t in set(include)), key=len)
+        matched = postings[0]
+        for posting in postings[1:]:
+            if not len(matched):
+                break
+            matched = np.intersect1d(matched, posting, assume_unique=True)
+        if exclude and len(matched):
+            matched = np.setdiff1d(matched, self._union(list(set(exclude))), assume_unique=True)
+        return [self.items[i] for i in matched]
+
+    def tagged_with_any(self, tag_ids: Sequence[uuid.UUID]) -> List[uuid.UUID]:
+        return [self.items[i] for i in self._union(list(set(tag_ids)))]
+
+
+@dataclass
+class TagSuggestion:
+    id: uuid.UUID
+    name: str
+    usage_count: int
+
+
+class TagNames:
+    # A user's tags sorted by case-folded name. A prefix selects a contiguous
+    # slice found with two binary searches, and the slice is ranked by
+    # usage_count with a bounded heap.
+
+    def __init__(self, tags: Sequence[TagSuggestion]) -> None:
+        self.tags = sorted(tags, key=lambda t: t.name.casefold())
+        self.keys = [t.name.casefold() for t in self.tags]
+
+    def suggest(self, prefix: str, limit: int) -> List[TagSuggestion]:
+        prefix = prefix.casefold()
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo)
+        best = heapq.nsmallest(limit, range(lo, hi), key=lambda i: (-self.tags[i].usage_count, self.keys[i]))
+        return [self.tags[i] for i in best]
+
+
+@dataclass
+class _UserTags:
+    version: Tuple[int, int]
+    postings: Dict[str, TagPostings] = field(default_factory=dict)
+    names: Optional[TagNames] = None
+
+
+class TagIndex:
+    # Per-user tag structures built on first use and kept in an LRU: postings
+    # per item type for tag-set filters, and the name index for autocomplete.
+    # Anything that creates tags or changes a user's tagging must call
+    # invalidate(user_id) after committing; the next read rebuilds.
+    #
+    # invalidate() only reaches this process, so every read also checks the
+    # user's tag version in the database. Creating, renaming or deleting a tag
+    # and every attach or detach (through usage_count) rewrite a tag row,
+    # which stamps it with a newer sync_version, so (count, sum of
+    # sync_version) over the user's tags changes whenever another worker
+    # changed their tagging.
+
+    def __init__(self, max_users: int = 256) -> None:
+        self.max_users = max_users
+        self._users: "OrderedDict[uuid.UUID, _UserTags]" = OrderedDict()
+        self._generations: Dict[uuid.UUID, int] = defaultdict(int)
+        self.builds = 0
+        self.hits = 0
+        self.stale = 0
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._users.pop(user_id, None)
+        self._generations[user_id] += 1
+
+    async def version(self, db: AsyncSession, user_id: uuid.UUID) -> Tuple[int, int]:
+        result = await db.execute(
+            select(func.count(), func.coalesce(func.sum(Tag.sync_version), 0)).where(Tag.user_id == user_id)
+        )
+        count, total = result.one()
+        return count, int(total)
+
+    def _cached(self, user_id: uuid.UUID, version: Tuple[int, int]) -> Optional[_UserTags]:
+        entry = self._users.get(user_id)
+        if entry is None:
+            return None
+        if entry.version != version:
+            del self._users[user_id]
+            self.stale += 1
+            return None
+        self._users.move_to_end(user_id)
+        return entry
+
+    def _store(self, user_id: uuid.UUID, generation: int, version: Tuple[int, int]) -> Optional[_UserTags]:
+        # A change committed while a build was reading may be missing from
+        # it, so the result is only cached if nothing was invalidated meanwhile.
+        # The version is read before the build, so a build that sees a newer
+        # commit is at worst rebuilt once more on the next read.
+        if generation != self._generations[user_id]:
+            return None
+        entry = self._users.get(user_id)
+        if entry is None or entry.version != version:
+            entry = self._users[user_id] = _UserTags(version)
+        self._users.move_to_end(user_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return entry
+
+    async def postings(self, db: AsyncSession, user_id: uuid.UUID, item_type: str) -> TagPostings:
+        version = await self.version(db, user_id)
+        entry = self._cached(user_id, version)
+        if entry is not None and item_type in entry.postings:
+            self.hits += 1
+            return entry.postings[item_type]
+
+        generation = self._generations[user_id]
+        table, item_column = TAG_ASSOCIATIONS[item_type]
+        result = await db.execute(
+            select(item_column, table.c.tag_id)
+            .join(Tag, Tag.id == table.c.tag_id)
+            .where(Tag.user_id == user_id)
+        )
+        built = TagPostings([tuple(row) for row in result.all()])
+        self.builds += 1
+        entry = self._store(user_id, generation, version)
+        if entry is not None:
+            entry.postings[item_type] = built
+        return built
+
+    async def suggest(self, db: AsyncSession, user_id: uuid.UUID, prefix: str, limit: int = 10) -> List[TagSuggestion]:
+        version = await self.version(db, user_id)
+        entry = self._cached(user_id, version)
+        if entry is not None and entry.names is not None:
+            self.hits += 1
+            return entry.names.suggest(prefix, limit)
+
+        generation = self._generations[user_id]
+        result = await db.execute(select(Tag.id, Tag.name, Tag.usage_count).where(Tag.user_id == user_id))
+        names = TagNames([TagSuggestion(*row) for row in result.all()])
+        self.builds += 1
+        entry = self._store(user_id, generation, version)
+        if entry is not None:
+            entry.names = names
+        return names.suggest(prefix, limit)
+
+    async def where(
+        self,
+        db: AsyncSession,
+        user_id: uuid.UUID,
+        item_type: str,
+        id_column: ColumnElement,
+        tag_filter: TagFilter,
+    ) -> Optional[ColumnElement]:
+        # The clause to add to a list query: id IN (matches) when tags are
+        # required, id NOT IN (excluded) when tags are only excluded.
+        if not tag_filter:
+            return None
+        postings = await self.postings(db, user_id, item_type)
+        if tag_filter.include:
+            return id_column.in_(postings.match(tag_filter.include, tag_filter.exclude))
+        return id_column.not_in(postings.tagged_with_any(tag_filter.exclude))
+
+    def stats(self) -> Dict[str, int]:
+        return {"users": len(self._users), "builds": self.builds, "hits": self.hits, "stale": self.stale}
+
+
+tag_index = TagIndex()
@@ -0,0 +1,168 @@
+import uuid
+from collections import Counter
+from typing import Any, Dict, Sequence, Set, Tuple
+
+from sqlalchemy import Column, Select, case, delete, func, select, union_all, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.schema import Table
+
+from app.models.associations import document_tags, flashcard_tags, note_tags
+from app.models.document import Document
+from app.models.flashcard import Flashcard
+from app.models.flashcard_deck import FlashcardDeck
+from app.models.note import Note
+from app.models.sync_version import current_sync_version
+from app.models.tag import Tag
+
+TAGGABLE_TYPES = ("note", "document", "flashcard")
+
+# item_type -> (association table, its item column)
+TAG_ASSOCIATIONS: Dict[str, Tuple[Table, Column]] = {
+    "note": (note_tags, note_tags.c.note_id),
+    "document": (document_tags, document_tags.c.document_id),
+    "flashcard": (flashcard_tags, flashcard_tags.c.flashcard_id),
+}
+_ITEM_MODELS = {"note": Note, "document": Document, "flashcard": Flashcard}
+_ITEM_IDS = {item_type: model.id for item_type, model in _ITEM_MODELS.items()}
+
+
+def _owned_items(item_type: str, user_id: uuid.UUID) -> Select:
+    if item_type == "note":
+        return select(Note.id).where(Note.user_id == user_id)
+    if item_type == "document":
+        return select(Document.id).where(Document.user_id == user_id)
+    return (
+        select(Flashcard.id)
+        .join(FlashcardDeck, Flashcard.deck_id == FlashcardDeck.id)
+        .where(FlashcardDeck.user_id == user_id)
+    )
+
+
+async def owned_tag_ids(db: AsyncSession, user_id: uuid.UUID, tag_ids: Sequence[uuid.UUID]) -> Set[uuid.UUID]:
+    if not tag_ids:
+        return set()
+    result = await db.execute(select(Tag.id).where(Tag.user_id == user_id, Tag.id.in_(set(tag_ids))))
+    return set(result.scalars().all())
+
+
+async def owned_item_ids(
+    db: AsyncSession, user_id: uuid.UUID, item_type: str, item_ids: Sequence[uuid.UUID]
+) -> Set[uuid.UUID]:
+    if not item_ids:
+        return set()
+    query = _owned_items(item_type, user_id)
+    item_column = query.selected_columns[0]
+    result = await db.execute(query.where(item_column.in_(set(item_ids))))
+    return set(result.scalars().all())
+
+
+async def _adjust_usage(db: AsyncSession, tag_ids: Sequence[uuid.UUID], sign: int) -> None:
+    # One UPDATE moving each tag's usage_count by the number of association
+    # rows just written (or removed) for it.
+    deltas = Counter(tag_ids)
+    if not deltas:
+        return
+    await db.execute(
+        update(Tag)
+        .where(Tag.id.in_(deltas))
+        .values(usage_count=Tag.usage_count + sign * case(deltas, value=Tag.id, else_=0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _touch_items(db: AsyncSession, item_type: str, item_ids: Set[uuid.UUID]) -> None:
+    # An item's tags are part of what /sync sends for it, so items whose tags
+    # changed get a new sync_version. updated_at is kept: the content did not
+    # change.
+    if not item_ids:
+        return
+    model = _ITEM_MODELS[item_type]
+    values: Dict[str, Any] = {"sync_version": current_sync_version()}
+    if hasattr(model, "updated_at"):
+        values["updated_at"] = model.updated_at
+    await db.execute(
+        update(model)
+        .where(model.id.in_(item_ids))
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _insert_pairs(db: AsyncSession, item_type: str, pairs: Select) -> int:
+    table, item_column = TAG_ASSOCIATIONS[item_type]
+    stmt = (
+        insert(table)
+        .from_select([item_column, table.c.tag_id], pairs)
+        .on_conflict_do_nothing()
+        .returning(item_column, table.c.tag_id)
+    )
+    result = await db.execute(stmt)
+    inserted = result.all()
+    await _adjust_usage(db, [tag_id for _, tag_id in inserted], 1)
+    await _touch_items(db, item_type, {item_id for item_id, _ in inserted})
+    return len(inserted)
+
+
+async def attach_tags(
+    db: AsyncSession, item_type: str, item_ids: Set[uuid.UUID], tag_ids: Set[uuid.UUID]
+) -> int:
+    # Writes every (item, tag) pair in one INSERT ... SELECT over the cross
+    # product, so the statement carries len(items) + len(tags) parameters
+    # rather than one row per pair. Existing pairs are skipped by the primary key.
+    if not item_ids or not tag_ids:
+        return 0
+    item_id = _ITEM_IDS[item_type]
+    return await _insert_pairs(db, item_type, select(item_id, Tag.id).where(item_id.in_(item_ids), Tag.id.in_(tag_ids)))
+
+
+async def attach_tags_to_deck(db: AsyncSession, deck_id: uuid.UUID, tag_ids: Set[uuid.UUID]) -> int:
+    if not tag_ids:
+        return 0
+    pairs = select(Flashcard.id, Tag.id).where(Flashcard.deck_id == deck_id, Tag.id.in_(tag_ids))
+    return await _insert_pairs(db, "flashcard", pairs)
+
+
+async def detach_tags(
+    db: AsyncSession, item_type: str, item_ids: Set[uuid.UUID], tag_ids: Set[uuid.UUID]
+) -> int:
+    if not item_ids or not tag_ids:
+        return 0
+    table, item_column = TAG_ASSOCIATIONS[item_type]
+    result = await db.execute(
+        delete(table)
+        .where(item_column.in_(item_ids), table.c.tag_id.in_(tag_ids))
+        .returning(item_column, table.c.tag_id)
+    )
+    removed = result.all()
+    await _adjust_usage(db, [tag_id for _, tag_id in removed], -1)
+    await _touch_items(db, item_type, {item_id for item_id, _ in removed})
+    return len(removed)
+
+
+async def detach_all_tags(db: AsyncSession, item_type: str, item_ids: Set[uuid.UUID]) -> int:
+    # For items about to be deleted: drops their association rows and gives
+    # the usage back to each tag.
+    if not item_ids:
+        return 0
+    table, item_column = TAG_ASSOCIATIONS[item_type]
+    result = await db.execute(delete(table).where(item_column.in_(item_ids)).returning(table.c.tag_id))
+    removed = result.scalars().all()
+    await _adjust_usage(db, removed, -1)
+    return len(removed)
+
+
+async def recompute_tag_usage(db: AsyncSession) -> int:
+    # Recounts usage_count for every tag from the three association tables;
+    # repairs drift from rows removed outside the helpers above.
+    counts = union_all(*(select(table.c.tag_id) for table, _ in TAG_ASSOCIATIONS.values())).subquery("uses")
+    usage = (
+        select(func.count())
+        .select_from(counts)
+        .where(counts.c.tag_id == Tag.id)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Tag).values(usage_count=usage).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
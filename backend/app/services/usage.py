@@ -0,0 +1,56 @@
+import math
+from typing import Optional
+
+from app.core.config import get_settings
+from app.models.ai_usage_stats import AiUsageStats
+from app.models.user import User
+from app.services.progress import local_date
+from app.services.quota import ai_quota
+from app.services.rollups import RollupBuffer
+
+# Write-behind: AI routes only touch this in-memory buffer; the (user_id,
+# stat_date) rows are upserted every flush interval or after max_pending_events.
+usage_rollup = RollupBuffer(
+    AiUsageStats,
+    ("user_id", "stat_date"),
+    flush_interval=get_settings().rollup_flush_interval_seconds,
+    max_pending_events=1000,
+)
+
+# Queued generations are charged an estimate of their prompt size, about four
+# characters per token, until the real count is reported on completion.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def record_conversation_started(user: User) -> None:
+    usage_rollup.add((user.id, local_date(user)), conversations_started=1)
+
+
+def record_message(user: User, role: str, tokens_used: Optional[int]) -> None:
+    usage_rollup.add(
+        (user.id, local_date(user)),
+        total_messages_sent=1 if role == "user" else 0,
+        total_tokens_consumed=tokens_used or 0,
+    )
+    ai_quota.charge(user.id, tokens_used or 0)
+
+
+def record_generation(user: User, content_type: str, tokens_used: Optional[int] = None) -> None:
+    counter = "flashcards_generated" if content_type == "flashcards" else "summaries_generated"
+    usage_rollup.add(
+        (user.id, local_date(user)),
+        **{counter: 1, "total_tokens_consumed": tokens_used or 0},
+    )
+    ai_quota.charge(user.id, tokens_used or 0)
+
+
+def record_generation_tokens(user: User, tokens: int) -> None:
+    # Tokens reported after the generation was first recorded.
+    if tokens <= 0:
+        return
+    usage_rollup.add((user.id, local_date(user)), total_tokens_consumed=tokens)
+    ai_quota.charge(user.id, tokens)
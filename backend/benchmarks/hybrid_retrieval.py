@@ -0,0 +1,98 @@
+# Recall@k and query latency of BM25, vector and hybrid (RRF) retrieval on a
+# synthetic course corpus.
+#
+#   python -m benchmarks.hybrid_retrieval --chunks 5000 --queries 300
+#
+# Every chunk carries an exact identifier (like a course code or formula label)
+# and a few distinctive terms. Each query has exactly one relevant chunk:
+# "code" queries quote the identifier with no other shared wording, and
+# "topic" queries use inflected variants of the chunk's terms, which exact
+# term matching misses. Needs no database.
+import argparse
+import random
+import statistics
+import time
+import uuid
+from typing import Callable, List, Tuple
+
+from app.services.retrieval import Chunk, HybridIndex
+
+TOPICS = ["biology", "physics", "calculus", "genetics", "economics", "chemistry", "history", "algorithms"]
+FILLER = "the a of and in to is for with on this that as by from are".split()
+SUFFIXES = ["ation", "ing", "ed", "es", "ive", "ity"]
+
+
+def _stem(rng: random.Random) -> str:
+    return "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(3))
+
+
+def _corpus(size: int, rng: random.Random) -> Tuple[List[Chunk], List[str], List[List[str]]]:
+    # Each chunk gets its own identifier and a handful of content stems written
+    # with one suffix; paraphrase queries use other suffixes of the same stems.
+    chunks, codes, stems = [], [], []
+    for i in range(size):
+        topic = TOPICS[i % len(TOPICS)]
+        code = f"{topic[:4].upper()}-{i:05d}"
+        own = [_stem(rng) for _ in range(6)]
+        body = [stem + rng.choice(SUFFIXES) for stem in own] + rng.choices(FILLER, k=10)
+        rng.shuffle(body)
+        chunks.append(
+            Chunk(
+                id=uuid.uuid4(),
+                source_type="note",
+                source_id=uuid.uuid4(),
+                subject_id=None,
+                chunk_index=0,
+                content_text=f"{code} {topic} " + " ".join(body),
+            )
+        )
+        codes.append(code)
+        stems.append(own)
+    return chunks, codes, stems
+
+
+def _recall(search: Callable[[str, int], List[int]], queries: List[Tuple[str, int]], k: int) -> Tuple[float, float]:
+    found, latencies = 0, []
+    for text, target in queries:
+        started = time.perf_counter()
+        ranked = search(text, k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found += target in ranked
+    return found / len(queries), statistics.median(latencies)
+
+
+def main(size: int, query_count: int, k: int, seed: int) -> None:
+    rng = random.Random(seed)
+    chunks, codes, stems = _corpus(size, rng)
+    started = time.perf_counter()
+    index = HybridIndex(chunks)
+    build_ms = (time.perf_counter() - started) * 1000
+    positions = {chunk.id: i for i, chunk in enumerate(chunks)}
+
+    targets = rng.sample(range(size), query_count)
+    query_sets = {
+        "code": [(f"what does {codes[t]} say", t) for t in targets],
+        "topic": [(" ".join(stem + rng.choice(SUFFIXES) for stem in rng.sample(stems[t], 4)), t) for t in targets],
+    }
+    searches = {
+        "bm25": index.search_bm25,
+        "vector": index.search_vector,
+        "hybrid": lambda q, n: [positions[r.chunk.id] for r in index.search(q, n)],
+    }
+
+    print(f"{size} chunks, index build {build_ms:.0f}ms, {query_count} queries per type, k={k}")
+    print(f"{'method':<8} {'query':<6} {'recall@k':>9} {'p50 ms':>8}")
+    for method, search in searches.items():
+        for name, queries in query_sets.items():
+            recall, p50 = _recall(search, queries, k)
+            print(f"{method:<8} {name:<6} {recall:>9.1%} {p50:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.chunks, args.queries, args.k, args.seed)
@@ -0,0 +1,85 @@
+# Interactive queue wait with and without a concurrent batch flood.
+#
+#   python -m benchmarks.llm_scheduler --concurrency 8 --reserved 2
+#
+# Model calls are simulated with sleeps, so this needs no database or backend.
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+from app.services.llm_scheduler import BATCH, INTERACTIVE, LLMScheduler
+
+
+async def _call(scheduler: LLMScheduler, user_id: uuid.UUID, lane: str, seconds: float, waits: List[float]) -> None:
+    enqueued = time.perf_counter()
+    async with scheduler.slot(user_id, lane):
+        waits.append(time.perf_counter() - enqueued)
+        await asyncio.sleep(seconds)
+
+
+async def _interactive(scheduler: LLMScheduler, users: int, seconds: float, waits: List[float]) -> None:
+    deadline = time.perf_counter() + seconds
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    tasks = []
+    while time.perf_counter() < deadline:
+        tasks.append(asyncio.create_task(_call(scheduler, random.choice(user_ids), INTERACTIVE, 0.05, waits)))
+        await asyncio.sleep(random.expovariate(users / 0.5))
+    await asyncio.gather(*tasks)
+
+
+async def _batch(scheduler: LLMScheduler, heavy_jobs: int, light_users: int, done: Counter) -> None:
+    heavy = uuid.uuid4()
+    light = [uuid.uuid4() for _ in range(light_users)]
+
+    async def job(user_id: uuid.UUID, label: str) -> None:
+        await _call(scheduler, user_id, BATCH, 0.2, [])
+        done[label] += 1
+
+    jobs = [job(heavy, "heavy") for _ in range(heavy_jobs)]
+    jobs += [job(user_id, f"light-{i}") for i, user_id in enumerate(light) for _ in range(heavy_jobs // 10)]
+    await asyncio.gather(*jobs)
+
+
+def _report(label: str, waits: List[float]) -> None:
+    waits.sort()
+    print(
+        f"{label:<26} n={len(waits):<5} p50={statistics.median(waits) * 1000:7.2f}ms "
+        f"p99={waits[int(len(waits) * 0.99) - 1] * 1000:7.2f}ms"
+    )
+
+
+async def main(concurrency: int, reserved: int, seconds: float, users: int) -> None:
+    baseline: List[float] = []
+    await _interactive(LLMScheduler(concurrency, reserved), users, seconds, baseline)
+
+    scheduler = LLMScheduler(concurrency, reserved)
+    loaded: List[float] = []
+    done: Counter = Counter()
+    batch = asyncio.create_task(_batch(scheduler, heavy_jobs=400, light_users=3, done=done))
+    await asyncio.sleep(0.5)
+    await _interactive(scheduler, users, seconds, loaded)
+    snapshot = dict(done)
+    batch.cancel()
+    try:
+        await batch
+    except asyncio.CancelledError:
+        pass
+
+    _report("interactive, idle", baseline)
+    _report("interactive, batch flood", loaded)
+    print(f"batch jobs finished per user during the run: {snapshot}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--reserved", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--users", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.reserved, args.seconds, args.users))
@@ -0,0 +1,85 @@
+# Sustained append throughput on a single conversation.
+#
+#   python -m benchmarks.message_appends --workers 16 --seconds 10
+#
+# Runs against DATABASE_URL and leaves its user and conversation behind.
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import List
+
+from sqlalchemy import func, select
+
+from app.core.db_setup import AsyncSessionLocal, Base, engine
+from app.core.security import hash_password
+from app.models.ai_conversation import AiConversation
+from app.models.ai_message import AiMessage
+from app.models.user import User
+from app.services.messages import allocate_message_order
+
+
+async def _setup() -> tuple:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as db:
+        tag = uuid.uuid4().hex[:8]
+        user = User(
+            email=f"bench-{tag}@example.com",
+            username=f"bench-{tag}",
+            hashed_password=hash_password("benchmark"),
+        )
+        db.add(user)
+        await db.flush()
+        conv = AiConversation(user_id=user.id, title="append benchmark")
+        db.add(conv)
+        await db.commit()
+        return user.id, conv.id
+
+
+async def _worker(user_id: uuid.UUID, conv_id: uuid.UUID, deadline: float, latencies: List[float]) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            order = await allocate_message_order(db, conv_id, user_id)
+            db.add(AiMessage(conversation_id=conv_id, role="user", content="ping", message_order=order))
+            await db.commit()
+        latencies.append(time.perf_counter() - started)
+
+
+async def main(workers: int, seconds: float) -> None:
+    user_id, conv_id = await _setup()
+    latencies: List[float] = []
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(*(_worker(user_id, conv_id, deadline, latencies) for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+
+    async with AsyncSessionLocal() as db:
+        count, distinct_orders, max_order = (
+            await db.execute(
+                select(
+                    func.count(AiMessage.id),
+                    func.count(AiMessage.message_order.distinct()),
+                    func.max(AiMessage.message_order),
+                ).where(AiMessage.conversation_id == conv_id)
+            )
+        ).one()
+    await engine.dispose()
+
+    latencies.sort()
+    print(f"workers:          {workers}")
+    print(f"appends:          {count} in {elapsed:.2f}s")
+    print(f"appends/sec:      {count / elapsed:.1f}")
+    print(f"p50 latency (ms): {statistics.median(latencies) * 1000:.2f}")
+    print(f"p99 latency (ms): {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f}")
+    print(f"orders unique:    {count == distinct_orders}, gapless: {max_order == count}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.seconds))
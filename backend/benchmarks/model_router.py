@@ -0,0 +1,75 @@
+# Routing behaviour on fake backends: tail latency with and without hedging,
+# and traffic shifting away from a failing backend once its circuit opens.
+#
+#   python -m benchmarks.model_router --requests 200 --workers 8
+#
+# Needs no database or model API.
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections import Counter
+from typing import List
+
+from app.services.model_router import FakeBackend, ModelRouter
+
+SHORT_PROMPT = "What is osmosis?"
+
+
+def _backends(tail_sigma: float, error_rate: float) -> List[FakeBackend]:
+    return [
+        FakeBackend("small-a", "small", cost_per_1k_tokens=0.2, latency_ms=100, latency_sigma=tail_sigma, error_rate=error_rate, seed=1),
+        FakeBackend("small-b", "small", cost_per_1k_tokens=0.2, latency_ms=100, latency_sigma=tail_sigma, seed=2),
+        FakeBackend("large", "large", cost_per_1k_tokens=3.0, latency_ms=600, seed=3),
+    ]
+
+
+async def _run(router: ModelRouter, requests: int, workers: int) -> tuple:
+    latencies: List[float] = []
+    served: Counter = Counter()
+    failures = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal failures
+        user_id = uuid.uuid4()
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                completion = await router.complete(user_id, SHORT_PROMPT)
+                served[completion.model] += 1
+            except Exception:
+                failures += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    latencies.sort()
+    return latencies, served, failures
+
+
+def _report(label: str, router: ModelRouter, result: tuple) -> None:
+    latencies, served, failures = result
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{label:<28} p50={statistics.median(latencies):7.1f}ms p99={p99:7.1f}ms "
+        f"failures={failures:<3} hedges={router.hedges_fired:<4} served={dict(served)}"
+    )
+
+
+async def main(requests: int, workers: int) -> None:
+    for label, hedge_min_ms in (("heavy tail, no hedging", 1e9), ("heavy tail, hedging", 100.0)):
+        router = ModelRouter(_backends(tail_sigma=1.0, error_rate=0.0), hedge_min_ms=hedge_min_ms)
+        _report(label, router, await _run(router, requests, workers))
+
+    router = ModelRouter(_backends(tail_sigma=0.3, error_rate=1.0), failure_threshold=3, cooldown=60)
+    _report("primary failing", router, await _run(router, requests, workers))
+    print(f"small-a circuit: {router.stats()['backends']['small-a']['circuit']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.workers))
@@ -0,0 +1,93 @@
+# Hit rate versus false-hit rate of the semantic cache across thresholds.
+#
+#   python -m benchmarks.semantic_cache --thresholds 0.6 0.7 0.8 0.9
+#
+# The cache holds one phrasing of each question. Paraphrases should hit their
+# own question. Near-misses are different questions on the same topic and must
+# not hit anything. Runs offline on the built-in corpus, or on a JSON file of
+# [{"question": ..., "paraphrases": [...], "near_misses": [...]}, ...].
+import argparse
+import json
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.embeddings import embed
+
+CORPUS: List[Dict] = [
+    {
+        "question": "How does photosynthesis work?",
+        "paraphrases": ["how does photosynthesis work in plants", "Can you explain how photosynthesis works?", "photosynthesis - how does it work"],
+        "near_misses": ["Where does photosynthesis happen in the cell?", "How does cellular respiration work?"],
+    },
+    {
+        "question": "What is the derivative of x squared?",
+        "paraphrases": ["derivative of x squared?", "what's the derivative of x^2 (x squared)", "What is the derivative of x squared with respect to x?"],
+        "near_misses": ["What is the integral of x squared?", "What is the derivative of x cubed?"],
+    },
+    {
+        "question": "What caused the First World War?",
+        "paraphrases": ["what were the causes of the First World War", "Why did the First World War start?", "main causes of the first world war"],
+        "near_misses": ["What caused the Second World War?", "When did the First World War end?"],
+    },
+    {
+        "question": "Explain Newton's second law of motion",
+        "paraphrases": ["explain newton's second law", "Can you explain Newton's second law of motion?", "newton second law of motion explained"],
+        "near_misses": ["Explain Newton's third law of motion", "Explain Newton's law of gravitation"],
+    },
+    {
+        "question": "What is the difference between mitosis and meiosis?",
+        "paraphrases": ["difference between mitosis and meiosis", "How is meiosis different from mitosis?", "mitosis vs meiosis - what is the difference"],
+        "near_misses": ["What are the phases of mitosis?", "What is the purpose of meiosis?"],
+    },
+    {
+        "question": "How do I balance a chemical equation?",
+        "paraphrases": ["how to balance chemical equations", "How do you balance a chemical equation?", "steps to balance a chemical equation"],
+        "near_misses": ["How do I name a chemical compound?", "How do I calculate molar mass?"],
+    },
+    {
+        "question": "What is a binary search tree?",
+        "paraphrases": ["what is a binary search tree", "Explain what a binary search tree is", "binary search tree definition"],
+        "near_misses": ["What is a binary heap?", "How does binary search work?"],
+    },
+    {
+        "question": "What does the mitochondria do?",
+        "paraphrases": ["what do mitochondria do", "What is the function of the mitochondria?", "mitochondria function in the cell"],
+        "near_misses": ["What does the ribosome do?", "What does the nucleus do?"],
+    },
+]
+
+
+def main(corpus: List[Dict], thresholds: List[float]) -> None:
+    cached = np.stack([embed(item["question"]) for item in corpus])
+    paraphrases = [(i, p) for i, item in enumerate(corpus) for p in item["paraphrases"]]
+    near_misses = [q for item in corpus for q in item["near_misses"]]
+
+    def best(text: str):
+        scores = cached @ embed(text)
+        index = int(np.argmax(scores))
+        return index, float(scores[index])
+
+    paraphrase_matches = [(expected, *best(text)) for expected, text in paraphrases]
+    near_miss_scores = [best(text)[1] for text in near_misses]
+
+    print(f"{len(corpus)} cached questions, {len(paraphrases)} paraphrases, {len(near_misses)} near-misses")
+    print(f"{'threshold':>9}  {'hit rate':>8}  {'false hits':>10}")
+    for threshold in thresholds:
+        hits = sum(1 for expected, got, score in paraphrase_matches if score >= threshold and got == expected)
+        wrong = sum(1 for expected, got, score in paraphrase_matches if score >= threshold and got != expected)
+        wrong += sum(1 for score in near_miss_scores if score >= threshold)
+        lookups = len(paraphrases) + len(near_misses)
+        print(f"{threshold:>9.2f}  {hits / len(paraphrases):>8.1%}  {wrong / lookups:>10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", help="JSON file with the corpus format described above")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9])
+    args = parser.parse_args()
+    corpus = CORPUS
+    if args.corpus:
+        with open(args.corpus) as f:
+            corpus = json.load(f)
+    main(corpus, args.thresholds)
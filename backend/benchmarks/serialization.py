@@ -0,0 +1,116 @@
+# Per-row cost of turning ORM-like rows into a JSON list response.
+#
+#   python -m benchmarks.serialization --rows 500 --repeat 20
+#
+# "per-row" is the path the list endpoints used to take: model_validate on each
+# row, then FastAPI validating the list against response_model, dumping it to
+# JSON-mode Python and encoding that with json.dumps. "adapter" is
+# app.api.v1.responses.dump_list: one validate_python and one dump_json on a
+# cached List[Schema] TypeAdapter. Rows are plain objects with synthetic values
+# for every field of the schema.
+import argparse
+import json
+import random
+import time
+import typing
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Dict, List, Type
+
+from pydantic import BaseModel
+
+from app.api.v1.responses import dump_list, list_adapter
+from app.schemas import (
+    AiConversationResponse,
+    AiMessageResponse,
+    DocumentResponse,
+    FlashcardResponse,
+    FlashcardReviewResponse,
+    NoteResponse,
+    StudySessionResponse,
+)
+
+SCHEMAS = [
+    AiMessageResponse,
+    AiConversationResponse,
+    FlashcardResponse,
+    FlashcardReviewResponse,
+    NoteResponse,
+    DocumentResponse,
+    StudySessionResponse,
+]
+
+
+def _value(annotation: Any, rng: random.Random) -> Any:
+    if typing.get_origin(annotation) is typing.Union:
+        annotation = next(a for a in typing.get_args(annotation) if a is not type(None))
+    origin = typing.get_origin(annotation)
+    if annotation is uuid.UUID:
+        return uuid.uuid4()
+    if annotation is bool:
+        return rng.random() < 0.5
+    if annotation is int:
+        return rng.randint(0, 10_000)
+    if annotation is Decimal:
+        return Decimal(rng.randint(130, 300)) / 100
+    if annotation is datetime:
+        return datetime.fromtimestamp(rng.randint(1_600_000_000, 1_800_000_000), tz=timezone.utc)
+    if origin is dict or annotation is dict:
+        return {"topic": "thermodynamics", "weight": rng.random()}
+    if origin is list:
+        return [_value(typing.get_args(annotation)[0], rng) for _ in range(3)]
+    return " ".join(rng.choice(["entropy", "enthalpy", "gas", "law", "ideal", "energy"]) for _ in range(30))
+
+
+def synthetic_rows(schema: Type[BaseModel], count: int, rng: random.Random) -> List[SimpleNamespace]:
+    return [
+        SimpleNamespace(**{name: _value(field.annotation, rng) for name, field in schema.model_fields.items()})
+        for _ in range(count)
+    ]
+
+
+def per_row(schema: Type[BaseModel], rows: List[Any]) -> bytes:
+    models = [schema.model_validate(r) for r in rows]
+    adapter = list_adapter(schema)
+    validated = adapter.validate_python(models, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    results: List[Dict[str, Any]] = []
+    for schema in SCHEMAS:
+        rows = synthetic_rows(schema, args.rows, rng)
+        assert json.loads(per_row(schema, rows)) == json.loads(dump_list(schema, rows))
+        baseline = _time(lambda: per_row(schema, rows), args.repeat)
+        fast = _time(lambda: dump_list(schema, rows), args.repeat)
+        results.append({
+            "schema": schema.__name__,
+            "per_row_us": baseline / args.rows * 1e6,
+            "adapter_us": fast / args.rows * 1e6,
+        })
+
+    print(f"{'schema':<26}{'per-row us/row':>16}{'adapter us/row':>16}{'speedup':>10}")
+    for r in results:
+        print(f"{r['schema']:<26}{r['per_row_us']:>16.2f}{r['adapter_us']:>16.2f}{r['per_row_us'] / r['adapter_us']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
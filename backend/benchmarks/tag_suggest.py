@@ -0,0 +1,56 @@
+# Latency of tag autocomplete lookups against the in-memory name index.
+#
+#   python -m benchmarks.tag_suggest --tags 5000 --queries 2000
+#
+# Builds a TagNames index over synthetic tag names with skewed usage counts
+# and times suggest() for one-, two- and three-character prefixes.
+import argparse
+import random
+import string
+import time
+import uuid
+
+import numpy as np
+
+from app.services.tag_index import TagNames, TagSuggestion
+
+WORDS = [
+    "algebra", "biology", "calculus", "chapter", "chemistry", "exam", "final", "geometry",
+    "history", "homework", "lab", "lecture", "midterm", "physics", "quiz", "review", "week",
+]
+
+
+def synthetic_tags(count: int, rng: random.Random) -> list:
+    names = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(WORDS)}-{rng.choice(string.ascii_lowercase)}{rng.randint(1, 99)}")
+    return [TagSuggestion(uuid.uuid4(), name, int(rng.paretovariate(1.2))) for name in names]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tags", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    tags = synthetic_tags(args.tags, rng)
+    started = time.perf_counter()
+    index = TagNames(tags)
+    print(f"build: {(time.perf_counter() - started) * 1000:.2f} ms for {len(tags)} tags")
+
+    for length in (1, 2, 3):
+        timings = []
+        for _ in range(args.queries):
+            prefix = rng.choice(tags).name[:length]
+            started = time.perf_counter()
+            index.suggest(prefix, args.limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        p50, p99 = np.percentile(timings, [50, 99])
+        print(f"prefix length {length}: p50 {p50:.3f} ms  p99 {p99:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
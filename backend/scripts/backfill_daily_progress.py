@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+import uuid
+from typing import Optional
+
+from app.core.db_setup import AsyncSessionLocal, engine
+from app.services.progress import backfill_daily_progress
+
+
+async def main(user_id: Optional[uuid.UUID]) -> None:
+    async with AsyncSessionLocal() as db:
+        rows = await backfill_daily_progress(db, user_id)
+    await engine.dispose()
+    print(f"daily_progress: {rows} rows recomputed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", type=uuid.UUID, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id))
@@ -0,0 +1,39 @@
+import asyncio
+
+from sqlalchemy import String, cast, func, literal, select, update
+from sqlalchemy.orm import aliased
+
+from app.core.db_setup import AsyncSessionLocal, engine
+from app.models.ai_message import AiMessage
+from app.services.messages import THREAD_PATH_SEPARATOR
+
+
+def _segment(order_column):
+    return func.lpad(cast(order_column, String), 8, "0")
+
+
+async def main() -> None:
+    paths = (
+        select(AiMessage.id.label("id"), _segment(AiMessage.message_order).label("path"))
+        .where(AiMessage.parent_message_id.is_(None))
+        .cte("paths", recursive=True)
+    )
+    child = aliased(AiMessage)
+    paths = paths.union_all(
+        select(child.id, paths.c.path + literal(THREAD_PATH_SEPARATOR) + _segment(child.message_order))
+        .where(child.parent_message_id == paths.c.id)
+    )
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(AiMessage)
+            .where(AiMessage.id == paths.c.id, AiMessage.thread_path.is_(None))
+            .values(thread_path=paths.c.path)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    await engine.dispose()
+    print(f"ai_messages.thread_path: {result.rowcount} rows backfilled")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,16 @@
+import asyncio
+
+from app.core.db_setup import AsyncSessionLocal, engine
+from app.services.response_cache import response_cache
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as db:
+        rows = await response_cache.purge_expired(db)
+        await db.commit()
+    await engine.dispose()
+    print(f"ai_response_cache: {rows} expired rows deleted")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
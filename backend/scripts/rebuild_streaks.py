@@ -0,0 +1,21 @@
+import argparse
+import asyncio
+import uuid
+from typing import Optional
+
+from app.core.db_setup import AsyncSessionLocal, engine
+from app.services.progress import rebuild_streaks
+
+
+async def main(user_id: Optional[uuid.UUID]) -> None:
+    async with AsyncSessionLocal() as db:
+        rows = await rebuild_streaks(db, user_id)
+    await engine.dispose()
+    print(f"user_streaks: {rows} rows rebuilt")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", type=uuid.UUID, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id))
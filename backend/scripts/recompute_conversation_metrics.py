@@ -0,0 +1,19 @@
+import argparse
+import asyncio
+
+from app.core.db_setup import engine
+from app.services.conversation_metrics import recompute_conversation_metrics
+
+
+async def main(chunk_size: int, concurrency: int) -> None:
+    rows = await recompute_conversation_metrics(chunk_size, concurrency)
+    await engine.dispose()
+    print(f"ai_conversation_metrics: {rows} rows recomputed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.chunk_size, args.concurrency))
@@ -0,0 +1,16 @@
+import asyncio
+
+from app.core.db_setup import AsyncSessionLocal, engine
+from app.services.tagging import recompute_tag_usage
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as db:
+        rows = await recompute_tag_usage(db)
+        await db.commit()
+    await engine.dispose()
+    print(f"tags: {rows} usage counts recomputed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,16 @@
+import asyncio
+
+from app.core.db_setup import AsyncSessionLocal, engine
+from app.services.counters import reconcile_counters
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as db:
+        fixed = await reconcile_counters(db)
+    await engine.dispose()
+    for name, rows in fixed.items():
+        print(f"{name}: {rows} rows corrected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())